@@ -4,18 +4,46 @@ dependencies.py
 FastAPI Depends 주입용 의존성 함수 모음.
 """
 
-from supabase import AsyncClient, acreate_client
+import asyncio
+import logging
+from typing import Optional
 
-from app.config import get_settings
+from app.repositories import Repository, create_repository
 
-settings = get_settings()
+logger = logging.getLogger(__name__)
 
 
-# ── Supabase 클라이언트 ────────────────────────────────────────────────────────
-async def get_db() -> AsyncClient:
-    """요청마다 Supabase AsyncClient 인스턴스를 생성하여 주입한다."""
-    client = await acreate_client(
-        settings.supabase_url,
-        settings.supabase_service_role_key,
-    )
-    return client
+# ── 저장소 ────────────────────────────────────────────────────────────────────
+# 워커(프로세스)당 하나의 저장소(와 그 커넥션 풀)를 공유한다. 구현은 STORAGE_BACKEND로 고른다.
+# lifespan에서 생성/종료하며, lifespan 밖에서 호출되면 최초 요청 시 생성한다.
+_repository: Optional[Repository] = None
+_db_lock = asyncio.Lock()
+
+
+async def init_db() -> Repository:
+    """공유 저장소를 생성한다. 이미 있으면 그대로 반환한다."""
+    global _repository
+    async with _db_lock:
+        if _repository is None:
+            _repository = await create_repository()
+    return _repository
+
+
+async def close_db() -> None:
+    """공유 저장소의 커넥션 풀을 닫는다."""
+    global _repository
+    async with _db_lock:
+        if _repository is not None:
+            await _repository.close()
+        _repository = None
+
+
+async def get_db() -> Repository:
+    """워커 공유 저장소를 주입한다."""
+    if _repository is not None:
+        return _repository
+    return await init_db()
+
+
+def get_storage_stats() -> dict:
+    return _repository.stats() if _repository is not None else {"backend": None}
@@ -4,22 +4,56 @@ main.py
 FastAPI 애플리케이션 진입점.
 """
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
 from app.config import get_settings
+from app.dependencies import close_db, get_storage_stats, init_db
+from app.middleware.metrics_middleware import MetricsMiddleware
 from app.middleware.rate_limit_middleware import RateLimitMiddleware
 from app.routers import news_router, tickers_router
+from app.services.feed_cache_service import get_feed_cache_stats
+from app.services.http_client_service import close_http_client, init_http_client
+from app.services.ingestion_service import get_executor, shutdown_executor
+from app.services.llm_router_service import get_llm_router_stats
+from app.services.local_cache_service import get_local_cache_stats
+from app.services.metrics_service import render_metrics
+from app.services.prewarm_service import prewarm_scheduler
+from app.services.prompt_budget_service import get_prompt_budget_stats
+from app.services.summary_batch_service import get_summary_batch_stats
+from app.services.symbol_index_service import load_symbol_index
+from app.services.symbol_listing_service import symbol_listing_refresher
 
 settings = get_settings()
 
+
+# ── 앱 수명주기 ───────────────────────────────────────────────────────────────
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    get_executor()
+    init_http_client()
+    load_symbol_index()
+    await init_db()
+    prewarm_scheduler.start(news_router.prewarm_due, news_router.prewarm_symbol, news_router.prewarm_begin)
+    symbol_listing_refresher.start()
+    yield
+    await symbol_listing_refresher.stop()
+    await prewarm_scheduler.stop()
+    await close_db()
+    await close_http_client()
+    shutdown_executor()
+
+
 app = FastAPI(
     title="Stock Insight API",
     description="AI 기반 글로벌 주식 뉴스 인사이트 플랫폼",
     version="1.0.0",
     docs_url="/docs" if settings.debug else None,
     redoc_url="/redoc" if settings.debug else None,
+    lifespan=lifespan,
 )
 
 # ── 미들웨어 ──────────────────────────────────────────────────────────────────
@@ -31,6 +65,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 app.add_middleware(RateLimitMiddleware)
+# 가장 바깥에서 전체 처리 시간과 Server-Timing 헤더를 기록한다.
+app.add_middleware(MetricsMiddleware)
 
 # ── 라우터 ────────────────────────────────────────────────────────────────────
 PREFIX = "/v1"
@@ -48,4 +84,18 @@ async def global_exception_handler(request: Request, exc: Exception):
 
 @app.get("/health")
 async def health_check():
-    return {"status": "ok"}
+    return {
+        "status": "ok",
+        "storage": get_storage_stats(),
+        "local_cache": get_local_cache_stats(),
+        "feed_cache": get_feed_cache_stats(),
+        "prompt_budget": get_prompt_budget_stats(),
+        "llm": get_llm_router_stats(),
+        "summary_batch": get_summary_batch_stats(),
+    }
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus 스크레이프 엔드포인트. (워커 프로세스 단위 집계)"""
+    return Response(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
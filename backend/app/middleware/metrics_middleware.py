@@ -0,0 +1,80 @@
+"""
+metrics_middleware.py
+─────────────────────
+요청 계측 미들웨어 (순수 ASGI).
+요청마다 단계 측정 구간을 열고, 응답 헤더를 보낼 때
+- http_request_duration_seconds 히스토그램에 라우트 템플릿(/v1/news/{symbol}) 단위로 기록하고,
+- 그때까지 측정된 단계를 Server-Timing 헤더로 붙인다.
+스트리밍(SSE) 응답은 헤더가 먼저 나가므로 기사 수집 단계까지만 Server-Timing에 포함된다.
+"""
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import get_settings
+from app.services.metrics_service import (
+    HTTP_REQUEST_SECONDS,
+    begin_request_timing,
+    end_request_timing,
+    server_timing_header,
+)
+
+# 자기 자신과 헬스 체크는 계측하지 않는다.
+_EXCLUDED_PATHS = {"/metrics", "/health"}
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in _EXCLUDED_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        server_timing = get_settings().server_timing_enabled
+        token = begin_request_timing()
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                elapsed = time.perf_counter() - started
+                HTTP_REQUEST_SECONDS.observe(
+                    elapsed, method=scope["method"], route=_route_template(scope), status=str(status)
+                )
+                if server_timing:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", server_timing_header(elapsed).encode("latin-1")))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            end_request_timing(token)
+
+
+def _route_template(scope: Scope) -> str:
+    """
+    라우팅된 경로 템플릿(/v1/news/{symbol}). 심볼 등 경로 값을 라벨에 넣지 않아 시계열 수가 늘지 않게 한다.
+    FastAPI 버전에 따라 route.path에 include_router prefix(/v1)가 빠져 있을 수 있으므로,
+    route가 일치하는 요청 경로의 뒷부분을 찾아 그 앞(고정 prefix)을 템플릿 앞에 붙인다.
+    """
+    route = scope.get("route")
+    template = getattr(route, "path_format", None) or getattr(route, "path", None)
+    if not template:
+        return "unmatched"
+    regex = getattr(route, "path_regex", None)
+    path = scope["path"]
+    if regex is None or regex.match(path):
+        return template
+    start = path.find("/", 1)
+    while start != -1:
+        if regex.match(path[start:]):
+            return path[:start] + template
+        start = path.find("/", start + 1)
+    return template
@@ -1,57 +1,191 @@
 """
 rate_limit_middleware.py
 ────────────────────────
-티커 검색 엔드포인트 Rate Limit 미들웨어.
-인메모리 카운터(슬라이딩 윈도우) 사용.
-프로덕션에서는 Redis로 교체 권장.
+엔드포인트 Rate Limit 미들웨어.
+슬라이딩 윈도우 카운터(현재/이전 윈도우 카운트의 가중합) 방식으로 키당 O(1) 메모리를 사용한다.
+저장소는 RateLimitBackend 인터페이스 뒤에 두며,
+기본은 인메모리(유휴 키 제거 + 최대 키 수 상한), 다중 워커 공유가 필요하면 Redis를 사용한다.
 """
 
+import math
 import time
-from collections import defaultdict, deque
+from collections import OrderedDict
+from typing import Optional
 
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 
+from app.config import get_settings
+
 # 엔드포인트별 Rate Limit 설정: {path_prefix: (최대 횟수, 윈도우 초)}
+# 가장 긴 접두사가 우선하며, 같은 접두사 아래 경로는 하나의 버킷을 공유한다.
 RATE_LIMITS: dict[str, tuple[int, int]] = {
     "/v1/tickers/search": (30, 60),   # 30회/분
+    "/v1/news": (60, 60),             # 60회/분 (수집 + LLM 요약 경로)
+    "/v1/news/batch": (10, 60),       # 10회/분 (종목 여러 개)
 }
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app):
-        super().__init__(app)
-        # {(ip, endpoint): deque[timestamp]}
-        self._windows: dict[tuple, deque] = defaultdict(deque)
+def _match_rule(path: str) -> Optional[tuple[str, tuple[int, int]]]:
+    """경로를 세그먼트 단위로 잘라 가장 긴 접두사 규칙을 dict 조회로 찾는다."""
+    segments = path.rstrip("/").split("/")
+    for depth in range(len(segments), 1, -1):
+        prefix = "/".join(segments[:depth])
+        cfg = RATE_LIMITS.get(prefix)
+        if cfg is not None:
+            return prefix, cfg
+    return None
 
-    async def dispatch(self, request: Request, call_next) -> Response:
-        path = request.url.path
 
-        limit_cfg = None
-        for prefix, cfg in RATE_LIMITS.items():
-            if path.startswith(prefix):
-                limit_cfg = cfg
+# ── 저장소 인터페이스 ─────────────────────────────────────────────────────────
+
+class RateLimitBackend:
+    async def hit(self, key: str, limit: int, window_sec: int) -> tuple[bool, float]:
+        """요청 1건을 기록한다. 반환값: (허용 여부, 거절 시 재시도까지 남은 초)"""
+        raise NotImplementedError
+
+
+class _Counter:
+    __slots__ = ("window_start", "window_sec", "current", "previous", "last_seen")
+
+    def __init__(self, window_start: float, window_sec: int, now: float):
+        self.window_start = window_start
+        self.window_sec = window_sec
+        self.current = 0
+        self.previous = 0
+        self.last_seen = now
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """
+    워커 프로세스 내 슬라이딩 윈도우 카운터.
+    키는 최근 사용 순으로 유지되어, 2 윈도우 이상 유휴인 키를 앞에서부터 제거하고
+    max_keys를 넘으면 가장 오래 사용되지 않은 키를 버린다.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._counters: OrderedDict[str, _Counter] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._counters)
+
+    async def hit(self, key: str, limit: int, window_sec: int) -> tuple[bool, float]:
+        now = time.monotonic()
+        self._evict_idle(now)
+        window_start = now - (now % window_sec)
+
+        counter = self._counters.get(key)
+        if counter is None:
+            counter = self._counters[key] = _Counter(window_start, window_sec, now)
+            if len(self._counters) > self.max_keys:
+                self._counters.popitem(last=False)
+        else:
+            self._counters.move_to_end(key)
+            counter.last_seen = now
+
+        if counter.window_start != window_start:
+            adjacent = window_start - counter.window_start <= window_sec
+            counter.previous = counter.current if adjacent else 0
+            counter.current = 0
+            counter.window_start = window_start
+
+        elapsed = (now - window_start) / window_sec
+        estimated = counter.previous * (1 - elapsed) + counter.current
+        if estimated >= limit:
+            return False, window_sec - (now - window_start)
+
+        counter.current += 1
+        return True, 0.0
+
+    def _evict_idle(self, now: float) -> None:
+        while self._counters:
+            counter = next(iter(self._counters.values()))
+            if now - counter.last_seen <= 2 * counter.window_sec:
                 break
+            self._counters.popitem(last=False)
 
-        if limit_cfg is None:
-            return await call_next(request)
 
-        max_calls, window_sec = limit_cfg
-        ip = request.client.host
-        key = (ip, path)
+# 판정과 증가를 한 번에 수행한다. 거절된 요청은 세지 않는다(InMemory와 동일).
+# KEYS: 현재 윈도우 키, 이전 윈도우 키 / ARGV: 한도, 현재 윈도우 경과 비율(0~1), 키 TTL(초)
+_HIT_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+if previous * (1 - tonumber(ARGV[2])) + current >= tonumber(ARGV[1]) then
+    return 0
+end
+redis.call('INCR', KEYS[1])
+if current == 0 then
+    redis.call('EXPIRE', KEYS[1], ARGV[3])
+end
+return 1
+"""
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """
+    Redis 공유 슬라이딩 윈도우 카운터. 모든 워커가 같은 한도를 공유한다.
+    판정/증가/만료 설정은 Lua 스크립트 하나로 원자적으로 실행한다.
+    client는 redis.asyncio.Redis 호환 객체(register_script)면 되므로
+    테스트에서는 fakeredis 등 로컬 대체 구현을 주입할 수 있다.
+    """
+
+    def __init__(self, client, prefix: str = "rl"):
+        self._client = client
+        self._prefix = prefix
+        self._hit_script = client.register_script(_HIT_SCRIPT)
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisRateLimitBackend":
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis 사용 시 redis 패키지가 필요합니다. (poetry install -E redis)") from e
+        return cls(redis.from_url(url))
+
+    async def hit(self, key: str, limit: int, window_sec: int) -> tuple[bool, float]:
         now = time.time()
-        window = self._windows[key]
+        window_index = int(now // window_sec)
+        elapsed = (now % window_sec) / window_sec
+        allowed = await self._hit_script(
+            keys=[f"{self._prefix}:{key}:{window_index}", f"{self._prefix}:{key}:{window_index - 1}"],
+            args=[limit, elapsed, window_sec * 2],
+        )
+        if not int(allowed):
+            return False, window_sec - (now % window_sec)
+        return True, 0.0
+
+
+def create_rate_limit_backend() -> RateLimitBackend:
+    """RATE_LIMIT_BACKEND 설정("memory" | "redis")에 따라 저장소를 생성한다."""
+    settings = get_settings()
+    if settings.rate_limit_backend == "redis":
+        return RedisRateLimitBackend.from_url(settings.rate_limit_redis_url)
+    return InMemoryRateLimitBackend(max_keys=settings.rate_limit_max_keys)
+
+
+# ── 미들웨어 ──────────────────────────────────────────────────────────────────
+
+class RateLimitMiddleware(BaseHTTPMiddleware):
+    def __init__(self, app, backend: Optional[RateLimitBackend] = None):
+        super().__init__(app)
+        self.backend = backend or create_rate_limit_backend()
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        rule = _match_rule(request.url.path)
+        if rule is None:
+            return await call_next(request)
 
-        # 윈도우 밖 타임스탬프 제거
-        while window and window[0] < now - window_sec:
-            window.popleft()
+        prefix, (max_calls, window_sec) = rule
+        ip = request.client.host if request.client else "unknown"
+        allowed, retry_after = await self.backend.hit(f"{ip}|{prefix}", max_calls, window_sec)
 
-        if len(window) >= max_calls:
+        if not allowed:
             return Response(
                 content='{"error":{"code":"RATE_LIMIT_EXCEEDED","message":"요청 한도를 초과했습니다. 잠시 후 다시 시도해주세요.","status":429}}',
                 status_code=429,
                 media_type="application/json",
+                headers={"Retry-After": str(max(math.ceil(retry_after), 1))},
             )
 
-        window.append(now)
         return await call_next(request)
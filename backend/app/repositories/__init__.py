@@ -0,0 +1,32 @@
+"""
+repositories
+────────────
+저장소 구현 모음. STORAGE_BACKEND 설정으로 하나를 골라 워커당 하나씩 만든다.
+- supabase: Supabase(PostgREST) HTTP 클라이언트 (기본)
+- postgres: asyncpg 직접 연결 풀 (asyncpg 패키지, DATABASE_URL 필요)
+- sqlite  : 로컬 SQLite 파일 (로컬 개발/테스트, 벤치마크용)
+"""
+
+from app.config import get_settings
+from app.repositories.base import Repository
+
+STORAGE_BACKENDS = ("supabase", "postgres", "sqlite")
+
+
+async def create_repository() -> Repository:
+    """STORAGE_BACKEND 설정에 따라 저장소를 생성한다. 구현 모듈은 선택된 것만 import한다."""
+    settings = get_settings()
+    backend = settings.storage_backend
+    if backend == "postgres":
+        from app.repositories.postgres_repository import PostgresRepository
+        return await PostgresRepository.create(settings)
+    if backend == "sqlite":
+        from app.repositories.sqlite_repository import SqliteRepository
+        return await SqliteRepository.create(settings)
+    if backend == "supabase":
+        from app.repositories.supabase_repository import SupabaseRepository
+        return await SupabaseRepository.create(settings)
+    raise RuntimeError(f"알 수 없는 STORAGE_BACKEND: {backend} (지원: {', '.join(STORAGE_BACKENDS)})")
+
+
+__all__ = ["Repository", "STORAGE_BACKENDS", "create_repository"]
@@ -0,0 +1,127 @@
+"""
+base.py
+───────
+저장소(tickers / news_articles / ticker_summaries) 인터페이스.
+캐시 서비스(article_cache_service, cache_service)는 이 인터페이스만 사용하며,
+STORAGE_BACKEND 설정으로 구현을 고른다.
+
+행(dict) 규약 — 모든 구현이 Supabase(PostgREST) 응답과 같은 모양으로 반환한다.
+- 키는 테이블 컬럼명과 같다.
+- 시각(created_at, published_at, refreshed_at)은 ISO 8601 문자열이다.
+- article_ids는 int 리스트, sentiment_score는 float이다.
+인자로 받는 시각(since 등)은 timezone-aware datetime이고,
+insert 행의 시각 값은 서비스가 만든 ISO 8601 문자열 그대로 받는다.
+"""
+
+from datetime import datetime
+from typing import Optional
+
+# 요약 언어 컬럼. 쿼리 문자열에 컬럼명을 넣는 구현이 있으므로 이 목록으로만 허용한다.
+SUMMARY_COLUMNS = ("summary_ko", "summary_en")
+
+ARTICLE_INSERT_COLUMNS = ("ticker_id", "title", "url", "source", "published_at", "raw_content")
+SUMMARY_INSERT_COLUMNS = (
+    "ticker_id", "article_ids", "summary_ko", "summary_en", "sentiment_score", "sentiment_label",
+    "model_version", "article_count", "created_at", "refreshed_at", "fingerprint",
+)
+
+
+def check_summary_columns(columns: list[str]) -> None:
+    unknown = [c for c in columns if c not in SUMMARY_COLUMNS]
+    if unknown:
+        raise ValueError(f"알 수 없는 요약 컬럼: {unknown}")
+
+
+def group_articles(rows: list[dict], limit: int) -> dict[int, list[dict]]:
+    """최신순으로 정렬된 기사 행을 티커별로 최대 limit개씩 묶는다."""
+    grouped: dict[int, list[dict]] = {}
+    for row in rows:
+        group = grouped.setdefault(row["ticker_id"], [])
+        if len(group) < limit:
+            group.append(row)
+    return grouped
+
+
+def first_per_ticker(rows: list[dict]) -> dict[int, dict]:
+    """정렬된 행에서 티커별 첫 행만 남긴다."""
+    result: dict[int, dict] = {}
+    for row in rows:
+        result.setdefault(row["ticker_id"], row)
+    return result
+
+
+class Repository:
+    name = "base"
+
+    # ── tickers ──────────────────────────────────────────────────────────────
+
+    async def get_ticker_id(self, symbol: str) -> Optional[int]:
+        raise NotImplementedError
+
+    async def create_ticker(self, symbol: str, name: str, exchange: Optional[str]) -> int:
+        """ticker를 생성하고 id를 반환한다. 이미 있으면 기존 id를 반환한다."""
+        raise NotImplementedError
+
+    async def get_ticker_ids(self, symbols: list[str]) -> dict[str, int]:
+        """DB에 있는 심볼만 {symbol: ticker_id}로 반환한다."""
+        raise NotImplementedError
+
+    # ── news_articles ────────────────────────────────────────────────────────
+
+    async def get_articles(self, ticker_id: int, since: datetime, limit: int) -> list[dict]:
+        """created_at >= since인 기사를 published_at 최신순으로 최대 limit개 반환한다."""
+        raise NotImplementedError
+
+    async def get_articles_bulk(
+        self, ticker_ids: list[int], since: datetime, limit: int,
+    ) -> dict[int, list[dict]]:
+        """get_articles를 여러 티커에 대해 한 번에 수행한다. 기사가 없는 티커는 포함되지 않는다."""
+        raise NotImplementedError
+
+    async def get_article_bodies(self, urls: list[str]) -> dict[str, str]:
+        """저장된 URL의 본문을 {url: raw_content}로 반환한다."""
+        raise NotImplementedError
+
+    async def touch_articles(self, ticker_id: int, urls: list[str], touched_at: datetime) -> list[dict]:
+        """기존 기사의 created_at을 touched_at으로 갱신하고 갱신된 행을 반환한다."""
+        raise NotImplementedError
+
+    async def insert_articles(self, rows: list[dict]) -> list[dict]:
+        """기사를 저장한다. url이 이미 있으면 무시하며, 새로 저장된 행만 반환한다."""
+        raise NotImplementedError
+
+    # ── ticker_summaries ─────────────────────────────────────────────────────
+
+    async def get_latest_summary(self, ticker_id: int, since: datetime, column: str) -> Optional[dict]:
+        """refreshed_at >= since이고 column이 채워진 가장 최근 요약 행."""
+        raise NotImplementedError
+
+    async def get_latest_summaries(
+        self, ticker_ids: list[int], since: datetime, column: str,
+    ) -> dict[int, dict]:
+        """get_latest_summary를 여러 티커에 대해 한 번에 수행한다. 요약이 없는 티커는 포함되지 않는다."""
+        raise NotImplementedError
+
+    async def find_summary(
+        self, ticker_id: int, fingerprint: str, created_since: datetime, columns: list[str],
+    ) -> Optional[dict]:
+        """같은 fingerprint로 created_since 이후 생성되고 columns가 모두 채워진 가장 최근 요약 행."""
+        raise NotImplementedError
+
+    async def refresh_summary(self, summary_id: int, refreshed_at: datetime) -> None:
+        raise NotImplementedError
+
+    async def insert_summary(self, row: dict) -> None:
+        raise NotImplementedError
+
+    async def delete_summaries(self, ticker_id: int) -> int:
+        """티커의 요약을 모두 삭제하고 삭제된 행 수를 반환한다."""
+        raise NotImplementedError
+
+    # ── 수명주기 ─────────────────────────────────────────────────────────────
+
+    async def close(self) -> None:
+        """커넥션 풀 등 자원을 정리한다."""
+
+    def stats(self) -> dict:
+        return {"backend": self.name}
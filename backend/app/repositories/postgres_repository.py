@@ -0,0 +1,228 @@
+"""
+postgres_repository.py
+──────────────────────
+asyncpg 직접 연결 저장소 (STORAGE_BACKEND=postgres).
+PostgREST(HTTP + JSON)를 거치지 않고 워커당 커넥션 풀로 Postgres에 직접 질의한다.
+- asyncpg는 쿼리 문자열별로 prepared statement를 커넥션마다 캐시하고(statement_cache_size),
+  결과를 바이너리 프로토콜로 받는다. 그래서 쿼리 문자열은 값이 아닌 $n 파라미터로만 바뀌게 둔다.
+- 여러 티커 조회는 ANY($1) 배열 파라미터 하나로 보내고, 티커별 limit은 LATERAL 조인으로 DB에서 자른다.
+- 기사 일괄 저장은 unnest 배열 파라미터로 한 번에 INSERT ... ON CONFLICT DO NOTHING 한다.
+Supabase의 트랜잭션 모드 풀러(6543 포트)는 prepared statement를 지원하지 않으므로
+직접 연결/세션 모드(5432 포트)를 쓰거나 DATABASE_STATEMENT_CACHE_SIZE=0으로 둔다.
+"""
+
+import logging
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+
+from app.config import Settings
+from app.repositories.base import SUMMARY_INSERT_COLUMNS, Repository, check_summary_columns
+
+logger = logging.getLogger(__name__)
+
+
+def _to_row(record) -> dict:
+    """asyncpg Record를 행 규약(base.py)에 맞는 dict로 변환한다."""
+    row = dict(record)
+    for key, value in row.items():
+        if isinstance(value, datetime):
+            row[key] = value.isoformat()
+        elif isinstance(value, Decimal):
+            row[key] = float(value)
+    return row
+
+
+def _parse_ts(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+_SELECT_ARTICLES = """
+    SELECT * FROM news_articles
+    WHERE ticker_id = $1 AND created_at >= $2
+    ORDER BY published_at DESC
+    LIMIT $3
+"""
+
+# 티커마다 (ticker_id, published_at) 인덱스로 limit개만 읽는다.
+_SELECT_ARTICLES_BULK = """
+    SELECT a.* FROM unnest($1::int[]) AS t(ticker_id)
+    CROSS JOIN LATERAL (
+        SELECT * FROM news_articles
+        WHERE ticker_id = t.ticker_id AND created_at >= $2
+        ORDER BY published_at DESC
+        LIMIT $3
+    ) a
+    ORDER BY a.ticker_id, a.published_at DESC
+"""
+
+_INSERT_ARTICLES = """
+    INSERT INTO news_articles (ticker_id, title, url, source, published_at, raw_content)
+    SELECT * FROM unnest($1::int[], $2::text[], $3::text[], $4::text[], $5::timestamptz[], $6::text[])
+    ON CONFLICT (url) DO NOTHING
+    RETURNING *
+"""
+
+_INSERT_SUMMARY = (
+    f"INSERT INTO ticker_summaries ({', '.join(SUMMARY_INSERT_COLUMNS)}) "
+    f"VALUES ({', '.join(f'${i}' for i in range(1, len(SUMMARY_INSERT_COLUMNS) + 1))})"
+)
+
+
+class PostgresRepository(Repository):
+    name = "postgres"
+
+    def __init__(self, pool):
+        self._pool = pool
+
+    @classmethod
+    async def create(cls, settings: Settings) -> "PostgresRepository":
+        try:
+            import asyncpg
+        except ImportError as e:
+            raise RuntimeError("STORAGE_BACKEND=postgres 사용 시 asyncpg 패키지가 필요합니다. (poetry install -E postgres)") from e
+        if not settings.database_url:
+            raise RuntimeError("STORAGE_BACKEND=postgres 사용 시 DATABASE_URL이 필요합니다.")
+
+        pool = await asyncpg.create_pool(
+            settings.database_url,
+            min_size=settings.database_pool_min_size,
+            max_size=settings.database_pool_max_size,
+            statement_cache_size=settings.database_statement_cache_size,
+            command_timeout=settings.database_command_timeout_sec,
+        )
+        logger.info(
+            "Postgres 커넥션 풀 생성: min=%d, max=%d, statement_cache=%d",
+            settings.database_pool_min_size, settings.database_pool_max_size,
+            settings.database_statement_cache_size,
+        )
+        return cls(pool)
+
+    # ── tickers ──────────────────────────────────────────────────────────────
+
+    async def get_ticker_id(self, symbol: str) -> Optional[int]:
+        return await self._pool.fetchval("SELECT id FROM tickers WHERE symbol = $1", symbol)
+
+    async def create_ticker(self, symbol: str, name: str, exchange: Optional[str]) -> int:
+        # DO UPDATE(자기 자신 대입)로 충돌 시에도 기존 행의 id를 RETURNING으로 받는다.
+        return await self._pool.fetchval(
+            "INSERT INTO tickers (symbol, name, exchange) VALUES ($1, $2, $3) "
+            "ON CONFLICT (symbol) DO UPDATE SET symbol = EXCLUDED.symbol RETURNING id",
+            symbol, name, exchange,
+        )
+
+    async def get_ticker_ids(self, symbols: list[str]) -> dict[str, int]:
+        records = await self._pool.fetch(
+            "SELECT id, symbol FROM tickers WHERE symbol = ANY($1::text[])", symbols
+        )
+        return {r["symbol"]: r["id"] for r in records}
+
+    # ── news_articles ────────────────────────────────────────────────────────
+
+    async def get_articles(self, ticker_id: int, since: datetime, limit: int) -> list[dict]:
+        records = await self._pool.fetch(_SELECT_ARTICLES, ticker_id, since, limit)
+        return [_to_row(r) for r in records]
+
+    async def get_articles_bulk(
+        self, ticker_ids: list[int], since: datetime, limit: int,
+    ) -> dict[int, list[dict]]:
+        records = await self._pool.fetch(_SELECT_ARTICLES_BULK, ticker_ids, since, limit)
+        grouped: dict[int, list[dict]] = {}
+        for record in records:
+            grouped.setdefault(record["ticker_id"], []).append(_to_row(record))
+        return grouped
+
+    async def get_article_bodies(self, urls: list[str]) -> dict[str, str]:
+        records = await self._pool.fetch(
+            "SELECT url, raw_content FROM news_articles WHERE url = ANY($1::text[])", urls
+        )
+        return {r["url"]: r["raw_content"] or "" for r in records}
+
+    async def touch_articles(self, ticker_id: int, urls: list[str], touched_at: datetime) -> list[dict]:
+        records = await self._pool.fetch(
+            "UPDATE news_articles SET created_at = $3 "
+            "WHERE ticker_id = $1 AND url = ANY($2::text[]) RETURNING *",
+            ticker_id, urls, touched_at,
+        )
+        return [_to_row(r) for r in records]
+
+    async def insert_articles(self, rows: list[dict]) -> list[dict]:
+        records = await self._pool.fetch(
+            _INSERT_ARTICLES,
+            [row["ticker_id"] for row in rows],
+            [row["title"] for row in rows],
+            [row["url"] for row in rows],
+            [row.get("source") for row in rows],
+            [_parse_ts(row.get("published_at")) for row in rows],
+            [row.get("raw_content") for row in rows],
+        )
+        return [_to_row(r) for r in records]
+
+    # ── ticker_summaries ─────────────────────────────────────────────────────
+    # 요약 컬럼명은 SUMMARY_COLUMNS로 검증한 뒤 쿼리에 넣는다. (언어별로 prepared statement가 하나씩 생긴다)
+
+    async def get_latest_summary(self, ticker_id: int, since: datetime, column: str) -> Optional[dict]:
+        check_summary_columns([column])
+        record = await self._pool.fetchrow(
+            f"SELECT * FROM ticker_summaries "
+            f"WHERE ticker_id = $1 AND refreshed_at >= $2 AND {column} IS NOT NULL "
+            f"ORDER BY refreshed_at DESC LIMIT 1",
+            ticker_id, since,
+        )
+        return _to_row(record) if record else None
+
+    async def get_latest_summaries(
+        self, ticker_ids: list[int], since: datetime, column: str,
+    ) -> dict[int, dict]:
+        check_summary_columns([column])
+        records = await self._pool.fetch(
+            f"SELECT DISTINCT ON (ticker_id) * FROM ticker_summaries "
+            f"WHERE ticker_id = ANY($1::int[]) AND refreshed_at >= $2 AND {column} IS NOT NULL "
+            f"ORDER BY ticker_id, refreshed_at DESC",
+            ticker_ids, since,
+        )
+        return {r["ticker_id"]: _to_row(r) for r in records}
+
+    async def find_summary(
+        self, ticker_id: int, fingerprint: str, created_since: datetime, columns: list[str],
+    ) -> Optional[dict]:
+        check_summary_columns(columns)
+        filled = "".join(f" AND {column} IS NOT NULL" for column in sorted(columns))
+        record = await self._pool.fetchrow(
+            f"SELECT * FROM ticker_summaries "
+            f"WHERE ticker_id = $1 AND fingerprint = $2 AND created_at >= $3{filled} "
+            f"ORDER BY created_at DESC LIMIT 1",
+            ticker_id, fingerprint, created_since,
+        )
+        return _to_row(record) if record else None
+
+    async def refresh_summary(self, summary_id: int, refreshed_at: datetime) -> None:
+        await self._pool.execute(
+            "UPDATE ticker_summaries SET refreshed_at = $2 WHERE id = $1", summary_id, refreshed_at
+        )
+
+    async def insert_summary(self, row: dict) -> None:
+        values = [row.get(c) for c in SUMMARY_INSERT_COLUMNS]
+        for i, column in enumerate(SUMMARY_INSERT_COLUMNS):
+            if column in ("created_at", "refreshed_at"):
+                values[i] = _parse_ts(values[i])
+            elif column == "sentiment_score" and values[i] is not None:
+                values[i] = Decimal(str(values[i]))
+        await self._pool.execute(_INSERT_SUMMARY, *values)
+
+    async def delete_summaries(self, ticker_id: int) -> int:
+        status = await self._pool.execute("DELETE FROM ticker_summaries WHERE ticker_id = $1", ticker_id)
+        return int(status.split()[-1])   # "DELETE <n>"
+
+    # ── 수명주기 ─────────────────────────────────────────────────────────────
+
+    async def close(self) -> None:
+        await self._pool.close()
+        logger.info("Postgres 커넥션 풀 종료")
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.name,
+            "pool_size": self._pool.get_size(),
+            "pool_idle": self._pool.get_idle_size(),
+        }
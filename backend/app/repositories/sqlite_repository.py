@@ -0,0 +1,307 @@
+"""
+sqlite_repository.py
+────────────────────
+로컬 SQLite 저장소 (STORAGE_BACKEND=sqlite).
+Supabase 없이 로컬 개발/테스트와 오프라인 벤치마크를 돌리기 위한 구현이며, 최초 연결 시 스키마를 만든다.
+- 스키마는 migrations/와 같은 컬럼을 가지되, 시각은 UTC ISO 8601 문자열(마이크로초까지 고정)로,
+  article_ids는 JSON 문자열로 저장한다. 고정 형식이라 문자열 비교가 시각 비교와 같다.
+- sqlite3 호출은 블로킹이므로 저장소 전용 스레드 풀에서 실행한다.
+  (수집 스레드 풀을 쓰면 느린 스크래핑 뒤에 캐시 조회가 밀린다.)
+- 스레드별 커넥션을 쓰며, 여러 워커가 같은 파일을 공유할 수 있도록 WAL 모드로 연다.
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Optional, TypeVar, Union
+
+from app.config import Settings
+from app.repositories.base import (
+    ARTICLE_INSERT_COLUMNS,
+    SUMMARY_INSERT_COLUMNS,
+    Repository,
+    check_summary_columns,
+    first_per_ticker,
+    group_articles,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_MAX_WORKERS = 4
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tickers (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    symbol      TEXT NOT NULL UNIQUE,
+    name        TEXT NOT NULL,
+    exchange    TEXT,
+    sector      TEXT,
+    created_at  TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS news_articles (
+    id              INTEGER PRIMARY KEY AUTOINCREMENT,
+    ticker_id       INTEGER NOT NULL REFERENCES tickers(id) ON DELETE CASCADE,
+    title           TEXT NOT NULL,
+    url             TEXT NOT NULL UNIQUE,
+    source          TEXT,
+    published_at    TEXT,
+    raw_content     TEXT,
+    created_at      TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS ticker_summaries (
+    id              INTEGER PRIMARY KEY AUTOINCREMENT,
+    ticker_id       INTEGER NOT NULL REFERENCES tickers(id) ON DELETE CASCADE,
+    article_ids     TEXT NOT NULL DEFAULT '[]',     -- JSON 배열
+    summary_ko      TEXT,
+    summary_en      TEXT,
+    sentiment_score REAL,
+    sentiment_label TEXT,
+    model_version   TEXT,
+    article_count   INTEGER NOT NULL DEFAULT 0,
+    created_at      TEXT NOT NULL,
+    fingerprint     TEXT,
+    refreshed_at    TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_news_ticker_date ON news_articles(ticker_id, published_at DESC);
+CREATE INDEX IF NOT EXISTS idx_ticker_summaries_ticker_refreshed ON ticker_summaries(ticker_id, refreshed_at DESC);
+CREATE INDEX IF NOT EXISTS idx_ticker_summaries_fingerprint ON ticker_summaries(ticker_id, fingerprint);
+"""
+
+# Postgres의 ORDER BY ... DESC와 같게 NULL을 먼저 둔다.
+_BY_PUBLISHED = "published_at IS NULL DESC, published_at DESC"
+
+
+def _ts(value: Union[datetime, str, None]) -> Optional[str]:
+    """시각을 고정 형식의 UTC ISO 8601 문자열로 바꾼다."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat(timespec="microseconds")
+
+
+def _now() -> str:
+    return _ts(datetime.now(tz=timezone.utc))
+
+
+def _placeholders(values: list) -> str:
+    return ",".join("?" * len(values))
+
+
+def _to_row(row: sqlite3.Row) -> dict:
+    data = dict(row)
+    if "article_ids" in data:
+        data["article_ids"] = json.loads(data["article_ids"] or "[]")
+    return data
+
+
+class SqliteRepository(Repository):
+    name = "sqlite"
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._executor = ThreadPoolExecutor(max_workers=_MAX_WORKERS, thread_name_prefix="sqlite-repo")
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    async def create(cls, settings: Settings) -> "SqliteRepository":
+        path = Path(settings.storage_sqlite_path)
+        if not path.is_absolute():
+            path = Path(__file__).parent.parent.parent / path
+        repo = cls(path)
+        await repo._run(repo._connect)   # 스키마 생성
+        logger.info("SQLite 저장소 사용: path=%s", path)
+        return repo
+
+    def _connect(self) -> sqlite3.Connection:
+        """스레드별 커넥션을 반환한다. 최초 연결 시 스키마를 만든다."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        with self._lock:
+            if not self._connections:
+                conn.executescript(_SCHEMA)
+                conn.execute(
+                    "INSERT OR IGNORE INTO tickers (symbol, name, created_at) VALUES ('MARKET', ?, ?)",
+                    ("MarketWatch Top Stories", _now()),
+                )
+            self._connections.append(conn)
+        self._local.conn = conn
+        return conn
+
+    async def _run(self, func: Callable[..., T], *args) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def _fetch(self, sql: str, params: tuple = ()) -> list[dict]:
+        def query() -> list[dict]:
+            return [_to_row(r) for r in self._connect().execute(sql, params).fetchall()]
+        return await self._run(query)
+
+    async def _fetchone(self, sql: str, params: tuple = ()) -> Optional[dict]:
+        rows = await self._fetch(sql, params)
+        return rows[0] if rows else None
+
+    # ── tickers ──────────────────────────────────────────────────────────────
+
+    async def get_ticker_id(self, symbol: str) -> Optional[int]:
+        row = await self._fetchone("SELECT id FROM tickers WHERE symbol = ?", (symbol,))
+        return row["id"] if row else None
+
+    async def create_ticker(self, symbol: str, name: str, exchange: Optional[str]) -> int:
+        row = await self._fetchone(
+            "INSERT INTO tickers (symbol, name, exchange, created_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (symbol) DO UPDATE SET symbol = excluded.symbol RETURNING id",
+            (symbol, name, exchange, _now()),
+        )
+        return row["id"]
+
+    async def get_ticker_ids(self, symbols: list[str]) -> dict[str, int]:
+        rows = await self._fetch(
+            f"SELECT id, symbol FROM tickers WHERE symbol IN ({_placeholders(symbols)})", tuple(symbols)
+        )
+        return {row["symbol"]: row["id"] for row in rows}
+
+    # ── news_articles ────────────────────────────────────────────────────────
+
+    async def get_articles(self, ticker_id: int, since: datetime, limit: int) -> list[dict]:
+        return await self._fetch(
+            f"SELECT * FROM news_articles WHERE ticker_id = ? AND created_at >= ? "
+            f"ORDER BY {_BY_PUBLISHED} LIMIT ?",
+            (ticker_id, _ts(since), limit),
+        )
+
+    async def get_articles_bulk(
+        self, ticker_ids: list[int], since: datetime, limit: int,
+    ) -> dict[int, list[dict]]:
+        rows = await self._fetch(
+            f"SELECT * FROM news_articles WHERE ticker_id IN ({_placeholders(ticker_ids)}) "
+            f"AND created_at >= ? ORDER BY {_BY_PUBLISHED}",
+            (*ticker_ids, _ts(since)),
+        )
+        return group_articles(rows, limit)
+
+    async def get_article_bodies(self, urls: list[str]) -> dict[str, str]:
+        rows = await self._fetch(
+            f"SELECT url, raw_content FROM news_articles WHERE url IN ({_placeholders(urls)})", tuple(urls)
+        )
+        return {row["url"]: row["raw_content"] or "" for row in rows}
+
+    async def touch_articles(self, ticker_id: int, urls: list[str], touched_at: datetime) -> list[dict]:
+        return await self._fetch(
+            f"UPDATE news_articles SET created_at = ? "
+            f"WHERE ticker_id = ? AND url IN ({_placeholders(urls)}) RETURNING *",
+            (_ts(touched_at), ticker_id, *urls),
+        )
+
+    async def insert_articles(self, rows: list[dict]) -> list[dict]:
+        columns = (*ARTICLE_INSERT_COLUMNS, "created_at")
+        sql = (
+            f"INSERT OR IGNORE INTO news_articles ({', '.join(columns)}) "
+            f"VALUES ({_placeholders(list(columns))}) RETURNING *"
+        )
+
+        def insert() -> list[dict]:
+            conn = self._connect()
+            now = _now()
+            inserted = []
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for row in rows:
+                    values = [row.get(c) for c in ARTICLE_INSERT_COLUMNS]
+                    values[ARTICLE_INSERT_COLUMNS.index("published_at")] = _ts(row.get("published_at"))
+                    inserted.extend(_to_row(r) for r in conn.execute(sql, (*values, now)).fetchall())
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            return inserted
+
+        return await self._run(insert)
+
+    # ── ticker_summaries ─────────────────────────────────────────────────────
+
+    async def get_latest_summary(self, ticker_id: int, since: datetime, column: str) -> Optional[dict]:
+        check_summary_columns([column])
+        return await self._fetchone(
+            f"SELECT * FROM ticker_summaries "
+            f"WHERE ticker_id = ? AND refreshed_at >= ? AND {column} IS NOT NULL "
+            f"ORDER BY refreshed_at DESC LIMIT 1",
+            (ticker_id, _ts(since)),
+        )
+
+    async def get_latest_summaries(
+        self, ticker_ids: list[int], since: datetime, column: str,
+    ) -> dict[int, dict]:
+        check_summary_columns([column])
+        rows = await self._fetch(
+            f"SELECT * FROM ticker_summaries "
+            f"WHERE ticker_id IN ({_placeholders(ticker_ids)}) AND refreshed_at >= ? AND {column} IS NOT NULL "
+            f"ORDER BY refreshed_at DESC",
+            (*ticker_ids, _ts(since)),
+        )
+        return first_per_ticker(rows)
+
+    async def find_summary(
+        self, ticker_id: int, fingerprint: str, created_since: datetime, columns: list[str],
+    ) -> Optional[dict]:
+        check_summary_columns(columns)
+        filled = "".join(f" AND {column} IS NOT NULL" for column in sorted(columns))
+        return await self._fetchone(
+            f"SELECT * FROM ticker_summaries "
+            f"WHERE ticker_id = ? AND fingerprint = ? AND created_at >= ?{filled} "
+            f"ORDER BY created_at DESC LIMIT 1",
+            (ticker_id, fingerprint, _ts(created_since)),
+        )
+
+    async def refresh_summary(self, summary_id: int, refreshed_at: datetime) -> None:
+        await self._fetch(
+            "UPDATE ticker_summaries SET refreshed_at = ? WHERE id = ?", (_ts(refreshed_at), summary_id)
+        )
+
+    async def insert_summary(self, row: dict) -> None:
+        values = []
+        for column in SUMMARY_INSERT_COLUMNS:
+            value = row.get(column)
+            if column == "article_ids":
+                value = json.dumps(value or [])
+            elif column in ("created_at", "refreshed_at"):
+                value = _ts(value) or _now()
+            values.append(value)
+        await self._fetch(
+            f"INSERT INTO ticker_summaries ({', '.join(SUMMARY_INSERT_COLUMNS)}) "
+            f"VALUES ({_placeholders(values)})",
+            tuple(values),
+        )
+
+    async def delete_summaries(self, ticker_id: int) -> int:
+        rows = await self._fetch("DELETE FROM ticker_summaries WHERE ticker_id = ? RETURNING id", (ticker_id,))
+        return len(rows)
+
+    # ── 수명주기 ─────────────────────────────────────────────────────────────
+
+    async def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        logger.info("SQLite 저장소 종료")
@@ -0,0 +1,235 @@
+"""
+supabase_repository.py
+──────────────────────
+Supabase(PostgREST) 저장소. 기본 구현이다.
+워커(프로세스)당 하나의 AsyncClient와 httpx 커넥션 풀을 공유한다.
+"""
+
+import logging
+from datetime import datetime
+from typing import Optional
+
+import httpx
+from supabase import AsyncClient, AsyncClientOptions, acreate_client
+
+from app.config import Settings
+from app.repositories.base import (
+    ARTICLE_INSERT_COLUMNS,
+    SUMMARY_INSERT_COLUMNS,
+    Repository,
+    check_summary_columns,
+    first_per_ticker,
+    group_articles,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class SupabaseRepository(Repository):
+    name = "supabase"
+
+    def __init__(self, client: AsyncClient, http_client: Optional[httpx.AsyncClient] = None):
+        self._client = client
+        self._http_client = http_client
+
+    @classmethod
+    async def create(cls, settings: Settings) -> "SupabaseRepository":
+        if not settings.supabase_url or not settings.supabase_service_role_key:
+            raise RuntimeError("STORAGE_BACKEND=supabase 사용 시 SUPABASE_URL과 SUPABASE_SERVICE_ROLE_KEY가 필요합니다.")
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.supabase_pool_size,
+                max_keepalive_connections=settings.supabase_keepalive_connections,
+                keepalive_expiry=settings.supabase_keepalive_expiry_sec,
+            ),
+            timeout=settings.supabase_timeout_sec,
+            follow_redirects=True,
+        )
+        client = await acreate_client(
+            settings.supabase_url,
+            settings.supabase_service_role_key,
+            options=AsyncClientOptions(httpx_client=http_client),
+        )
+        logger.info("Supabase 클라이언트 생성: pool_size=%d", settings.supabase_pool_size)
+        return cls(client, http_client)
+
+    # ── tickers ──────────────────────────────────────────────────────────────
+
+    async def get_ticker_id(self, symbol: str) -> Optional[int]:
+        res = (
+            await self._client.table("tickers")
+            .select("id")
+            .eq("symbol", symbol)
+            .limit(1)
+            .execute()
+        )
+        return res.data[0]["id"] if res.data else None
+
+    async def create_ticker(self, symbol: str, name: str, exchange: Optional[str]) -> int:
+        res = (
+            await self._client.table("tickers")
+            .upsert(
+                {"symbol": symbol, "name": name, "exchange": exchange},
+                on_conflict="symbol",
+                ignore_duplicates=True,
+            )
+            .execute()
+        )
+        if res.data:
+            return res.data[0]["id"]
+        # 동시에 다른 요청이 먼저 생성한 경우
+        ticker_id = await self.get_ticker_id(symbol)
+        if ticker_id is None:
+            raise RuntimeError(f"ticker 생성 실패: {symbol}")
+        return ticker_id
+
+    async def get_ticker_ids(self, symbols: list[str]) -> dict[str, int]:
+        res = (
+            await self._client.table("tickers")
+            .select("id,symbol")
+            .in_("symbol", symbols)
+            .execute()
+        )
+        return {row["symbol"]: row["id"] for row in res.data or []}
+
+    # ── news_articles ────────────────────────────────────────────────────────
+
+    async def get_articles(self, ticker_id: int, since: datetime, limit: int) -> list[dict]:
+        res = (
+            await self._client.table("news_articles")
+            .select("*")
+            .eq("ticker_id", ticker_id)
+            .gte("created_at", since.isoformat())
+            .order("published_at", desc=True)
+            .limit(limit)
+            .execute()
+        )
+        return res.data or []
+
+    async def get_articles_bulk(
+        self, ticker_ids: list[int], since: datetime, limit: int,
+    ) -> dict[int, list[dict]]:
+        # PostgREST에는 티커별 limit이 없으므로 TTL 이내 행을 모두 받아 앞에서부터 자른다.
+        res = (
+            await self._client.table("news_articles")
+            .select("*")
+            .in_("ticker_id", ticker_ids)
+            .gte("created_at", since.isoformat())
+            .order("published_at", desc=True)
+            .execute()
+        )
+        return group_articles(res.data or [], limit)
+
+    async def get_article_bodies(self, urls: list[str]) -> dict[str, str]:
+        res = (
+            await self._client.table("news_articles")
+            .select("url,raw_content")
+            .in_("url", urls)
+            .execute()
+        )
+        return {row["url"]: row.get("raw_content") or "" for row in res.data or []}
+
+    async def touch_articles(self, ticker_id: int, urls: list[str], touched_at: datetime) -> list[dict]:
+        res = await (
+            self._client.table("news_articles")
+            .update({"created_at": touched_at.isoformat()})
+            .eq("ticker_id", ticker_id)
+            .in_("url", urls)
+            .execute()
+        )
+        return res.data or []
+
+    async def insert_articles(self, rows: list[dict]) -> list[dict]:
+        res = (
+            await self._client.table("news_articles")
+            .upsert(
+                [{c: row.get(c) for c in ARTICLE_INSERT_COLUMNS} for row in rows],
+                on_conflict="url",
+                ignore_duplicates=True,
+            )
+            .execute()
+        )
+        return res.data or []
+
+    # ── ticker_summaries ─────────────────────────────────────────────────────
+
+    def _summaries(self, column: str):
+        check_summary_columns([column])
+        return (
+            self._client.table("ticker_summaries")
+            .select("*")
+            .not_.is_(column, "null")
+        )
+
+    async def get_latest_summary(self, ticker_id: int, since: datetime, column: str) -> Optional[dict]:
+        res = (
+            await self._summaries(column)
+            .eq("ticker_id", ticker_id)
+            .gte("refreshed_at", since.isoformat())
+            .order("refreshed_at", desc=True)
+            .limit(1)
+            .execute()
+        )
+        return res.data[0] if res.data else None
+
+    async def get_latest_summaries(
+        self, ticker_ids: list[int], since: datetime, column: str,
+    ) -> dict[int, dict]:
+        res = (
+            await self._summaries(column)
+            .in_("ticker_id", ticker_ids)
+            .gte("refreshed_at", since.isoformat())
+            .order("refreshed_at", desc=True)
+            .execute()
+        )
+        return first_per_ticker(res.data or [])
+
+    async def find_summary(
+        self, ticker_id: int, fingerprint: str, created_since: datetime, columns: list[str],
+    ) -> Optional[dict]:
+        check_summary_columns(columns)
+        query = (
+            self._client.table("ticker_summaries")
+            .select("*")
+            .eq("ticker_id", ticker_id)
+            .eq("fingerprint", fingerprint)
+            .gte("created_at", created_since.isoformat())
+        )
+        for column in columns:
+            query = query.not_.is_(column, "null")
+        res = await query.order("created_at", desc=True).limit(1).execute()
+        return res.data[0] if res.data else None
+
+    async def refresh_summary(self, summary_id: int, refreshed_at: datetime) -> None:
+        await (
+            self._client.table("ticker_summaries")
+            .update({"refreshed_at": refreshed_at.isoformat()})
+            .eq("id", summary_id)
+            .execute()
+        )
+
+    async def insert_summary(self, row: dict) -> None:
+        await (
+            self._client.table("ticker_summaries")
+            .insert({c: row.get(c) for c in SUMMARY_INSERT_COLUMNS})
+            .execute()
+        )
+
+    async def delete_summaries(self, ticker_id: int) -> int:
+        res = (
+            await self._client.table("ticker_summaries")
+            .delete()
+            .eq("ticker_id", ticker_id)
+            .execute()
+        )
+        return len(res.data) if res.data else 0
+
+    # ── 수명주기 ─────────────────────────────────────────────────────────────
+
+    async def close(self) -> None:
+        if self._http_client is not None:
+            await self._http_client.aclose()
+        logger.info("Supabase 클라이언트 종료")
+
+    def stats(self) -> dict:
+        return {"backend": self.name}
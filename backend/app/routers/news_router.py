@@ -4,34 +4,79 @@ news_router.py
 뉴스 조회 라우터.
 - /news/{symbol}: 특정 종목 뉴스 및 요약
 - /news/market-pulse: MarketWatch 전체 시장 뉴스 및 요약
+- /news/batch: 여러 종목 뉴스 및 요약 일괄 조회
+- /news/{symbol}/stream, /news/market-pulse/stream: SSE 스트리밍 버전
 """
 
+import asyncio
+import json
 import logging
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Callable, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 
-from app.config import get_feature_config, get_settings
+from app.config import get_cache_config, get_feature_config, get_prewarm_config, get_settings
 from app.dependencies import get_db
 from app.services.article_cache_service import (
     get_cached_articles,
+    get_cached_articles_bulk,
     get_or_create_ticker,
+    get_stored_bodies,
+    get_ticker_ids,
+    lookup_articles,
     save_articles,
 )
-from app.services.cache_service import get_cached_digest, save_digest_cache
-from app.services.news_service import RawArticle, fetch_articles, fetch_market_news
+from app.services.cache_service import (
+    get_cached_digest,
+    get_cached_digests,
+    lookup_digest,
+    reuse_digest,
+    save_digest_cache,
+)
+from app.services.llm_scheduler_service import Priority, llm_priority
+from app.services.news_service import RawArticle, RssLookup, fetch_articles, fetch_market_news
+from app.services.prewarm_service import MARKET_SYMBOL, prewarm_scheduler
+from app.services.single_flight_service import SingleFlight
 from app.services.summarization_service import (
     ArticleInput,
     ArticleOut,
+    BatchErrorOut,
+    BatchNewsItem,
+    BatchNewsResponse,
     DigestOut,
+    DigestResult,
     NewsResponse,
     SentimentOut,
-    summarize_articles,
+    SummaryPoint,
+    article_set_fingerprint,
+    stream_summarize_articles,
+    stream_summarize_articles_bilingual,
 )
+from app.services.summary_batch_service import summary_batcher
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/news", tags=["news"])
 
+BATCH_MAX_SYMBOLS = 20   # /news/batch 1회 최대 티커 수
+BATCH_CONCURRENCY = 4    # /news/batch 캐시 미스 종목 동시 처리 수
+
+# 캐시 미스 시 같은 키의 동시 요청이 수집/LLM 호출을 중복 실행하지 않도록 병합한다.
+_article_flights = SingleFlight("articles")
+_digest_flights = SingleFlight("digest")
+_refresh_flights = SingleFlight("refresh")
+_bilingual_flights = SingleFlight("bilingual")
+
+# 백그라운드 갱신 Task 참조 보관 (GC로 인한 조기 종료 방지)
+_background_tasks: set[asyncio.Task] = set()
+
+# 진행 중인 스트리밍 요약의 bullet을 같은 _digest_flights 키에 합류한 SSE 클라이언트에게도 나눠 준다.
+# {키: 지금까지 나온 bullet} — 스트리밍 요약을 실행하는 동안에만 존재한다.
+_point_history: dict[tuple, list[SummaryPoint]] = {}
+# {키: 구독 중인 SSE 클라이언트의 큐}
+_point_subscribers: dict[tuple, set[asyncio.Queue]] = {}
+
 
 # ── 헬퍼 ──────────────────────────────────────────────────────────────────────
 
@@ -48,6 +93,7 @@ def _rows_to_raw_articles(rows: list[dict]) -> list[RawArticle]:
                 else None
             ),
             raw_content=r.get("raw_content", ""),
+            id=r.get("id"),
         )
         for r in rows
     ]
@@ -55,11 +101,24 @@ def _rows_to_raw_articles(rows: list[dict]) -> list[RawArticle]:
 
 def _build_article_inputs(articles: list[RawArticle]) -> list[ArticleInput]:
     return [
-        ArticleInput(id=i, title=a.title, source=a.source, content=a.raw_content)
-        for i, a in enumerate(articles)
+        ArticleInput(id=a.id, title=a.title, source=a.source, content=a.raw_content)
+        for a in articles
     ]
 
 
+async def _reuse_unchanged_digest(
+    db, ticker_id: int, articles: list[RawArticle], lang: str, feature: str,
+) -> tuple[str, Optional[DigestResult]]:
+    """
+    기사 집합 fingerprint를 계산하고, 같은 집합의 기존 요약이 있으면 유효기간을 연장해 반환한다.
+    반환값: (fingerprint, 재사용한 요약 또는 None)
+    """
+    fingerprint = article_set_fingerprint([a.url or a.title for a in articles], feature)
+    langs = ["ko", "en"] if get_feature_config(feature).bilingual else [lang]
+    reused = await reuse_digest(db, ticker_id, fingerprint, langs)
+    return fingerprint, reused[lang] if reused else None
+
+
 def _build_article_outs(articles: list[RawArticle]) -> list[ArticleOut]:
     return [
         ArticleOut(
@@ -73,36 +132,101 @@ def _build_article_outs(articles: list[RawArticle]) -> list[ArticleOut]:
     ]
 
 
+def _digest_to_out(digest: DigestResult, stale: bool = False) -> DigestOut:
+    age = datetime.now(timezone.utc) - digest.created_at
+    return DigestOut(
+        summary=digest.summary,
+        sentiment=SentimentOut(score=digest.sentiment_score, label=digest.sentiment_label),
+        based_on_articles=digest.article_count,
+        stale=stale,
+        age_seconds=max(int(age.total_seconds()), 0),
+    )
+
+
 async def _get_or_fetch_articles(
-    db, ticker_id: int, fetch_fn, limit: int
-) -> list[RawArticle]:
-    """1시간 이내 캐시 기사가 있으면 사용하고, 없으면 외부 수집 후 DB에 저장한다."""
-    cached = await get_cached_articles(db, ticker_id, limit)
-    if cached:
-        return _rows_to_raw_articles(cached)
-
-    raw_articles = await fetch_fn()
-    if raw_articles:
-        await save_articles(db, ticker_id, raw_articles)
-    return raw_articles
+    db, ticker_id: int, fetch_fn, limit: int, allow_stale: bool = False,
+) -> tuple[list[RawArticle], bool]:
+    """
+    1시간 이내 캐시 기사가 있으면 사용하고, 없으면 외부 수집 후 DB에 저장한다.
+    allow_stale이면 TTL이 지났더라도 max_stale_hours 이내 기사를 즉시 반환한다.
+    (fresh/stale 판정은 한 번의 조회로 하며, 미스였다면 병합된 로더는 캐시를 다시 조회하지 않는다.)
+    반환값: (기사 목록, stale 여부)
+    """
+    known_miss = False
+    if allow_stale:
+        rows, stale = await lookup_articles(db, ticker_id, limit)
+        if rows:
+            if stale:
+                logger.info("기사 stale 응답: ticker_id=%d, count=%d", ticker_id, len(rows))
+            return _rows_to_raw_articles(rows), stale
+        known_miss = True
+
+    async def load() -> list[RawArticle]:
+        if not known_miss:
+            cached = await get_cached_articles(db, ticker_id, limit)
+            if cached:
+                return _rows_to_raw_articles(cached)
+        return await _fetch_and_save_articles(db, ticker_id, fetch_fn)
+
+    return await _article_flights.do((ticker_id, limit), load), False
 
 
 async def _get_or_summarize(
     db, ticker_id: int, symbol: str, company_name: str,
     articles: list[RawArticle], lang: str,
     feature: str = "ticker_brief",
+    allow_stale: bool = False,
 ) -> DigestOut:
-    """24h 요약 캐시가 있으면 사용하고, 없으면 AI 요약 후 캐시에 저장한다."""
-    cached_digest = await get_cached_digest(db, ticker_id, lang)
-    if cached_digest:
-        return DigestOut(
-            summary=cached_digest.summary,
-            sentiment=SentimentOut(
-                score=cached_digest.sentiment_score,
-                label=cached_digest.sentiment_label,
-            ),
-            based_on_articles=cached_digest.article_count,
-        )
+    """
+    24h 요약 캐시가 있으면 사용하고, 없으면 AI 요약 후 캐시에 저장한다.
+    allow_stale이면 TTL이 지났더라도 max_stale_hours 이내 요약을 stale로 표시해 즉시 반환한다.
+    """
+    known_miss = False
+    if allow_stale:
+        digest, stale = await lookup_digest(db, ticker_id, lang)
+        if digest:
+            if stale:
+                logger.info("요약 stale 응답: ticker_id=%d, lang=%s", ticker_id, lang)
+            return _digest_to_out(digest, stale=stale)
+        known_miss = True
+
+    return await _digest_flights.do(
+        (ticker_id, lang, feature),
+        lambda: _load_or_summarize(
+            db, ticker_id, symbol, company_name, articles, lang, feature, known_miss
+        ),
+    )
+
+
+async def _load_or_summarize(
+    db, ticker_id: int, symbol: str, company_name: str,
+    articles: list[RawArticle], lang: str, feature: str,
+    known_miss: bool = False,
+) -> DigestOut:
+    """known_miss면 호출 측이 방금 캐시 미스를 확인했으므로 캐시를 다시 조회하지 않는다."""
+    if not known_miss:
+        cached_digest = await get_cached_digest(db, ticker_id, lang)
+        if cached_digest:
+            return _digest_to_out(cached_digest)
+
+    digest = await _summarize_and_save(db, ticker_id, symbol, company_name, articles, lang, feature)
+    return _digest_to_out(digest)
+
+
+async def _summarize_and_save(
+    db, ticker_id: int, symbol: str, company_name: str,
+    articles: list[RawArticle], lang: str, feature: str,
+    on_point: Optional[Callable[[SummaryPoint], None]] = None,
+) -> DigestResult:
+    """
+    AI 요약을 생성하고 ticker_summaries에 저장한다. (TTL 캐시 확인 없음)
+    기사 집합이 직전 요약과 같으면 LLM을 호출하지 않고 기존 요약을 연장한다.
+    on_point가 주어지면 LLM 스트리밍으로 요약하며 완성된 bullet마다 on_point를 호출하고,
+    없으면 여러 티커 묶음 요약(summary_batcher)을 거친다.
+    """
+    fingerprint, reused = await _reuse_unchanged_digest(db, ticker_id, articles, lang, feature)
+    if reused is not None:
+        return reused
 
     settings = get_settings()
     feat_config = get_feature_config(feature)
@@ -111,26 +235,369 @@ async def _get_or_summarize(
     ) or None
 
     inputs = _build_article_inputs(articles)
-    digest = await summarize_articles(
-        symbol=symbol,
-        company_name=company_name,
-        articles=inputs,
-        lang=lang,
-        api_key=api_key,
-        feature=feature,
+
+    if feat_config.bilingual:
+        # 한/영을 한 번에 생성하므로 언어와 무관하게 (ticker, feature) 단위로 병합한다.
+        async def summarize_both() -> dict[str, DigestResult]:
+            if on_point is None:
+                digest_ko, digest_en = await summary_batcher.summarize_bilingual(
+                    symbol=symbol, company_name=company_name, articles=inputs,
+                    api_key=api_key, feature=feature,
+                )
+            else:
+                digest_ko, digest_en = await stream_summarize_articles_bilingual(
+                    symbol=symbol, company_name=company_name, articles=inputs,
+                    on_point=on_point, stream_lang=lang, api_key=api_key, feature=feature,
+                )
+            await save_digest_cache(db, ticker_id, digest_ko, digest_en, fingerprint)
+            return {"ko": digest_ko, "en": digest_en}
+
+        digests = await _bilingual_flights.do((ticker_id, feature), summarize_both)
+        return digests[lang]
+
+    if on_point is None:
+        digest = await summary_batcher.summarize(
+            symbol=symbol, company_name=company_name, articles=inputs,
+            lang=lang, api_key=api_key, feature=feature,
+        )
+    else:
+        digest = await stream_summarize_articles(
+            symbol=symbol, company_name=company_name, articles=inputs,
+            on_point=on_point, lang=lang, api_key=api_key, feature=feature,
+        )
+
+    if lang == "en":
+        await save_digest_cache(db, ticker_id, None, digest, fingerprint)
+    else:
+        await save_digest_cache(db, ticker_id, digest, fingerprint=fingerprint)
+    return digest
+
+
+async def _fetch_and_save_articles(db, ticker_id: int, fetch_fn) -> list[RawArticle]:
+    """
+    외부 수집 후 DB에 저장한다. (캐시 확인 없음)
+    fetch_fn에 저장 기사 조회 함수를 넘겨 이미 저장된 URL은 스크래핑하지 않게 하고,
+    저장 시에는 새 기사만 upsert한다.
+    """
+    stored: dict[str, str] = {}
+    looked_up: set[str] = set()
+
+    async def lookup(urls: list[str]) -> dict[str, str]:
+        found = await get_stored_bodies(db, urls)
+        stored.update(found)
+        looked_up.update(urls)
+        return found
+
+    raw_articles = await fetch_fn(lookup)
+    if raw_articles:
+        # 스크래핑이 필요 없던 경로(RSS 등)는 여기서 한 번에 조회한다.
+        unchecked = [a.url for a in raw_articles if a.url and a.url not in looked_up]
+        if unchecked:
+            await lookup(unchecked)
+        new_count = sum(1 for a in raw_articles if a.url not in stored)
+        logger.info("증분 수집: ticker_id=%d, new=%d, known=%d", ticker_id, new_count, len(raw_articles) - new_count)
+        await save_articles(db, ticker_id, raw_articles, known_urls=set(stored))
+    return raw_articles
+
+
+def _schedule_refresh(
+    db, ticker_id: int, symbol: str, company_name: str,
+    fetch_fn, limit: int, lang: str, feature: str,
+) -> None:
+    """stale 응답 후 기사 수집 + 요약을 백그라운드에서 갱신한다. 키당 1회만 실행된다."""
+    async def refresh() -> None:
+        raw_articles, _ = await _get_or_fetch_articles(db, ticker_id, fetch_fn, limit)
+        if raw_articles:
+            await _get_or_summarize(
+                db, ticker_id, symbol, company_name, raw_articles, lang, feature=feature
+            )
+
+    async def run() -> None:
+        try:
+            # 응답은 이미 나갔으므로 사용자 요청보다 뒤에 LLM 슬롯을 배정받는다.
+            with llm_priority(Priority.PREWARM):
+                await _refresh_flights.do((ticker_id, lang, feature), refresh)
+        except Exception as exc:
+            logger.error("백그라운드 갱신 실패: symbol=%s, error=%s", symbol, exc)
+
+    task = asyncio.create_task(run())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+async def _get_ticker_news(
+    db, upper_symbol: str, limit: int, lang: str, ticker_id: Optional[int] = None,
+    rss: Optional[RssLookup] = None,
+) -> NewsResponse:
+    """
+    단일 종목의 기사 수집 + 요약 파이프라인. /{symbol}과 /batch의 캐시 미스 경로에서 사용한다.
+    rss가 주어지면 RSS 대체 조회를 같은 묶음의 종목과 함께 한 번에 수행한다.
+    """
+    if ticker_id is None:
+        ticker_id = await get_or_create_ticker(db, upper_symbol)
+    allow_stale = get_cache_config().stale_while_revalidate
+    fetch_fn = lambda lookup: fetch_articles(upper_symbol, limit, lookup, rss)
+
+    raw_articles, articles_stale = await _get_or_fetch_articles(
+        db, ticker_id, fetch_fn, limit=limit, allow_stale=allow_stale
     )
+    if not raw_articles:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"code": "NO_NEWS", "message": f"{upper_symbol}에 대한 뉴스를 찾을 수 없습니다."},
+        )
 
-    await save_digest_cache(db, ticker_id, digest)
+    try:
+        digest_out = await _get_or_summarize(
+            db, ticker_id, upper_symbol, upper_symbol, raw_articles, lang,
+            allow_stale=allow_stale,
+        )
+    except Exception as exc:
+        logger.error("종목 요약 실패: symbol=%s, error=%s", upper_symbol, exc)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={"code": "SUMMARIZATION_FAILED", "message": "뉴스 요약 생성에 실패했습니다."},
+        )
 
-    return DigestOut(
-        summary=digest.summary,
-        sentiment=SentimentOut(
-            score=digest.sentiment_score, label=digest.sentiment_label
-        ),
-        based_on_articles=len(inputs),
+    if articles_stale or digest_out.stale:
+        _schedule_refresh(
+            db, ticker_id, upper_symbol, upper_symbol, fetch_fn, limit, lang, "ticker_brief"
+        )
+
+    # 오타/뉴스 없는 심볼이 pre-warm 대상이 되지 않도록 정상 응답만 기록한다.
+    prewarm_scheduler.record(upper_symbol, lang)
+    return NewsResponse(
+        symbol=upper_symbol,
+        company_name=upper_symbol,
+        last_updated=datetime.now(timezone.utc).isoformat(),
+        digest=digest_out,
+        articles=_build_article_outs(raw_articles),
     )
 
 
+# ── SSE 스트리밍 ──────────────────────────────────────────────────────────────
+
+def _sse(event: str, data) -> str:
+    payload = data.model_dump() if hasattr(data, "model_dump") else data
+    return f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+
+async def _news_event_stream(
+    db, ticker_id: int, symbol: str, company_name: str, display_name: str,
+    raw_articles: list[RawArticle], articles_stale: bool,
+    fetch_fn, limit: int, lang: str, feature: str,
+) -> AsyncIterator[str]:
+    """
+    SSE 이벤트 순서: articles → bullet(0..N) → digest → done.
+    요약 캐시가 있으면 bullet을 한 번에 보내고, 없으면 LLM 스트리밍에 맞춰 bullet을 보낸다.
+    다른 SSE 요청이 같은 요약을 스트리밍 중이면 합류하여 이미 나온 bullet부터 이어 받는다.
+    같은 요약을 비스트리밍 요청(/news/{symbol}, pre-warm 등)이 생성 중이면 완료 후 bullet을 한 번에 보낸다.
+    실패 시 error 이벤트를 보내고 종료한다.
+    """
+    yield _sse("articles", {
+        "symbol": symbol,
+        "company_name": display_name,
+        "articles": [a.model_dump() for a in _build_article_outs(raw_articles)],
+    })
+
+    allow_stale = get_cache_config().stale_while_revalidate
+    flight_key = (ticker_id, lang, feature)
+    points: asyncio.Queue[SummaryPoint] = asyncio.Queue()
+    known_miss = False
+
+    async def produce() -> DigestOut:
+        if not known_miss:
+            cached_digest = await get_cached_digest(db, ticker_id, lang)
+            if cached_digest:
+                return _digest_to_out(cached_digest)
+        _point_history[flight_key] = []
+        try:
+            digest = await _summarize_and_save(
+                db, ticker_id, symbol, company_name, raw_articles, lang, feature,
+                on_point=lambda point: _publish_point(flight_key, point),
+            )
+        finally:
+            _point_history.pop(flight_key, None)
+        return _digest_to_out(digest)
+
+    try:
+        digest_out = None
+        if allow_stale:
+            digest, stale = await lookup_digest(db, ticker_id, lang)
+            if digest:
+                digest_out = _digest_to_out(digest, stale=stale)
+            else:
+                known_miss = True
+
+        sent = 0
+        if digest_out is None:
+            # 같은 키의 요약이 진행 중이면 합류해 이미 나온 bullet부터 이어 받고, 아니면 직접 스트리밍한다.
+            _subscribe_points(flight_key, points)
+            try:
+                flight = asyncio.ensure_future(_digest_flights.do(flight_key, produce))
+                while True:
+                    getter = asyncio.ensure_future(points.get())
+                    done, _ = await asyncio.wait({getter, flight}, return_when=asyncio.FIRST_COMPLETED)
+                    if getter in done:
+                        yield _sse("bullet", getter.result())
+                        sent += 1
+                        continue
+                    getter.cancel()
+                    break
+                while not points.empty():
+                    yield _sse("bullet", points.get_nowait())
+                    sent += 1
+                digest_out = flight.result()
+            finally:
+                _unsubscribe_points(flight_key, points)
+
+        if sent == 0:
+            for point in digest_out.summary:
+                yield _sse("bullet", point)
+        yield _sse("digest", digest_out)
+        yield _sse("done", {"last_updated": datetime.now(timezone.utc).isoformat()})
+
+        if articles_stale or digest_out.stale:
+            _schedule_refresh(db, ticker_id, symbol, company_name, fetch_fn, limit, lang, feature)
+    except Exception as exc:
+        logger.error("스트리밍 요약 실패: symbol=%s, error=%s", symbol, exc)
+        yield _sse("error", {"code": "SUMMARIZATION_FAILED", "message": "뉴스 요약 생성에 실패했습니다."})
+
+
+def _publish_point(key: tuple, point: SummaryPoint) -> None:
+    history = _point_history.get(key)
+    if history is not None:
+        history.append(point)
+    for queue in _point_subscribers.get(key, ()):
+        queue.put_nowait(point)
+
+
+def _subscribe_points(key: tuple, queue: asyncio.Queue) -> None:
+    """진행 중인 스트리밍 요약이 있으면 지금까지 나온 bullet을 먼저 넣어 준다."""
+    for point in _point_history.get(key, ()):
+        queue.put_nowait(point)
+    _point_subscribers.setdefault(key, set()).add(queue)
+
+
+def _unsubscribe_points(key: tuple, queue: asyncio.Queue) -> None:
+    subscribers = _point_subscribers.get(key)
+    if subscribers is not None:
+        subscribers.discard(queue)
+        if not subscribers:
+            del _point_subscribers[key]
+
+
+def _event_stream_response(events: AsyncIterator[str]) -> StreamingResponse:
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# ── pre-warm (prewarm_service에서 호출) ───────────────────────────────────────
+
+PREWARM_LIMIT = 10
+
+# 이번 pre-warm 주기에 갱신할 종목들의 RSS 대체 조회 묶음 (prewarm_begin에서 주기마다 교체)
+_prewarm_rss: Optional[RssLookup] = None
+# 이번 주기의 심볼별 갱신 대상 언어와, 심볼별 갱신 작업 (여러 언어가 대상이어도 기사는 한 번만 수집한다)
+_prewarm_langs: dict[str, list[str]] = {}
+_prewarm_runs: dict[str, asyncio.Future] = {}
+
+
+def prewarm_begin(keys: list[tuple[str, str]]) -> None:
+    """
+    pre-warm 주기의 갱신 대상이 정해지면 호출된다.
+    대상을 심볼별로 묶고, 종목들의 RSS 대체 조회를 한 번으로 묶는다.
+    """
+    global _prewarm_rss, _prewarm_langs, _prewarm_runs
+    langs: dict[str, list[str]] = {}
+    for symbol, lang in keys:
+        langs.setdefault(symbol, []).append(lang)
+    _prewarm_langs = langs
+    _prewarm_runs = {}
+    _prewarm_rss = RssLookup([symbol for symbol in langs if symbol != MARKET_SYMBOL], PREWARM_LIMIT)
+
+
+def _prewarm_pipeline(symbol: str) -> tuple[str, str, object]:
+    """심볼별 (company_name, feature, fetch_fn)을 반환한다."""
+    if symbol == MARKET_SYMBOL:
+        return (
+            "MarketWatch Top Stories", "market_pulse",
+            lambda lookup: fetch_market_news(PREWARM_LIMIT, lookup),
+        )
+    rss = _prewarm_rss if _prewarm_rss is not None and symbol in _prewarm_rss else None
+    return symbol, "ticker_brief", lambda lookup: fetch_articles(symbol, PREWARM_LIMIT, lookup, rss)
+
+
+async def prewarm_due(symbol: str, lang: str) -> bool:
+    """요약 캐시가 없거나 lead_sec 이내에 만료되면 True. ticker를 새로 만들지는 않는다."""
+    db = await get_db()
+    ticker_id = await db.get_ticker_id(symbol)
+    if ticker_id is None:
+        # MARKET은 사용자 요청 전에도 갱신하고, 그 밖의 심볼은 저장된 적이 없으면 대상이 아니다.
+        return symbol == MARKET_SYMBOL
+    digest = await get_cached_digest(db, ticker_id, lang)
+    if digest is None:
+        return True
+    expires_at = digest.valid_from + timedelta(hours=get_cache_config().summary_ttl_hours)
+    remaining = (expires_at - datetime.now(timezone.utc)).total_seconds()
+    return remaining < get_prewarm_config().lead_sec
+
+
+async def prewarm_symbol(symbol: str, lang: str) -> bool:
+    """
+    기사를 새로 수집하고 요약을 재생성한다. 같은 키의 사용자 요청과 병합된다.
+    같은 주기에 같은 심볼의 여러 언어가 대상이면 기사는 한 번만 수집하고 그 기사로 언어별 요약을 만든다.
+    수집된 기사가 없으면 False를 반환하며, 스케줄러는 해당 키를 추적에서 제외한다.
+    """
+    langs = _prewarm_langs.get(symbol, [])
+    if lang not in langs:
+        # prewarm_begin에서 묶지 않은 키는 단독으로 갱신한다.
+        langs = [lang]
+        run = None
+    else:
+        run = _prewarm_runs.get(symbol)
+    if run is None:
+        with llm_priority(Priority.PREWARM):
+            run = asyncio.ensure_future(_prewarm_refresh(symbol, langs))
+        if len(langs) > 1:
+            _prewarm_runs[symbol] = run
+    # 먼저 시작한 언어의 호출이 취소되어도 같은 심볼의 다른 언어 갱신은 계속 진행한다.
+    outcome = (await asyncio.shield(run))[lang]
+    if isinstance(outcome, BaseException):
+        raise outcome
+    return outcome
+
+
+async def _prewarm_refresh(symbol: str, langs: list[str]) -> dict[str, object]:
+    """기사를 한 번 수집해 langs의 요약을 모두 갱신한다. 반환값: {lang: 기사 유무(bool) 또는 요약 예외}"""
+    db = await get_db()
+    company_name, feature, fetch_fn = _prewarm_pipeline(symbol)
+    ticker_id = await get_or_create_ticker(db, symbol, company_name)
+
+    raw_articles = await _article_flights.do(
+        (ticker_id, PREWARM_LIMIT),
+        lambda: _fetch_and_save_articles(db, ticker_id, fetch_fn),
+    )
+    if not raw_articles:
+        return {lang: False for lang in langs}
+
+    async def summarize(lang: str) -> DigestResult:
+        return await _digest_flights.do(
+            (ticker_id, lang, feature),
+            lambda: _summarize_and_save(db, ticker_id, symbol, company_name, raw_articles, lang, feature),
+        )
+
+    # bilingual feature면 두 언어가 _bilingual_flights에서 한 번의 LLM 호출로 합쳐진다.
+    outcomes = await asyncio.gather(*(summarize(lang) for lang in langs), return_exceptions=True)
+    return {
+        lang: outcome if isinstance(outcome, BaseException) else True
+        for lang, outcome in zip(langs, outcomes)
+    }
+
+
 # ── 엔드포인트 ────────────────────────────────────────────────────────────────
 
 @router.get(
@@ -147,9 +614,11 @@ async def get_market_pulse(
     1시간 이내에 수집된 기사가 있으면 DB 캐시를 재사용한다.
     """
     ticker_id = await get_or_create_ticker(db, "MARKET", "MarketWatch Top Stories")
+    allow_stale = get_cache_config().stale_while_revalidate
+    fetch_fn = lambda lookup: fetch_market_news(10, lookup)
 
-    raw_articles = await _get_or_fetch_articles(
-        db, ticker_id, lambda: fetch_market_news(limit=10), limit=10
+    raw_articles, articles_stale = await _get_or_fetch_articles(
+        db, ticker_id, fetch_fn, limit=10, allow_stale=allow_stale
     )
     if not raw_articles:
         raise HTTPException(
@@ -160,7 +629,7 @@ async def get_market_pulse(
     try:
         digest_out = await _get_or_summarize(
             db, ticker_id, "MARKET", "MarketWatch Top Stories", raw_articles, lang,
-            feature="market_pulse",
+            feature="market_pulse", allow_stale=allow_stale,
         )
     except Exception as exc:
         logger.error("Market Pulse 요약 실패: %s", exc)
@@ -169,6 +638,12 @@ async def get_market_pulse(
             detail={"code": "SUMMARIZATION_FAILED", "message": "시장 요약 생성에 실패했습니다."},
         )
 
+    if articles_stale or digest_out.stale:
+        _schedule_refresh(
+            db, ticker_id, "MARKET", "MarketWatch Top Stories", fetch_fn, 10, lang, "market_pulse"
+        )
+
+    prewarm_scheduler.record(MARKET_SYMBOL, lang)
     return NewsResponse(
         symbol="MARKET",
         company_name="MarketWatch",
@@ -178,6 +653,122 @@ async def get_market_pulse(
     )
 
 
+@router.get(
+    "/market-pulse/stream",
+    summary="MarketWatch 최신 뉴스 + AI 비서 요약 (SSE 스트리밍)",
+)
+async def stream_market_pulse(
+    lang: str = Query(default="ko", pattern="^(ko|en)$"),
+    db=Depends(get_db),
+):
+    """
+    /news/market-pulse의 Server-Sent Events 버전.
+    기사 목록을 먼저 보내고, 요약 bullet을 LLM 응답에 맞춰 순차 전송한다.
+    같은 요약을 비스트리밍 요청이 생성 중이면 그 완료를 기다려 bullet을 한 번에 보낸다.
+    """
+    ticker_id = await get_or_create_ticker(db, "MARKET", "MarketWatch Top Stories")
+    fetch_fn = lambda lookup: fetch_market_news(10, lookup)
+
+    raw_articles, articles_stale = await _get_or_fetch_articles(
+        db, ticker_id, fetch_fn, limit=10,
+        allow_stale=get_cache_config().stale_while_revalidate,
+    )
+    if not raw_articles:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"code": "NO_NEWS", "message": "최신 시장 뉴스를 가져올 수 없습니다."},
+        )
+
+    prewarm_scheduler.record(MARKET_SYMBOL, lang)
+    return _event_stream_response(_news_event_stream(
+        db, ticker_id, "MARKET", "MarketWatch Top Stories", "MarketWatch",
+        raw_articles, articles_stale, fetch_fn, 10, lang, "market_pulse",
+    ))
+
+
+@router.get(
+    "/batch",
+    response_model=BatchNewsResponse,
+    summary="여러 종목 최신 뉴스 + AI 종합 요약 일괄 조회",
+)
+async def get_news_batch(
+    symbols: str = Query(..., min_length=1, description="쉼표로 구분된 티커 목록"),
+    limit: int = Query(default=10, ge=1, le=20),
+    lang: str = Query(default="ko", pattern="^(ko|en)$"),
+    db=Depends(get_db),
+):
+    """
+    여러 티커의 뉴스/요약을 한 번에 조회한다.
+    ticker_id와 유효한 캐시는 in_ 쿼리로 일괄 조회하고, 캐시 미스 종목만
+    동시성 제한 하에 개별 수집/요약한다. (RSS 대체 조회는 미스 종목 전체를 한 번에)
+    실패는 종목별 error로 반환한다.
+    """
+    upper_symbols = list(dict.fromkeys(s.strip().upper() for s in symbols.split(",") if s.strip()))
+    if not upper_symbols or len(upper_symbols) > BATCH_MAX_SYMBOLS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "code": "INVALID_SYMBOLS",
+                "message": f"티커는 1개 이상 {BATCH_MAX_SYMBOLS}개 이하로 요청해주세요.",
+            },
+        )
+
+    ticker_ids = await get_ticker_ids(db, upper_symbols)
+    id_list = list(ticker_ids.values())
+    digests, cached_articles = await asyncio.gather(
+        get_cached_digests(db, id_list, lang),
+        get_cached_articles_bulk(db, id_list, limit),
+    )
+
+    results: dict[str, BatchNewsItem] = {}
+    misses: list[str] = []
+    now = datetime.now(timezone.utc).isoformat()
+    for symbol in upper_symbols:
+        ticker_id = ticker_ids[symbol]
+        if ticker_id not in digests or ticker_id not in cached_articles:
+            misses.append(symbol)
+            continue
+        prewarm_scheduler.record(symbol, lang)
+        results[symbol] = BatchNewsItem(
+            symbol=symbol,
+            data=NewsResponse(
+                symbol=symbol,
+                company_name=symbol,
+                last_updated=now,
+                digest=_digest_to_out(digests[ticker_id]),
+                articles=_build_article_outs(_rows_to_raw_articles(cached_articles[ticker_id])),
+            ),
+        )
+
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+    # yfinance 수집에 실패한 미스 종목들의 RSS 대체 조회는 한 번으로 묶는다.
+    rss = RssLookup(misses, limit)
+
+    async def resolve(symbol: str) -> BatchNewsItem:
+        async with semaphore:
+            try:
+                with llm_priority(Priority.BATCH):
+                    data = await _get_ticker_news(db, symbol, limit, lang, ticker_ids[symbol], rss)
+                return BatchNewsItem(symbol=symbol, data=data)
+            except HTTPException as exc:
+                return BatchNewsItem(
+                    symbol=symbol,
+                    error=BatchErrorOut(**exc.detail, status=exc.status_code),
+                )
+            except Exception as exc:
+                logger.error("일괄 조회 실패: symbol=%s, error=%s", symbol, exc)
+                return BatchNewsItem(
+                    symbol=symbol,
+                    error=BatchErrorOut(code="INTERNAL_ERROR", message="서버 오류가 발생했습니다.", status=500),
+                )
+
+    for item in await asyncio.gather(*(resolve(s) for s in misses)):
+        results[item.symbol] = item
+
+    logger.info("일괄 조회: symbols=%d, cache_hit=%d", len(upper_symbols), len(upper_symbols) - len(misses))
+    return BatchNewsResponse(results=[results[s] for s in upper_symbols])
+
+
 @router.get(
     "/{symbol}",
     response_model=NewsResponse,
@@ -193,11 +784,31 @@ async def get_news(
     특정 티커에 대한 최신 뉴스를 수집하고 AI 종합 요약을 제공한다.
     1시간 이내에 수집된 기사가 있으면 DB 캐시를 재사용한다.
     """
+    return await _get_ticker_news(db, symbol.upper(), limit, lang)
+
+
+@router.get(
+    "/{symbol}/stream",
+    summary="종목 최신 뉴스 + AI 종합 요약 (SSE 스트리밍)",
+)
+async def stream_news(
+    symbol: str,
+    limit: int = Query(default=10, ge=1, le=20),
+    lang: str = Query(default="ko", pattern="^(ko|en)$"),
+    db=Depends(get_db),
+):
+    """
+    /news/{symbol}의 Server-Sent Events 버전.
+    기사 목록을 먼저 보내고, 요약 bullet을 LLM 응답에 맞춰 순차 전송한다.
+    같은 요약을 비스트리밍 요청이 생성 중이면 그 완료를 기다려 bullet을 한 번에 보낸다.
+    """
     upper_symbol = symbol.upper()
     ticker_id = await get_or_create_ticker(db, upper_symbol)
+    fetch_fn = lambda lookup: fetch_articles(upper_symbol, limit, lookup)
 
-    raw_articles = await _get_or_fetch_articles(
-        db, ticker_id, lambda: fetch_articles(upper_symbol, limit), limit=limit
+    raw_articles, articles_stale = await _get_or_fetch_articles(
+        db, ticker_id, fetch_fn, limit=limit,
+        allow_stale=get_cache_config().stale_while_revalidate,
     )
     if not raw_articles:
         raise HTTPException(
@@ -205,21 +816,8 @@ async def get_news(
             detail={"code": "NO_NEWS", "message": f"{upper_symbol}에 대한 뉴스를 찾을 수 없습니다."},
         )
 
-    try:
-        digest_out = await _get_or_summarize(
-            db, ticker_id, upper_symbol, upper_symbol, raw_articles, lang
-        )
-    except Exception as exc:
-        logger.error("종목 요약 실패: symbol=%s, error=%s", upper_symbol, exc)
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail={"code": "SUMMARIZATION_FAILED", "message": "뉴스 요약 생성에 실패했습니다."},
-        )
-
-    return NewsResponse(
-        symbol=upper_symbol,
-        company_name=upper_symbol,
-        last_updated=datetime.now(timezone.utc).isoformat(),
-        digest=digest_out,
-        articles=_build_article_outs(raw_articles),
-    )
+    prewarm_scheduler.record(upper_symbol, lang)
+    return _event_stream_response(_news_event_stream(
+        db, ticker_id, upper_symbol, upper_symbol, upper_symbol,
+        raw_articles, articles_stale, fetch_fn, limit, lang, "ticker_brief",
+    ))
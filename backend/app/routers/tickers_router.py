@@ -5,11 +5,20 @@ tickers_router.py
 """
 
 import asyncio
+import logging
+from functools import partial
+from typing import Optional
 
 import yfinance as yf
 from fastapi import APIRouter, Query
 from pydantic import BaseModel
 
+from app.config import get_ingestion_config, get_ticker_search_config
+from app.services.ingestion_service import run_blocking
+from app.services.local_cache_service import ticker_search_cache
+from app.services.symbol_index_service import search_local_symbols, suggest_local_symbols
+
+logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/tickers", tags=["tickers"])
 
 
@@ -23,6 +32,54 @@ class SearchResponse(BaseModel):
     results: list[TickerResult]
 
 
+async def _search_yfinance(q: str, max_results: int) -> list[TickerResult]:
+    """yf.Search 결과 중 EQUITY만 반환한다. 정확한 심볼 일치를 맨 앞에 둔다."""
+    search = await run_blocking(
+        partial(yf.Search, q, max_results=max_results),
+        timeout=get_ingestion_config().yfinance_timeout_sec,
+    )
+
+    keyword = q.upper()
+    results = []
+    for quote in search.quotes:
+        symbol = quote.get("symbol", "")
+        if not symbol or quote.get("quoteType") != "EQUITY":
+            continue
+        name = quote.get("shortname") or quote.get("longname") or ""
+        exchange = quote.get("exchange")
+        results.append(TickerResult(symbol=symbol, name=name, exchange=exchange))
+
+    results.sort(key=lambda r: r.symbol.upper() != keyword)
+    return results
+
+
+def _to_results(entries) -> list[TickerResult]:
+    return [TickerResult(symbol=e.symbol, name=e.name, exchange=e.exchange) for e in entries]
+
+
+async def _search_yfinance_cached(q: str, max_results: int, ttl: float) -> Optional[list[TickerResult]]:
+    """
+    yfinance 검색 결과를 TTL 캐시를 거쳐 반환한다.
+    타임아웃이나 네트워크 오류면 None을 반환하고 캐시하지 않는다. (로컬 오타 보정 후보로 응답)
+    """
+    cache_key = q.strip().upper()
+    cached = ticker_search_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    try:
+        results = await _search_yfinance(q, max_results)
+    except asyncio.TimeoutError:
+        logger.warning("yfinance 검색 타임아웃: q=%s", q)
+        return None
+    except Exception as e:
+        logger.warning("yfinance 검색 실패: q=%s, error=%s", q, e)
+        return None
+
+    ticker_search_cache.set(cache_key, results, ttl)
+    return results
+
+
 @router.get(
     "/search",
     response_model=SearchResponse,
@@ -34,20 +91,18 @@ async def search_tickers(
     """
     티커 심볼 또는 회사명으로 검색한다. 인증 불필요.
     Rate Limit: 30회/분 (미들웨어에서 처리).
-    yfinance Search API를 사용한다.
+    로컬 심볼 인덱스에 정확/접두사 일치가 하나라도 있으면 그대로 반환하고,
+    로컬 인덱스가 못 찾은 경우에만 yfinance Search API(TTL 캐시)를 호출한다.
+    그래도 결과가 없으면(yfinance 실패 포함) 로컬 인덱스의 오타 보정(fuzzy) 후보를 반환한다.
     """
-    search = await asyncio.to_thread(yf.Search, q, max_results=10)
+    config = get_ticker_search_config()
 
-    keyword = q.upper()
-    results = []
-    for quote in search.quotes:
-        symbol = quote.get("symbol", "")
-        if symbol.upper() != keyword:
-            continue
-        if quote.get("quoteType") != "EQUITY":
-            continue
-        name = quote.get("shortname") or quote.get("longname") or ""
-        exchange = quote.get("exchange")
-        results.append(TickerResult(symbol=symbol, name=name, exchange=exchange))
+    local = _to_results(search_local_symbols(q, config.max_results))
+    if local:
+        return SearchResponse(results=local)
 
-    return SearchResponse(results=results)
+    remote = await _search_yfinance_cached(q, config.max_results, config.yfinance_cache_ttl_sec)
+    if remote:
+        return SearchResponse(results=remote[:config.max_results])
+    # 어디에도 일치가 없으면(또는 yfinance 실패) 오타 보정 후보를 보여 준다.
+    return SearchResponse(results=_to_results(suggest_local_symbols(q, config.max_results)))
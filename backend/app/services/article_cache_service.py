@@ -4,80 +4,206 @@ article_cache_service.py
 뉴스 기사 DB 캐싱 서비스.
 - 1시간 TTL로 기사를 캐싱하여 외부 API 중복 호출을 방지한다.
 - ticker 조회/생성 헬퍼를 제공한다.
+- 프로세스 내 L1 캐시(local_cache_service)를 먼저 조회하여 DB 왕복을 줄인다.
+DB 접근은 저장소 인터페이스(app.repositories)를 거친다.
 """
 
 import logging
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
-from supabase import AsyncClient
-
 from app.config import get_cache_config
+from app.repositories import Repository
+from app.services.local_cache_service import TICKER_ID_TTL_SEC, article_cache, ticker_id_cache
+from app.services.metrics_service import record_cache_lookup, timed
 from app.services.news_service import RawArticle
 
 logger = logging.getLogger(__name__)
 
 
+@timed("resolve")
 async def get_or_create_ticker(
-    db: AsyncClient,
+    db: Repository,
     symbol: str,
     name: str = "",
     exchange: Optional[str] = None,
 ) -> int:
     """ticker를 조회하고, 없으면 생성한 뒤 ticker_id를 반환한다."""
-    res = (
-        await db.table("tickers")
-        .select("id")
-        .eq("symbol", symbol)
-        .limit(1)
-        .execute()
-    )
-    if res.data:
-        return res.data[0]["id"]
-
-    insert_res = (
-        await db.table("tickers")
-        .insert({"symbol": symbol, "name": name or symbol, "exchange": exchange})
-        .execute()
-    )
-    return insert_res.data[0]["id"]
+    cached_id = ticker_id_cache.get(symbol)
+    if cached_id is not None:
+        return cached_id
+
+    ticker_id = await db.get_ticker_id(symbol)
+    if ticker_id is None:
+        ticker_id = await db.create_ticker(symbol, name or symbol, exchange)
 
+    ticker_id_cache.set(symbol, ticker_id, TICKER_ID_TTL_SEC)
+    return ticker_id
 
+
+@timed("resolve")
+async def get_ticker_ids(db: Repository, symbols: list[str]) -> dict[str, int]:
+    """
+    여러 심볼의 ticker_id를 한 번의 쿼리로 조회한다.
+    DB에 없는 심볼은 개별 생성한다. 반환값: {symbol: ticker_id}
+    """
+    ids: dict[str, int] = {}
+    missing: list[str] = []
+    for symbol in symbols:
+        cached_id = ticker_id_cache.get(symbol)
+        if cached_id is not None:
+            ids[symbol] = cached_id
+        else:
+            missing.append(symbol)
+
+    if missing:
+        for symbol, ticker_id in (await db.get_ticker_ids(missing)).items():
+            ids[symbol] = ticker_id
+            ticker_id_cache.set(symbol, ticker_id, TICKER_ID_TTL_SEC)
+
+    for symbol in missing:
+        if symbol not in ids:
+            ids[symbol] = await get_or_create_ticker(db, symbol)
+    return ids
+
+
+@timed("article_cache")
 async def get_cached_articles(
-    db: AsyncClient,
+    db: Repository,
     ticker_id: int,
     limit: int = 10,
 ) -> Optional[list[dict]]:
+    cached = article_cache.get((ticker_id, limit))
+    if cached is not None:
+        record_cache_lookup("article", "hit_local")
+        return cached
 
-    cutoff = datetime.now(tz=timezone.utc) - timedelta(hours=get_cache_config().article_ttl_hours)
+    ttl = timedelta(hours=get_cache_config().article_ttl_hours)
+    now = datetime.now(tz=timezone.utc)
+    cutoff = now - ttl
 
-    res = (
-        await db.table("news_articles")
-        .select("*")
-        .eq("ticker_id", ticker_id)
-        .gte("created_at", cutoff.isoformat())
-        .order("published_at", desc=True)
-        .limit(limit)
-        .execute()
-    )
+    rows = await db.get_articles(ticker_id, cutoff, limit)
 
-    if not res.data:
+    if not rows:
         logger.debug("기사 캐시 미스: ticker_id=%d", ticker_id)
+        record_cache_lookup("article", "miss")
         return None
 
-    logger.info("기사 캐시 히트: ticker_id=%d, count=%d", ticker_id, len(res.data))
-    return res.data
+    logger.info("기사 캐시 히트: ticker_id=%d, count=%d", ticker_id, len(rows))
+    record_cache_lookup("article", "hit")
+    _remember_articles(ticker_id, limit, rows, ttl, now)
+    return rows
+
+
+def _remember_articles(ticker_id: int, limit: int, rows: list[dict], ttl: timedelta, now: datetime) -> None:
+    """가장 먼저 만료되는 행 기준으로 L1 TTL을 잡아 DB보다 오래 살아남지 않게 한다."""
+    oldest = min(datetime.fromisoformat(r["created_at"]) for r in rows)
+    article_cache.set((ticker_id, limit), rows, (oldest + ttl - now).total_seconds())
+
+
+@timed("article_cache")
+async def get_cached_articles_bulk(
+    db: Repository,
+    ticker_ids: list[int],
+    limit: int = 10,
+) -> dict[int, list[dict]]:
+    """
+    여러 티커의 TTL 이내 기사를 한 번의 쿼리로 조회한다.
+    반환값: {ticker_id: 최신순 기사 행 (최대 limit개)} — 캐시가 없는 티커는 포함되지 않는다.
+    """
+    result: dict[int, list[dict]] = {}
+    missing: list[int] = []
+    for ticker_id in ticker_ids:
+        cached = article_cache.get((ticker_id, limit))
+        if cached is not None:
+            result[ticker_id] = cached
+        else:
+            missing.append(ticker_id)
+    if not missing:
+        return result
+
+    ttl = timedelta(hours=get_cache_config().article_ttl_hours)
+    now = datetime.now(tz=timezone.utc)
+    grouped = await db.get_articles_bulk(missing, now - ttl, limit)
+    for ticker_id, rows in grouped.items():
+        _remember_articles(ticker_id, limit, rows, ttl, now)
+        result[ticker_id] = rows
+    return result
+
+
+@timed("article_cache")
+async def lookup_articles(
+    db: Repository,
+    ticker_id: int,
+    limit: int = 10,
+) -> tuple[Optional[list[dict]], bool]:
+    """
+    stale-while-revalidate용 조회. max_stale_hours 이내 최신 기사를 한 번의 쿼리로 읽고 신선도를 함께 판정한다.
+    TTL 이내에 저장(갱신)된 행이 있으면 그 행들만 fresh로, 없으면 전체를 stale로 반환한다.
+    반환값: (기사 행 또는 None, stale 여부)
+    """
+    cached = article_cache.get((ticker_id, limit))
+    if cached is not None:
+        record_cache_lookup("article", "hit_local")
+        return cached, False
+
+    config = get_cache_config()
+    ttl = timedelta(hours=config.article_ttl_hours)
+    now = datetime.now(tz=timezone.utc)
+    window = max(timedelta(hours=config.max_stale_hours), ttl)
+    rows = await db.get_articles(ticker_id, now - window, limit)
+    if not rows:
+        logger.debug("기사 캐시 미스: ticker_id=%d", ticker_id)
+        record_cache_lookup("article", "miss")
+        return None, False
+
+    fresh = [r for r in rows if datetime.fromisoformat(r["created_at"]) >= now - ttl]
+    if fresh:
+        record_cache_lookup("article", "hit")
+        _remember_articles(ticker_id, limit, fresh, ttl, now)
+        return fresh, False
+    record_cache_lookup("article", "stale")
+    return rows, True
+
+
+@timed("article_cache")
+async def get_stored_bodies(db: Repository, urls: list[str]) -> dict[str, str]:
+    """이미 저장된 URL을 한 번의 쿼리로 조회한다. 반환값: {url: raw_content}"""
+    urls = list(dict.fromkeys(u for u in urls if u))
+    if not urls:
+        return {}
+    return await db.get_article_bodies(urls)
+
+
+async def touch_articles(db: Repository, ticker_id: int, urls: list[str]) -> list[dict]:
+    """
+    다시 수집된 기존 기사의 created_at을 현재 시각으로 갱신하고 갱신된 행을 반환한다.
+    created_at은 기사 캐시 TTL 기준이므로, 새 기사가 없는 티커도 다음 TTL 동안 캐시 히트가 된다.
+    """
+    if not urls:
+        return []
+    return await db.touch_articles(ticker_id, urls, datetime.now(tz=timezone.utc))
 
 
+@timed("cache_save")
 async def save_articles(
-    db: AsyncClient,
+    db: Repository,
     ticker_id: int,
     articles: list[RawArticle],
+    known_urls: Optional[set[str]] = None,
 ) -> list[dict]:
     """
     수집된 기사를 news_articles에 저장한다.
     url 중복 시 무시(upsert)하고 저장된 행들을 반환한다.
+    known_urls(이미 저장된 URL)가 주어지면 새 기사만 upsert하고 기존 기사는 created_at만 갱신한다.
+    반환값에는 갱신된 기존 행도 포함되며, 각 RawArticle.id를 해당 행의 id로 채운다.
     """
+    touched: list[dict] = []
+    all_articles = articles
+    if known_urls:
+        touched = await touch_articles(db, ticker_id, [a.url for a in articles if a.url in known_urls])
+        articles = [a for a in articles if a.url not in known_urls]
+
     rows = [
         {
             "ticker_id": ticker_id,
@@ -90,14 +216,14 @@ async def save_articles(
         for a in articles
         if a.url  # URL 없는 기사는 UNIQUE 제약 충돌 방지를 위해 저장 제외
     ]
-    if not rows:
-        return []
-
-    res = (
-        await db.table("news_articles")
-        .upsert(rows, on_conflict="url", ignore_duplicates=True)
-        .execute()
-    )
-
-    logger.info("기사 저장: ticker_id=%d, saved=%d", ticker_id, len(res.data))
-    return res.data
+    inserted: list[dict] = []
+    if rows:
+        inserted = await db.insert_articles(rows)
+        logger.info("기사 저장: ticker_id=%d, saved=%d", ticker_id, len(inserted))
+
+    article_cache.invalidate_where(lambda key: key[0] == ticker_id)
+    saved = touched + inserted
+    ids = {row["url"]: row["id"] for row in saved}
+    for article in all_articles:
+        article.id = ids.get(article.url, article.id)
+    return saved
@@ -2,7 +2,11 @@
 cache_service.py
 ────────────────
 티커 단위 종합 요약 캐시 서비스.
-캐시 키: (ticker_id + 24h TTL)
+캐시 키: (ticker_id + TTL). TTL은 refreshed_at 기준이다.
+요약마다 입력 기사 집합의 fingerprint를 저장하여, TTL 만료 후 같은 기사 집합이면
+LLM 재호출 없이 기존 행의 refreshed_at만 연장한다. (reuse_digest)
+파싱된 DigestResult는 프로세스 내 L1 캐시(local_cache_service)에도 보관한다.
+DB 접근은 저장소 인터페이스(app.repositories)를 거친다.
 """
 
 import json
@@ -10,42 +14,22 @@ import logging
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
-from supabase import AsyncClient
-
 from app.config import get_cache_config
+from app.repositories import Repository
+from app.services.local_cache_service import digest_cache
+from app.services.metrics_service import record_cache_lookup, timed
 from app.services.summarization_service import DigestResult, SummaryPoint
 
 logger = logging.getLogger(__name__)
 
 
-async def get_cached_digest(
-    db: AsyncClient,
-    ticker_id: int,
-    lang: str = "ko",
-) -> Optional[DigestResult]:
-    """
-    유효한 캐시(TTL 이내)가 있으면 DigestResult를 반환하고, 없으면 None을 반환한다.
-    """
-    cutoff = datetime.now(tz=timezone.utc) - timedelta(hours=get_cache_config().summary_ttl_hours)
-
-    res = (
-        await db.table("ticker_summaries")
-        .select("*")
-        .eq("ticker_id", ticker_id)
-        .gte("created_at", cutoff.isoformat())
-        .order("created_at", desc=True)
-        .limit(1)
-        .execute()
-    )
-
-    if not res.data:
-        logger.debug("캐시 미스: ticker_id=%d", ticker_id)
-        return None
+def _summary_column(lang: str) -> str:
+    return "summary_en" if lang == "en" else "summary_ko"
 
-    row = res.data[0]
-    logger.info("캐시 히트: ticker_id=%d", ticker_id)
 
-    summary_text: str = row["summary_ko"] if lang == "ko" else (row["summary_en"] or row["summary_ko"])
+def _row_to_digest(row: dict, lang: str) -> DigestResult:
+    """ticker_summaries 행을 DigestResult로 변환한다."""
+    summary_text: str = row[_summary_column(lang)]
 
     # JSON 형식(새 포맷) → 기존 bullet 텍스트(구 포맷) 순으로 시도
     try:
@@ -66,46 +50,197 @@ async def get_cached_digest(
         article_ids=row["article_ids"],
         article_count=row["article_count"],
         created_at=datetime.fromisoformat(row["created_at"]),
+        fingerprint=row.get("fingerprint") or "",
+        refreshed_at=datetime.fromisoformat(row["refreshed_at"]) if row.get("refreshed_at") else None,
     )
 
 
+@timed("digest_cache")
+async def get_cached_digest(
+    db: Repository,
+    ticker_id: int,
+    lang: str = "ko",
+) -> Optional[DigestResult]:
+    """
+    유효한 캐시(TTL 이내)가 있으면 DigestResult를 반환하고, 없으면 None을 반환한다.
+    """
+    cached = digest_cache.get((ticker_id, lang))
+    if cached is not None:
+        record_cache_lookup("digest", "hit_local")
+        return cached
+
+    cutoff = datetime.now(tz=timezone.utc) - timedelta(hours=get_cache_config().summary_ttl_hours)
+
+    row = await db.get_latest_summary(ticker_id, cutoff, _summary_column(lang))
+
+    if row is None:
+        logger.debug("캐시 미스: ticker_id=%d", ticker_id)
+        record_cache_lookup("digest", "miss")
+        return None
+
+    logger.info("캐시 히트: ticker_id=%d", ticker_id)
+    record_cache_lookup("digest", "hit")
+
+    digest = _row_to_digest(row, lang)
+    _remember_digest(ticker_id, lang, digest)
+    return digest
+
+
+@timed("digest_cache")
+async def get_cached_digests(
+    db: Repository,
+    ticker_ids: list[int],
+    lang: str = "ko",
+) -> dict[int, DigestResult]:
+    """
+    여러 티커의 유효한 캐시를 한 번의 쿼리로 조회한다.
+    반환값: {ticker_id: 가장 최근 DigestResult} — 캐시가 없는 티커는 포함되지 않는다.
+    """
+    result: dict[int, DigestResult] = {}
+    missing: list[int] = []
+    for ticker_id in ticker_ids:
+        cached = digest_cache.get((ticker_id, lang))
+        if cached is not None:
+            result[ticker_id] = cached
+        else:
+            missing.append(ticker_id)
+    if not missing:
+        return result
+
+    cutoff = datetime.now(tz=timezone.utc) - timedelta(hours=get_cache_config().summary_ttl_hours)
+    rows = await db.get_latest_summaries(missing, cutoff, _summary_column(lang))
+    for ticker_id, row in rows.items():
+        digest = _row_to_digest(row, lang)
+        _remember_digest(ticker_id, lang, digest)
+        result[ticker_id] = digest
+
+    logger.info("일괄 캐시 조회: requested=%d, hit=%d", len(ticker_ids), len(result))
+    return result
+
+
+@timed("digest_cache")
+async def lookup_digest(
+    db: Repository,
+    ticker_id: int,
+    lang: str = "ko",
+) -> tuple[Optional[DigestResult], bool]:
+    """
+    stale-while-revalidate용 조회. max_stale_hours 이내의 가장 최근 요약을 한 번의 쿼리로 읽고
+    refreshed_at 기준으로 TTL 이내인지 함께 판정한다. 반환값: (요약 또는 None, stale 여부)
+    """
+    cached = digest_cache.get((ticker_id, lang))
+    if cached is not None:
+        record_cache_lookup("digest", "hit_local")
+        return cached, False
+
+    config = get_cache_config()
+    ttl = timedelta(hours=config.summary_ttl_hours)
+    now = datetime.now(tz=timezone.utc)
+    window = max(timedelta(hours=config.max_stale_hours), ttl)
+    row = await db.get_latest_summary(ticker_id, now - window, _summary_column(lang))
+    if row is None:
+        logger.debug("캐시 미스: ticker_id=%d", ticker_id)
+        record_cache_lookup("digest", "miss")
+        return None, False
+
+    digest = _row_to_digest(row, lang)
+    if digest.valid_from + ttl > now:
+        record_cache_lookup("digest", "hit")
+        _remember_digest(ticker_id, lang, digest)
+        return digest, False
+    record_cache_lookup("digest", "stale")
+    return digest, True
+
+
+def _remember_digest(ticker_id: int, lang: str, digest: DigestResult) -> None:
+    """유효 시작 시각(refreshed_at) 기준 남은 TTL 동안 L1 캐시에 보관한다."""
+    expires_at = digest.valid_from + timedelta(hours=get_cache_config().summary_ttl_hours)
+    ttl_sec = (expires_at - datetime.now(tz=timezone.utc)).total_seconds()
+    digest_cache.set((ticker_id, lang), digest, ttl_sec)
+
+
+@timed("digest_cache")
+async def reuse_digest(
+    db: Repository,
+    ticker_id: int,
+    fingerprint: str,
+    langs: list[str],
+) -> Optional[dict[str, DigestResult]]:
+    """
+    같은 fingerprint로 digest_reuse_max_hours 이내에 생성된 요약이 있으면
+    refreshed_at을 현재 시각으로 연장하고 {lang: DigestResult}를 반환한다. 없으면 None.
+    langs의 요약 컬럼이 모두 채워진 행만 재사용한다.
+    """
+    cutoff = datetime.now(tz=timezone.utc) - timedelta(hours=get_cache_config().digest_reuse_max_hours)
+    row = await db.find_summary(ticker_id, fingerprint, cutoff, [_summary_column(lang) for lang in langs])
+    if row is None:
+        return None
+
+    refreshed_at = datetime.now(tz=timezone.utc)
+    row["refreshed_at"] = refreshed_at.isoformat()
+    await db.refresh_summary(row["id"], refreshed_at)
+
+    digests = {lang: _row_to_digest(row, lang) for lang in langs}
+    digest_cache.invalidate_where(lambda key: key[0] == ticker_id)
+    for lang, digest in digests.items():
+        _remember_digest(ticker_id, lang, digest)
+    logger.info("요약 재사용(기사 변동 없음): ticker_id=%d, summary_id=%d", ticker_id, row["id"])
+    return digests
+
+
+@timed("cache_save")
 async def save_digest_cache(
-    db: AsyncClient,
+    db: Repository,
     ticker_id: int,
-    digest_ko: DigestResult,
+    digest_ko: Optional[DigestResult],
     digest_en: Optional[DigestResult] = None,
+    fingerprint: str = "",
 ) -> None:
     """
     종합 요약 결과를 ticker_summaries에 저장한다.
     한/영 요약을 단일 행에 저장하여 중복 캐시를 방지한다.
+    한 언어만 생성한 경우 다른 언어 컬럼은 NULL로 두며, 조회 시 해당 언어의 캐시 미스로 처리된다.
     """
+    base = digest_ko or digest_en
+    if base is None:
+        raise ValueError("저장할 요약이 없습니다.")
+
     def to_json(points: list[SummaryPoint]) -> str:
         return json.dumps([p.model_dump() for p in points], ensure_ascii=False)
 
     payload = {
         "ticker_id":       ticker_id,
-        "article_ids":     digest_ko.article_ids,
-        "summary_ko":      to_json(digest_ko.summary),
+        "article_ids":     base.article_ids,
+        "summary_ko":      to_json(digest_ko.summary) if digest_ko else None,
         "summary_en":      to_json(digest_en.summary) if digest_en else None,
-        "sentiment_score": float(digest_ko.sentiment_score),
-        "sentiment_label": digest_ko.sentiment_label,
-        "model_version":   digest_ko.model_version,
-        "article_count":   digest_ko.article_count,
-        "created_at":      digest_ko.created_at.isoformat(),
+        "sentiment_score": float(base.sentiment_score),
+        "sentiment_label": base.sentiment_label,
+        "model_version":   base.model_version,
+        "article_count":   base.article_count,
+        "created_at":      base.created_at.isoformat(),
+        "refreshed_at":    base.created_at.isoformat(),
+        "fingerprint":     fingerprint or None,
     }
 
-    await db.table("ticker_summaries").insert(payload).execute()
-    logger.info("캐시 저장: ticker_id=%d, count=%d", ticker_id, digest_ko.article_count)
+    await db.insert_summary(payload)
+
+    for digest in (digest_ko, digest_en):
+        if digest is not None:
+            digest.fingerprint = fingerprint
+    digest_cache.invalidate_where(lambda key: key[0] == ticker_id)
+    if digest_ko:
+        _remember_digest(ticker_id, "ko", digest_ko)
+    if digest_en:
+        _remember_digest(ticker_id, "en", digest_en)
+    logger.info(
+        "캐시 저장: ticker_id=%d, count=%d, ko=%s, en=%s",
+        ticker_id, base.article_count, digest_ko is not None, digest_en is not None,
+    )
 
 
-async def invalidate_cache(db: AsyncClient, ticker_id: int) -> int:
+async def invalidate_cache(db: Repository, ticker_id: int) -> int:
     """특정 티커의 캐시를 전부 삭제한다. 수동 갱신/테스트용."""
-    res = (
-        await db.table("ticker_summaries")
-        .delete()
-        .eq("ticker_id", ticker_id)
-        .execute()
-    )
-    deleted = len(res.data) if res.data else 0
+    deleted = await db.delete_summaries(ticker_id)
+    digest_cache.invalidate_where(lambda key: key[0] == ticker_id)
     logger.info("캐시 무효화: ticker_id=%d, deleted=%d", ticker_id, deleted)
     return deleted
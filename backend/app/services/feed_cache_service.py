@@ -0,0 +1,175 @@
+"""
+feed_cache_service.py
+─────────────────────
+RSS 피드 공유 캐시.
+피드 URL마다 파싱 결과 1부를 보관하여 refresh_sec 동안 모든 호출자(Market Pulse, 티커별 RSS 폴백)에게 재사용한다.
+갱신 시에는 ETag / Last-Modified로 조건부 요청을 보내며, 304 응답이면 다시 파싱하지 않는다.
+동시에 만료된 피드를 여러 요청이 찾으면 single-flight로 다운로드 1회만 수행한다.
+파싱할 때마다 티커 → 항목 번호 역색인을 함께 만들어, 티커별 필터링을 dict 조회로 처리한다.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional
+
+import feedparser
+
+from app.config import get_ingestion_config
+from app.services.http_client_service import fetch
+from app.services.ingestion_service import run_blocking
+from app.services.single_flight_service import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+# ── 티커 역색인 ───────────────────────────────────────────────────────────────
+# 대소문자를 구분해 단어 경계 단위로 티커 후보를 뽑는다. ("Ford"나 "on"은 F / ON으로 잡히지 않는다)
+_SYMBOL = r"[A-Z][A-Z0-9]{0,5}(?:[.\-][A-Z]{1,2})?"
+# 명시적 표기: $AAPL, (AAPL), NASDAQ: AAPL
+_EXPLICIT_RE = re.compile(
+    rf"\$({_SYMBOL})(?![A-Za-z0-9])"
+    rf"|\(({_SYMBOL})\)"
+    rf"|\b(?:NYSE|NASDAQ|Nasdaq|AMEX|NYSEARCA|NYSEAMERICAN)\s*:\s*({_SYMBOL})(?![A-Za-z0-9])"
+)
+# 제목 안의 대문자 단어
+_BARE_RE = re.compile(rf"(?<![A-Za-z0-9$.\-])({_SYMBOL})(?![A-Za-z0-9])")
+# 헤드라인에 흔한 약어. 한 글자 티커와 함께 명시적 표기일 때만 색인한다.
+_AMBIGUOUS = {
+    "AI", "AM", "PM", "ET", "US", "USA", "UK", "EU", "CEO", "CFO", "CTO", "IPO", "ETF", "GDP",
+    "CPI", "PPI", "PCE", "FED", "FOMC", "SEC", "FDA", "FTC", "DOJ", "IRS", "OPEC", "EV", "ESG",
+    "IT", "TV", "OK", "NEW", "ALL",
+}
+
+
+def _entry_symbols(entry) -> set[str]:
+    """피드 항목 1건에서 티커 후보를 추출한다. 제목은 대문자 단어 + 명시적 표기, 요약은 명시적 표기만 본다."""
+    title = entry.get("title", "")
+    summary = entry.get("summary", "")
+    symbols = {m for groups in _EXPLICIT_RE.findall(f"{title}\n{summary}") for m in groups if m}
+    symbols.update(
+        token for token in _BARE_RE.findall(title)
+        if len(token) > 1 and token not in _AMBIGUOUS
+    )
+    return symbols
+
+
+def build_symbol_index(entries: list) -> dict[str, list[int]]:
+    """{티커: 해당 티커가 언급된 항목 번호(피드 순서)} 역색인을 만든다."""
+    index: dict[str, list[int]] = {}
+    for i, entry in enumerate(entries):
+        for symbol in _entry_symbols(entry):
+            index.setdefault(symbol, []).append(i)
+    return index
+
+
+# ── 피드 캐시 ─────────────────────────────────────────────────────────────────
+
+@dataclass
+class _FeedEntry:
+    feed: Any                     # feedparser.FeedParserDict
+    symbol_index: dict[str, list[int]]
+    etag: Optional[str]
+    last_modified: Optional[str]
+    checked_at: float             # 마지막으로 원본을 확인한 시각 (monotonic)
+
+
+_feeds: dict[str, _FeedEntry] = {}
+_feed_flights = SingleFlight("feeds")
+
+# 조건부 요청 결과 카운터 (/health 노출)
+_stats = {"hits": 0, "not_modified": 0, "fetched": 0, "errors": 0}
+
+
+def _conditional_headers(entry: Optional[_FeedEntry]) -> dict[str, str]:
+    headers: dict[str, str] = {}
+    if entry is None:
+        return headers
+    if entry.etag:
+        headers["If-None-Match"] = entry.etag
+    if entry.last_modified:
+        headers["If-Modified-Since"] = entry.last_modified
+    return headers
+
+
+def _parse_and_index(content: bytes, headers: dict[str, str]) -> tuple[Any, dict[str, list[int]]]:
+    feed = feedparser.parse(content, response_headers=headers)
+    return feed, build_symbol_index(feed.entries)
+
+
+async def _refresh(url: str) -> _FeedEntry:
+    """원본에 조건부 요청을 보내 캐시를 갱신한다."""
+    entry = _feeds.get(url)
+    response = await fetch(url, headers=_conditional_headers(entry))
+
+    if response.status_code == 304 and entry is not None:
+        entry.checked_at = time.monotonic()
+        _stats["not_modified"] += 1
+        return entry
+
+    response.raise_for_status()
+    feed, symbol_index = await run_blocking(
+        _parse_and_index, response.content, dict(response.headers)
+    )
+    entry = _feeds[url] = _FeedEntry(
+        feed=feed,
+        symbol_index=symbol_index,
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified"),
+        checked_at=time.monotonic(),
+    )
+    _stats["fetched"] += 1
+    logger.debug("RSS 피드 갱신: url=%s, entries=%d, symbols=%d", url, len(feed.entries), len(symbol_index))
+    return entry
+
+
+async def _refresh_or_stale(url: str) -> _FeedEntry:
+    """갱신에 실패하면 이전 파싱 결과가 있을 때 그것을 반환한다."""
+    config = get_ingestion_config()
+    try:
+        return await asyncio.wait_for(_refresh(url), timeout=config.feed_timeout_sec)
+    except Exception as e:
+        _stats["errors"] += 1
+        entry = _feeds.get(url)
+        if entry is None:
+            raise
+        logger.warning("RSS 피드 갱신 실패, 이전 결과 사용: url=%s, error=%s", url, e)
+        # 실패한 원본을 매 요청마다 다시 두드리지 않도록 다음 주기까지 기존 결과를 유지한다.
+        entry.checked_at = time.monotonic()
+        return entry
+
+
+async def _get_entry(url: str) -> _FeedEntry:
+    """
+    마지막 확인 후 feed_refresh_sec가 지나지 않았으면 캐시를 그대로 쓰고,
+    지났으면 조건부 요청으로 갱신한다. (동시 갱신은 1회로 병합)
+    """
+    entry = _feeds.get(url)
+    if entry is not None and time.monotonic() - entry.checked_at < get_ingestion_config().feed_refresh_sec:
+        _stats["hits"] += 1
+        return entry
+    return await _feed_flights.do(url, lambda: _refresh_or_stale(url))
+
+
+async def get_feed(url: str) -> Any:
+    """피드 파싱 결과를 반환한다."""
+    return (await _get_entry(url)).feed
+
+
+async def get_feed_entries_for_symbols(url: str, symbols: Iterable[str]) -> dict[str, list]:
+    """
+    여러 티커에 대해 해당 티커가 언급된 피드 항목을 한 번에 찾는다.
+    반환값: {티커(대문자): [피드 항목, ...]} (피드 순서, 언급이 없으면 빈 목록)
+    """
+    entry = await _get_entry(url)
+    entries = entry.feed.entries
+    return {
+        symbol: [entries[i] for i in entry.symbol_index.get(symbol, ())]
+        for symbol in dict.fromkeys(s.upper() for s in symbols)
+    }
+
+
+def get_feed_cache_stats() -> dict:
+    return {"feeds": len(_feeds), **_stats}
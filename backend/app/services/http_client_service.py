@@ -0,0 +1,114 @@
+"""
+http_client_service.py
+──────────────────────
+뉴스 수집용 공유 비동기 HTTP 클라이언트.
+RSS 피드와 기사 HTML을 워커당 하나의 httpx.AsyncClient(keep-alive 커넥션 풀, 가능하면 HTTP/2)로 가져온다.
+- 연결/읽기 타임아웃을 분리해 적용한다.
+- 호스트별 동시 요청 수를 제한한다.
+- 네트워크 오류와 429/5xx 응답은 지수 백오프로 재시도한다.
+응답 본문의 파싱(feedparser, newspaper)은 호출 측이 수집 스레드 풀에서 수행한다.
+"""
+
+import asyncio
+import importlib.util
+import logging
+import random
+from typing import Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.config import get_http_client_config
+
+logger = logging.getLogger(__name__)
+
+# 재시도 대상 HTTP 상태 코드
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Retry-After 헤더를 따르되 이 값(초)보다 오래 기다리지 않는다.
+_MAX_RETRY_AFTER_SEC = 5.0
+
+_client: Optional[httpx.AsyncClient] = None
+_host_semaphores: dict[str, asyncio.Semaphore] = {}
+
+
+def _create_client() -> httpx.AsyncClient:
+    config = get_http_client_config()
+    http2 = config.http2 and importlib.util.find_spec("h2") is not None
+    if config.http2 and not http2:
+        logger.warning("h2 패키지가 없어 HTTP/1.1로 수집합니다.")
+    logger.info("수집용 HTTP 클라이언트 생성: http2=%s, max_connections=%d", http2, config.max_connections)
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive_connections,
+            keepalive_expiry=config.keepalive_expiry_sec,
+        ),
+        timeout=httpx.Timeout(
+            config.read_timeout_sec,
+            connect=config.connect_timeout_sec,
+            pool=config.connect_timeout_sec,
+        ),
+        headers={"User-Agent": config.user_agent},
+        follow_redirects=True,
+    )
+
+
+def init_http_client() -> httpx.AsyncClient:
+    """공유 수집용 클라이언트를 생성한다. 이미 있으면 그대로 반환한다."""
+    global _client
+    if _client is None:
+        _client = _create_client()
+    return _client
+
+
+async def close_http_client() -> None:
+    """공유 클라이언트의 커넥션 풀을 닫는다."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+        _host_semaphores.clear()
+        logger.info("수집용 HTTP 클라이언트 종료")
+
+
+def _host_semaphore(url: str) -> asyncio.Semaphore:
+    host = urlsplit(url).hostname or ""
+    semaphore = _host_semaphores.get(host)
+    if semaphore is None:
+        semaphore = _host_semaphores[host] = asyncio.Semaphore(get_http_client_config().per_host)
+    return semaphore
+
+
+def _retry_delay(attempt: int, response: Optional[httpx.Response]) -> float:
+    if response is not None:
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return min(float(retry_after), _MAX_RETRY_AFTER_SEC)
+    base = get_http_client_config().backoff_base_sec * (2 ** attempt)
+    return base + random.uniform(0, base)
+
+
+async def fetch(url: str, headers: Optional[dict[str, str]] = None) -> httpx.Response:
+    """
+    GET 요청을 보내 응답을 반환한다.
+    네트워크 오류와 재시도 대상 상태 코드는 retries회까지 재시도하며,
+    마지막 시도의 응답(상태 코드 무관)을 반환하거나 마지막 예외를 그대로 발생시킨다.
+    """
+    client = init_http_client()
+    retries = get_http_client_config().retries
+    attempt = 0
+    while True:
+        response: Optional[httpx.Response] = None
+        try:
+            async with _host_semaphore(url):
+                response = await client.get(url, headers=headers)
+            if response.status_code not in _RETRY_STATUSES or attempt >= retries:
+                return response
+            logger.debug("HTTP 재시도: url=%s, status=%d, attempt=%d", url, response.status_code, attempt + 1)
+        except httpx.TransportError as e:
+            if attempt >= retries:
+                raise
+            logger.debug("HTTP 재시도: url=%s, error=%s, attempt=%d", url, e, attempt + 1)
+        await asyncio.sleep(_retry_delay(attempt, response))
+        attempt += 1
@@ -0,0 +1,52 @@
+"""
+ingestion_service.py
+────────────────────
+외부 수집 I/O 실행기.
+yfinance / feedparser / newspaper 는 동기(블로킹) 라이브러리이므로
+이벤트 루프를 막지 않도록 크기가 제한된 전용 스레드 풀에서 실행한다.
+"""
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+from app.config import get_ingestion_config
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """수집 전용 스레드 풀을 반환한다. 최초 호출 시 생성한다."""
+    global _executor
+    if _executor is None:
+        max_workers = get_ingestion_config().max_workers
+        _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ingestion")
+        logger.info("수집 스레드 풀 생성: max_workers=%d", max_workers)
+    return _executor
+
+
+def shutdown_executor() -> None:
+    """앱 종료 시 스레드 풀을 정리한다. 진행 중인 작업은 기다리지 않는다."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+        logger.info("수집 스레드 풀 종료")
+
+
+async def run_blocking(func: Callable[..., T], *args, timeout: Optional[float] = None) -> T:
+    """
+    블로킹 함수를 수집 스레드 풀에서 실행하고 결과를 기다린다.
+    timeout 초과 시 asyncio.TimeoutError를 발생시킨다.
+    (스레드 자체는 중단할 수 없으므로 백그라운드에서 끝까지 실행된 뒤 결과가 버려진다.)
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(get_executor(), func, *args)
+    if timeout is None:
+        return await future
+    return await asyncio.wait_for(future, timeout=timeout)
@@ -0,0 +1,537 @@
+"""
+llm_router_service.py
+─────────────────────
+LLM provider 라우터.
+- 모델(provider:model)별 최근 응답 지연을 기록해 백분위수를 계산한다.
+- 1차 모델이 p95를 넘기도록 응답하지 않으면 model_config.yaml의 fallback 모델로 헤지 요청을 보내고,
+  먼저 성공한 응답을 사용한다.
+- 모델별 서킷 브레이커: 윈도우 내 오류가 임계치를 넘으면 cooldown 동안 해당 모델을 건너뛴다.
+- 어느 모델이 응답했는지(wins), 헤지/페일오버 횟수를 집계한다.
+- provider(와 SDK 클라이언트)는 (provider, model)당 1개를 만들어 재사용하고,
+  모든 호출은 llm_scheduler_service의 모델별 슬롯을 얻은 뒤 실행한다.
+provider 생성은 provider_factory로 주입하므로 로컬 가짜 provider로 테스트할 수 있다.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import AsyncIterator, Callable, Optional
+
+import anthropic
+import google.generativeai as genai
+
+from app.config import FeatureModelConfig, get_llm_router_config, get_settings
+from app.services.llm_scheduler_service import LLMScheduler, current_priority, is_rate_limited, llm_scheduler
+from app.services.metrics_service import record_llm_request, record_llm_tokens, stage_timer
+from app.services.prompt_budget_service import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+
+# ── provider ──────────────────────────────────────────────────────────────────
+
+class LLMProvider:
+    """provider 공통 인터페이스. 가짜 provider도 이 두 메서드만 구현하면 된다."""
+
+    def __init__(self, config: FeatureModelConfig, api_key: Optional[str] = None):
+        self.config = config
+        self.api_key = api_key
+
+    @property
+    def key(self) -> str:
+        return f"{self.config.provider}:{self.config.model}"
+
+    def _report_usage(self, usage, prompt_attr: str, completion_attr: str) -> None:
+        """SDK 응답의 토큰 사용량을 /metrics 카운터에 더한다. (사용량이 없으면 무시)"""
+        if usage is None:
+            return
+        record_llm_tokens(
+            self.config.provider, self.config.model,
+            getattr(usage, prompt_attr, 0) or 0, getattr(usage, completion_attr, 0) or 0,
+        )
+
+    async def generate(self, prompt: str, max_tokens: Optional[int] = None) -> str:
+        raise NotImplementedError
+
+    def stream(self, prompt: str, max_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        raise NotImplementedError
+
+
+class GeminiProvider(LLMProvider):
+    # genai.configure는 프로세스 전역 설정이므로 키가 바뀔 때만 다시 호출한다.
+    _configured_key: Optional[str] = None
+
+    def __init__(self, config: FeatureModelConfig, api_key: Optional[str] = None):
+        super().__init__(config, api_key)
+        if api_key and GeminiProvider._configured_key != api_key:
+            genai.configure(api_key=api_key)
+            GeminiProvider._configured_key = api_key
+        self._model = genai.GenerativeModel(config.model)
+
+    def _generation_config(self, max_tokens: Optional[int]) -> dict:
+        return {"max_output_tokens": max_tokens or self.config.max_tokens}
+
+    async def generate(self, prompt: str, max_tokens: Optional[int] = None) -> str:
+        response = await self._model.generate_content_async(
+            prompt, generation_config=self._generation_config(max_tokens)
+        )
+        self._report_usage(
+            getattr(response, "usage_metadata", None), "prompt_token_count", "candidates_token_count"
+        )
+        return response.text
+
+    async def stream(self, prompt: str, max_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        response = await self._model.generate_content_async(
+            prompt, generation_config=self._generation_config(max_tokens), stream=True
+        )
+        async for chunk in response:
+            if chunk.text:
+                yield chunk.text
+        self._report_usage(
+            getattr(response, "usage_metadata", None), "prompt_token_count", "candidates_token_count"
+        )
+
+
+class AnthropicProvider(LLMProvider):
+    def __init__(self, config: FeatureModelConfig, api_key: Optional[str] = None):
+        super().__init__(config, api_key)
+        self._client = anthropic.AsyncAnthropic(api_key=api_key)
+
+    async def generate(self, prompt: str, max_tokens: Optional[int] = None) -> str:
+        message = await self._client.messages.create(
+            model=self.config.model,
+            max_tokens=max_tokens or self.config.max_tokens,
+            messages=[{"role": "user", "content": prompt}],
+        )
+        self._report_usage(message.usage, "input_tokens", "output_tokens")
+        return message.content[0].text
+
+    async def stream(self, prompt: str, max_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        async with self._client.messages.stream(
+            model=self.config.model,
+            max_tokens=max_tokens or self.config.max_tokens,
+            messages=[{"role": "user", "content": prompt}],
+        ) as stream:
+            async for text in stream.text_stream:
+                yield text
+            final = await stream.get_final_message()
+            self._report_usage(final.usage, "input_tokens", "output_tokens")
+
+
+ProviderFactory = Callable[[FeatureModelConfig, Optional[str]], LLMProvider]
+
+
+def default_provider_factory(config: FeatureModelConfig, api_key: Optional[str]) -> LLMProvider:
+    if config.provider == "gemini":
+        return GeminiProvider(config, api_key)
+    return AnthropicProvider(config, api_key)
+
+
+def _api_key_for(provider: str) -> Optional[str]:
+    settings = get_settings()
+    return (settings.gemini_api_key if provider == "gemini" else settings.anthropic_api_key) or None
+
+
+# ── 지연 / 서킷 브레이커 ──────────────────────────────────────────────────────
+
+class LatencyTracker:
+    """최근 window개 성공 응답 지연(초)의 백분위수를 계산한다."""
+
+    def __init__(self, window: int):
+        self._samples: deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+class CircuitBreaker:
+    """
+    window_sec 내 오류가 errors회 이상이면 cooldown_sec 동안 열린다(요청 차단).
+    cooldown이 지나면 다시 요청을 통과시키고(half-open), 성공하면 닫고 실패하면 즉시 다시 연다.
+    """
+
+    def __init__(self, errors: int, window_sec: float, cooldown_sec: float):
+        self.errors = errors
+        self.window_sec = window_sec
+        self.cooldown_sec = cooldown_sec
+        self._failures: deque[float] = deque()
+        self._open_until = 0.0
+
+    @property
+    def state(self) -> str:
+        if self._open_until == 0.0:
+            return "closed"
+        return "open" if time.monotonic() < self._open_until else "half_open"
+
+    def allow(self) -> bool:
+        return self.state != "open"
+
+    def record_success(self) -> None:
+        self._failures.clear()
+        self._open_until = 0.0
+
+    def record_failure(self) -> None:
+        now = time.monotonic()
+        if self._open_until:
+            self._open_until = now + self.cooldown_sec
+            return
+        self._failures.append(now)
+        while self._failures and now - self._failures[0] > self.window_sec:
+            self._failures.popleft()
+        if len(self._failures) >= self.errors:
+            self._open_until = now + self.cooldown_sec
+            self._failures.clear()
+            logger.warning("LLM 서킷 브레이커 열림: cooldown=%.0fs", self.cooldown_sec)
+
+
+# ── 라우터 ────────────────────────────────────────────────────────────────────
+
+class LLMRouter:
+    def __init__(
+        self,
+        provider_factory: ProviderFactory = default_provider_factory,
+        scheduler: Optional[LLMScheduler] = None,
+    ):
+        self.provider_factory = provider_factory
+        self.scheduler = scheduler or llm_scheduler
+        self._providers: dict[tuple[str, str, Optional[str]], LLMProvider] = {}
+        self._latency: dict[str, LatencyTracker] = {}
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self.wins: dict[str, int] = {}
+        self.failures: dict[str, int] = {}
+        self.hedges = 0
+        self.failovers = 0
+
+    def _tracker(self, key: str) -> LatencyTracker:
+        tracker = self._latency.get(key)
+        if tracker is None:
+            tracker = self._latency[key] = LatencyTracker(get_llm_router_config().latency_window)
+        return tracker
+
+    def _breaker(self, key: str) -> CircuitBreaker:
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            config = get_llm_router_config()
+            breaker = self._breakers[key] = CircuitBreaker(
+                config.breaker_errors, config.breaker_window_sec, config.breaker_cooldown_sec
+            )
+        return breaker
+
+    def _provider(self, config: FeatureModelConfig, api_key: Optional[str]) -> LLMProvider:
+        """(provider, model, api_key)당 provider 1개를 만들어 재사용한다."""
+        cache_key = (config.provider, config.model, api_key)
+        provider = self._providers.get(cache_key)
+        if provider is None:
+            provider = self._providers[cache_key] = self.provider_factory(config, api_key)
+        return provider
+
+    def _reserve_tokens(self, provider: LLMProvider, prompt: str, max_tokens: Optional[int]) -> int:
+        """TPM 예산에서 차감할 토큰 수. 프롬프트 추정치 + 최대 출력 토큰."""
+        return estimate_tokens(prompt, provider.config.provider) + (max_tokens or provider.config.max_tokens)
+
+    def hedge_delay(self, key: str) -> float:
+        """1차 모델의 p95 지연. 표본이 부족하면 설정 기본값을 쓴다."""
+        config = get_llm_router_config()
+        tracker = self._tracker(key)
+        if len(tracker) < config.hedge_min_samples:
+            return config.hedge_default_sec
+        return max(tracker.percentile(config.hedge_percentile), config.hedge_min_sec)
+
+    def _candidates(
+        self, primary: FeatureModelConfig, api_key: Optional[str],
+    ) -> list[LLMProvider]:
+        """서킷이 닫힌(또는 시험 가능한) 모델을 1차 → fallback 순으로 반환한다."""
+        providers = [self._provider(primary, api_key or _api_key_for(primary.provider))]
+        if primary.fallback is not None:
+            fallback = primary.fallback
+            providers.append(self._provider(fallback, _api_key_for(fallback.provider)))
+        allowed = [p for p in providers if self._breaker(p.key).allow()]
+        if not allowed:
+            # 모두 열려 있으면 1차 모델로 시도한다. (전면 차단보다 느린 실패가 낫다)
+            return providers[:1]
+        if allowed[0] is not providers[0]:
+            self.failovers += 1
+            logger.info("LLM 페일오버: %s 서킷 열림 → %s", providers[0].key, allowed[0].key)
+        return allowed
+
+    async def _timed(
+        self, provider: LLMProvider, prompt: str, max_tokens: Optional[int],
+        started_event: Optional[asyncio.Event] = None,
+    ) -> str:
+        """
+        스케줄러 슬롯을 얻은 뒤 실행하고, 실행 시간(대기 제외)을 기록한다.
+        started_event가 주어지면 슬롯을 얻어 실행을 시작할 때 set한다.
+        429(할당량 초과)면 모델 배정이 멈춘 뒤 같은 우선순위로 한 번 다시 대기해 재시도한다.
+        """
+        slot = self.scheduler.model(provider.key)
+        tokens, priority = self._reserve_tokens(provider, prompt, max_tokens), current_priority()
+        retried = False
+        while True:
+            with stage_timer("llm_queue"):
+                await slot.acquire(tokens, priority)
+            if started_event is not None:
+                started_event.set()
+            try:
+                started = time.monotonic()
+                try:
+                    with stage_timer("llm"):
+                        text = await provider.generate(prompt, max_tokens)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    if not retried and self._requeue_rate_limited(provider.key, e, time.monotonic() - started):
+                        retried = True
+                        continue
+                    self._record_failure(provider.key, e, time.monotonic() - started)
+                    raise
+                self._record_success(provider.key, time.monotonic() - started)
+                return text
+            finally:
+                slot.release()
+
+    def _record_success(self, key: str, seconds: float) -> None:
+        self._tracker(key).record(seconds)
+        self._breaker(key).record_success()
+        record_llm_request(*key.split(":", 1), seconds, "ok")
+
+    def _record_failure(self, key: str, exc: BaseException, seconds: float) -> None:
+        record_llm_request(*key.split(":", 1), seconds, "error")
+        self.failures[key] = self.failures.get(key, 0) + 1
+        self._breaker(key).record_failure()
+        self.scheduler.on_error(key, exc)
+
+    def _requeue_rate_limited(self, key: str, exc: BaseException, seconds: float) -> bool:
+        """
+        429이면 모델 배정을 멈추고 True를 반환한다. 호출 측은 슬롯을 반납하고 다시 대기해 재시도한다.
+        (할당량 초과는 스케줄러가 흡수할 대상이므로 재시도까지 실패할 때만 서킷에 반영한다)
+        """
+        if not is_rate_limited(exc):
+            return False
+        record_llm_request(*key.split(":", 1), seconds, "rate_limited")
+        self.scheduler.on_error(key, exc)
+        logger.warning("LLM 할당량 초과, 재대기 후 재시도: %s", key)
+        return True
+
+    def _record_win(self, provider: LLMProvider) -> None:
+        self.wins[provider.key] = self.wins.get(provider.key, 0) + 1
+
+    async def generate(
+        self,
+        primary: FeatureModelConfig,
+        prompt: str,
+        api_key: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+    ) -> tuple[str, str]:
+        """
+        프롬프트를 실행하고 (응답 텍스트, 응답한 모델명)을 반환한다.
+        1차 모델이 슬롯을 얻은 뒤 hedge_delay 안에 끝나지 않으면 fallback에 같은 요청을 보내 먼저 성공한 쪽을 쓰고,
+        한쪽이 실패하면 다른 쪽 결과를 기다린다. 전체 request_timeout_sec 초과 시 TimeoutError.
+        max_tokens를 주면 모델 설정의 최대 출력 토큰 대신 사용한다. (여러 티커 묶음 요약 등)
+        """
+        config = get_llm_router_config()
+        candidates = self._candidates(primary, api_key)
+        return await asyncio.wait_for(
+            self._race(candidates, prompt, max_tokens, config.hedge_enabled),
+            timeout=config.request_timeout_sec,
+        )
+
+    async def _race(
+        self, candidates: list[LLMProvider], prompt: str, max_tokens: Optional[int], hedge: bool,
+    ) -> tuple[str, str]:
+        first = candidates[0]
+        first_started = asyncio.Event()
+        tasks: dict[asyncio.Task, LLMProvider] = {
+            asyncio.ensure_future(self._timed(first, prompt, max_tokens, first_started)): first
+        }
+        standby = candidates[1:]
+        errors: list[BaseException] = []
+        try:
+            delay: Optional[float] = self.hedge_delay(first.key) if hedge and standby else None
+            while tasks:
+                if delay is not None and not first_started.is_set():
+                    # 헤지 대기는 1차가 스케줄러 슬롯을 얻어 실행을 시작한 뒤부터 센다.
+                    # (p95는 대기 시간을 뺀 실행 시간이므로 대기열 지연으로 헤지하지 않는다)
+                    started = asyncio.ensure_future(first_started.wait())
+                    try:
+                        done, _ = await asyncio.wait({*tasks, started}, return_when=asyncio.FIRST_COMPLETED)
+                    finally:
+                        started.cancel()
+                    done.discard(started)
+                else:
+                    done, _ = await asyncio.wait(
+                        tasks, timeout=delay, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    if not done:
+                        # 1차가 p95를 넘김 → 헤지 요청
+                        provider = standby.pop(0)
+                        self.hedges += 1
+                        logger.info("LLM 헤지 요청: %s 지연 > %.2fs → %s", first.key, delay, provider.key)
+                        tasks[asyncio.ensure_future(self._timed(provider, prompt, max_tokens))] = provider
+                        delay = None
+                        continue
+                for task in done:
+                    provider = tasks.pop(task)
+                    if task.exception() is None:
+                        self._record_win(provider)
+                        return task.result(), provider.config.model
+                    errors.append(task.exception())
+                    logger.warning("LLM 요청 실패: %s, error=%s", provider.key, task.exception())
+                # 실행 중인 요청이 모두 실패했고 대기 중인 fallback이 있으면 바로 보낸다.
+                if not tasks and standby:
+                    provider = standby.pop(0)
+                    self.failovers += 1
+                    tasks[asyncio.ensure_future(self._timed(provider, prompt, max_tokens))] = provider
+                    delay = None
+            raise errors[-1]
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def open_stream(
+        self, primary: FeatureModelConfig, prompt: str, api_key: Optional[str] = None,
+    ) -> tuple[str, AsyncIterator[str]]:
+        """
+        스트리밍 응답을 연다. 슬롯 대기 또는 첫 조각 수신 전에 실패/타임아웃이면 다음 후보로 넘어간다.
+        (이미 사용자에게 내보낸 조각은 되돌릴 수 없으므로 스트리밍은 헤지하지 않는다.)
+        반환값: (응답한 모델명, 첫 조각부터 시작하는 텍스트 이터레이터)
+        이터레이터는 모델 슬롯을 쥐고 있으므로 호출 측은 contextlib.aclosing으로 감싸 소비한다.
+        """
+        config = get_llm_router_config()
+        error: Optional[BaseException] = None
+        for provider in self._candidates(primary, api_key):
+            slot = self.scheduler.model(provider.key)
+            retried = False
+            while True:
+                acquired = False
+                started = time.monotonic()
+                try:
+                    # 슬롯은 스트림이 끝나거나 닫힐 때(_StreamRelay) 반납한다.
+                    with stage_timer("llm_queue"):
+                        await asyncio.wait_for(
+                            slot.acquire(self._reserve_tokens(provider, prompt, None), current_priority()),
+                            timeout=config.request_timeout_sec,
+                        )
+                    acquired = True
+                    started = time.monotonic()
+                    iterator = provider.stream(prompt).__aiter__()
+                    with stage_timer("llm_first_chunk"):
+                        first = await asyncio.wait_for(iterator.__anext__(), timeout=config.request_timeout_sec)
+                except StopAsyncIteration:
+                    first = ""
+                except Exception as e:
+                    if acquired:
+                        slot.release()
+                        # 첫 조각 전 429면 배정이 재개된 뒤 같은 모델로 한 번 더 시도한다.
+                        if not retried and self._requeue_rate_limited(provider.key, e, time.monotonic() - started):
+                            retried = True
+                            continue
+                        self._record_failure(provider.key, e, time.monotonic() - started)
+                        logger.warning("LLM 스트리밍 시작 실패: %s, error=%s", provider.key, e)
+                    else:
+                        # 슬롯 대기 타임아웃은 모델 오류가 아니므로 서킷에 반영하지 않고 다음 후보로 넘어간다.
+                        logger.warning("LLM 슬롯 대기 초과: %s, error=%r", provider.key, e)
+                    error = e
+                    break
+                except BaseException:
+                    if acquired:
+                        slot.release()
+                    raise
+                self._record_win(provider)
+                deadline = started + config.request_timeout_sec
+                return provider.config.model, _StreamRelay(self, provider, iterator, first, started, deadline)
+            self.failovers += 1
+        raise error
+
+    def stats(self) -> dict:
+        config = get_llm_router_config()
+        return {
+            "scheduler": self.scheduler.stats(),
+            "wins": dict(self.wins),
+            "failures": dict(self.failures),
+            "hedges": self.hedges,
+            "failovers": self.failovers,
+            "models": {
+                key: {
+                    "samples": len(tracker),
+                    "p50_sec": tracker.percentile(0.5),
+                    "p95_sec": tracker.percentile(config.hedge_percentile),
+                    "breaker": self._breaker(key).state,
+                }
+                for key, tracker in self._latency.items()
+            },
+        }
+
+
+# ── 스트림 중계 ───────────────────────────────────────────────────────────────
+
+class _StreamRelay:
+    """
+    open_stream이 반환하는 텍스트 이터레이터. 모델 슬롯을 쥐고 있다가 스트림이 끝나거나 aclose()되면 반납한다.
+    시작 전인 async generator는 aclose()해도 finally가 돌지 않아 슬롯이 새므로 클래스로 구현한다.
+    전체 스트림은 슬롯을 얻은 시점부터 request_timeout_sec 안에 끝나야 한다.
+    """
+
+    def __init__(
+        self, router: "LLMRouter", provider: LLMProvider, iterator: AsyncIterator[str],
+        first: str, started: float, deadline: float,
+    ):
+        self._router = router
+        self._provider = provider
+        self._iterator = iterator
+        self._first: Optional[str] = first
+        self._started = started
+        self._deadline = deadline
+        self._closed = False
+
+    def __aiter__(self) -> "_StreamRelay":
+        return self
+
+    async def __anext__(self) -> str:
+        if self._closed:
+            raise StopAsyncIteration
+        first, self._first = self._first, None
+        if first:
+            return first
+        key = self._provider.key
+        try:
+            return await asyncio.wait_for(
+                self._iterator.__anext__(), timeout=max(0.0, self._deadline - time.monotonic())
+            )
+        except StopAsyncIteration:
+            self._router._record_success(key, time.monotonic() - self._started)
+            await self.aclose()
+            raise
+        except asyncio.CancelledError:
+            await self.aclose()
+            raise
+        except Exception as e:
+            self._router._record_failure(key, e, time.monotonic() - self._started)
+            logger.warning("LLM 스트리밍 중단: %s, error=%r", key, e)
+            await self.aclose()
+            raise
+
+    async def aclose(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._router.scheduler.model(self._provider.key).release()
+        aclose = getattr(self._iterator, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+llm_router = LLMRouter()
+
+
+def get_llm_router_stats() -> dict:
+    return llm_router.stats()
@@ -0,0 +1,192 @@
+"""
+llm_scheduler_service.py
+────────────────────────
+전역 LLM 요청 스케줄러.
+모델(provider:model)마다 동시 실행 수, 분당 요청 수(RPM), 분당 토큰 수(TPM) 예산을 두고,
+대기 요청은 우선순위 큐에서 꺼내 실행한다.
+- 우선순위: 사용자 요청(INTERACTIVE) → 일괄 조회(BATCH) → 사전 갱신(PREWARM)
+- 호출 측 우선순위는 contextvar(llm_priority)로 전달되어 서비스 함수 시그니처를 바꾸지 않는다.
+- provider가 429(할당량 초과)를 돌려주면 해당 모델의 배정을 rate_limit_backoff_sec 동안 멈춘다.
+  라우터는 그 요청을 같은 우선순위로 다시 대기열에 넣어 한 번 재시도한다.
+"""
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import logging
+import time
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import Iterator, Optional
+
+from app.config import get_llm_scheduler_config
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0
+    BATCH = 1
+    PREWARM = 2
+
+
+_priority: contextvars.ContextVar[Priority] = contextvars.ContextVar(
+    "llm_priority", default=Priority.INTERACTIVE
+)
+
+
+@contextmanager
+def llm_priority(priority: Priority) -> Iterator[None]:
+    """블록 안에서 시작된 LLM 호출(및 거기서 만든 Task)의 우선순위를 지정한다."""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> Priority:
+    return _priority.get()
+
+
+def is_rate_limited(exc: BaseException) -> bool:
+    """provider 예외가 할당량 초과(429)인지 판별한다. (anthropic.RateLimitError, google ResourceExhausted)"""
+    if getattr(exc, "status_code", None) == 429 or getattr(exc, "code", None) == 429:
+        return True
+    return type(exc).__name__ in ("RateLimitError", "ResourceExhausted", "TooManyRequests")
+
+
+class _TokenBucket:
+    """분당 capacity만큼 연속적으로 채워지는 버킷. capacity가 0 이하면 제한하지 않는다."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.unlimited = per_minute <= 0
+        self._tokens = per_minute
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.capacity / 60.0)
+        self._updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """amount를 꺼낼 수 있을 때까지 남은 초. (버킷 용량보다 큰 요청은 가득 찼을 때 허용)"""
+        if self.unlimited:
+            return 0.0
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self._tokens >= amount:
+            return 0.0
+        return (amount - self._tokens) * 60.0 / self.capacity
+
+    def take(self, amount: float) -> None:
+        if not self.unlimited:
+            self._tokens -= min(amount, self.capacity)
+
+
+class ModelScheduler:
+    """모델 1개의 동시 실행 / RPM / TPM 제한과 우선순위 대기열."""
+
+    def __init__(self, key: str, concurrency: int, rpm: float, tpm: float):
+        self.key = key
+        self.concurrency = concurrency
+        self._requests = _TokenBucket(rpm)
+        self._tokens = _TokenBucket(tpm)
+        self._waiters: list[tuple[int, int, float, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._running = 0
+        self._paused_until = 0.0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self.dispatched = 0
+        self.rate_limited = 0
+
+    async def acquire(self, tokens: float, priority: Priority) -> None:
+        """실행 슬롯을 얻을 때까지 기다린다. 반드시 release()와 짝을 이뤄야 한다."""
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (int(priority), next(self._seq), tokens, future))
+        self._pump()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # 슬롯을 받은 직후 취소된 경우 반납한다.
+                self.release()
+            raise
+
+    def release(self) -> None:
+        self._running -= 1
+        self._pump()
+
+    def pause(self, seconds: float) -> None:
+        """429 응답 후 seconds 동안 새 요청 배정을 멈춘다."""
+        self.rate_limited += 1
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        logger.warning("LLM 할당량 초과, 배정 중지: model=%s, %.1fs", self.key, seconds)
+
+    def _pump(self) -> None:
+        """대기열 맨 앞 요청부터 예산이 허락하는 만큼 배정한다. (우선순위 역전 방지를 위해 앞이 막히면 멈춘다)"""
+        while self._waiters:
+            _, _, tokens, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if self._running >= self.concurrency:
+                return
+            now = time.monotonic()
+            wait = max(
+                self._paused_until - now,
+                self._requests.wait_time(1, now),
+                self._tokens.wait_time(tokens, now),
+            )
+            if wait > 0:
+                self._schedule_pump(wait)
+                return
+            heapq.heappop(self._waiters)
+            self._requests.take(1)
+            self._tokens.take(tokens)
+            self._running += 1
+            self.dispatched += 1
+            future.set_result(None)
+
+    def _schedule_pump(self, delay: float) -> None:
+        if self._timer is not None and not self._timer.cancelled():
+            self._timer.cancel()
+        self._timer = asyncio.get_running_loop().call_later(delay, self._pump)
+
+    def stats(self) -> dict:
+        return {
+            "running": self._running,
+            "queued": sum(1 for w in self._waiters if not w[3].done()),
+            "dispatched": self.dispatched,
+            "rate_limited": self.rate_limited,
+        }
+
+
+class LLMScheduler:
+    def __init__(self):
+        self._models: dict[str, ModelScheduler] = {}
+
+    def model(self, key: str) -> ModelScheduler:
+        scheduler = self._models.get(key)
+        if scheduler is None:
+            config = get_llm_scheduler_config()
+            limits = config.models.get(key, config.default)
+            scheduler = self._models[key] = ModelScheduler(
+                key,
+                concurrency=limits.get("concurrency", config.default.get("concurrency", 4)),
+                rpm=limits.get("rpm", config.default.get("rpm", 60)),
+                tpm=limits.get("tpm", config.default.get("tpm", 200_000)),
+            )
+        return scheduler
+
+    def on_error(self, key: str, exc: BaseException) -> None:
+        """provider 오류를 받아 429이면 해당 모델을 잠시 멈춘다."""
+        if is_rate_limited(exc):
+            self.model(key).pause(get_llm_scheduler_config().rate_limit_backoff_sec)
+
+    def stats(self) -> dict:
+        return {key: m.stats() for key, m in self._models.items()}
+
+
+llm_scheduler = LLMScheduler()
@@ -0,0 +1,149 @@
+"""
+local_cache_service.py
+──────────────────────
+프로세스 내 L1 캐시 (TTL + LRU).
+Supabase(ticker / news_articles / ticker_summaries) 앞단에서 ticker_id, 기사 목록,
+파싱된 DigestResult를 보관하여 핫 티커의 캐시 히트 시 DB 왕복을 없앤다.
+항목 수와 추정 메모리 크기 두 가지 상한을 두고, 초과 시 가장 오래 사용되지 않은 항목부터 제거한다.
+메모리 상한(local_max_mb)은 캐시 전체의 합이며, local_shares 비율로 캐시마다 나눠 준다.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Optional
+
+from app.config import get_cache_config
+
+logger = logging.getLogger(__name__)
+
+# ticker_id는 생성 후 바뀌지 않으므로 긴 TTL을 사용한다.
+TICKER_ID_TTL_SEC = 24 * 3600
+
+
+@dataclass
+class _Entry:
+    value: Any
+    expires_at: float
+    size: int
+
+
+class LocalTTLCache:
+    def __init__(
+        self,
+        name: str,
+        max_entries: int,
+        max_bytes: int,
+        sizer: Callable[[Any], int] = lambda _: 1,
+    ):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sizer = sizer
+        self._data: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry.value
+
+    def set(self, key: Hashable, value: Any, ttl_sec: float) -> None:
+        if ttl_sec <= 0:
+            return
+        size = self._sizer(value)
+        if size > self.max_bytes:
+            return
+        if key in self._data:
+            self._remove(key)
+        self._data[key] = _Entry(value=value, expires_at=time.monotonic() + ttl_sec, size=size)
+        self._bytes += size
+        while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._data))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        if key in self._data:
+            self._remove(key)
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        keys = [k for k in self._data if predicate(k)]
+        for key in keys:
+            self._remove(key)
+        return len(keys)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._data),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._data.pop(key)
+        self._bytes -= entry.size
+
+
+# ── 크기 추정 ─────────────────────────────────────────────────────────────────
+
+def _article_rows_size(rows: list[dict]) -> int:
+    return sum(len(str(v)) for row in rows for v in row.values()) + 64 * len(rows)
+
+
+def _digest_size(digest) -> int:
+    return sum(len(p.point) + len(p.quote) for p in digest.summary) + 256
+
+
+# ── 캐시 인스턴스 ─────────────────────────────────────────────────────────────
+
+_SIZERS: dict[str, Callable[[Any], int]] = {
+    "ticker_ids": lambda _: 64,
+    "articles": _article_rows_size,
+    "digests": _digest_size,
+    "ticker_search": lambda r: 128 * (len(r) + 1),
+}
+
+
+def _byte_budgets(total_mb: float, shares: dict[str, float]) -> dict[str, int]:
+    """전체 상한을 캐시별 비율로 나눈다. 비율 합이 1을 넘으면 합이 1이 되도록 줄인다."""
+    weights = {name: max(float(shares.get(name, 0.0)), 0.0) for name in _SIZERS}
+    scale = max(sum(weights.values()), 1.0)
+    total_bytes = total_mb * 1024 * 1024
+    return {name: int(total_bytes * weight / scale) for name, weight in weights.items()}
+
+
+def _build_caches() -> tuple[LocalTTLCache, LocalTTLCache, LocalTTLCache, LocalTTLCache]:
+    config = get_cache_config()
+    budgets = _byte_budgets(config.local_max_mb, config.local_shares)
+    return tuple(
+        LocalTTLCache(name, config.local_max_entries, budgets[name], sizer=sizer)
+        for name, sizer in _SIZERS.items()
+    )
+
+
+ticker_id_cache, article_cache, digest_cache, ticker_search_cache = _build_caches()
+
+
+def get_local_cache_stats() -> dict[str, dict]:
+    """L1 캐시별 히트/미스/제거 카운터와 현재 크기를 반환한다."""
+    caches = (ticker_id_cache, article_cache, digest_cache, ticker_search_cache)
+    return {c.name: c.stats() for c in caches}
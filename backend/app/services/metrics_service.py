@@ -0,0 +1,222 @@
+"""
+metrics_service.py
+──────────────────
+뉴스 파이프라인 계측.
+단계별(티커 조회, 기사 캐시 조회, yfinance/RSS 수집, 스크래핑, 요약 캐시 조회, LLM 호출, 캐시 저장)
+소요 시간을 히스토그램으로, 캐시 히트/미스와 LLM 토큰 사용량을 카운터로 집계하여
+Prometheus 텍스트 형식(/metrics)으로 내보낸다.
+요청 처리 중(metrics_middleware가 연 구간)에 측정된 단계는 단계별로 모아 Server-Timing 헤더로도 응답한다.
+집계는 워커 프로세스 단위이며, 여러 워커를 띄우면 Prometheus가 워커별로 수집해 합산한다.
+"""
+
+import asyncio
+import contextvars
+import functools
+import time
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+# 초 단위. LLM 호출(수 초~수십 초)까지 담도록 상단을 넓게 잡는다.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 40.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = labelnames
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.help = help_text
+        self.labelnames = labelnames
+        self.buckets = buckets
+        # 라벨 조합 → [버킷별 개수..., 합계, 전체 개수]
+        self._values: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        state = self._values.get(key)
+        if state is None:
+            state = self._values[key] = [0.0] * (len(self.buckets) + 2)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                state[i] += 1
+        state[-2] += value
+        state[-1] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, state in sorted(self._values.items()):
+            for bound, count in zip(self.buckets, state):
+                le = _format_labels(self.labelnames, key, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{le} {_format_value(count)}")
+            inf = _format_labels(self.labelnames, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{inf} {_format_value(state[-1])}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(state[-2])}")
+            lines.append(f"{self.name}_count{labels} {_format_value(state[-1])}")
+        return lines
+
+
+# ── 지표 정의 ─────────────────────────────────────────────────────────────────
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "HTTP 요청 처리 시간 (응답 헤더 전송까지)",
+    ("method", "route", "status"),
+)
+STAGE_SECONDS = Histogram(
+    "news_stage_duration_seconds",
+    "뉴스 파이프라인 단계별 소요 시간",
+    ("stage", "outcome"),
+)
+CACHE_LOOKUPS = Counter(
+    "news_cache_lookups_total",
+    "캐시 조회 결과 (hit_local: 프로세스 내 L1 히트, stale: TTL 만료 캐시로 응답)",
+    ("cache", "result"),
+)
+LLM_REQUEST_SECONDS = Histogram(
+    "llm_request_duration_seconds",
+    "LLM 호출 시간 (스케줄러 대기 제외, 스트리밍은 마지막 조각까지)",
+    ("provider", "model", "outcome"),
+)
+LLM_TOKENS = Counter(
+    "llm_tokens_total",
+    "LLM 토큰 사용량 (provider가 보고한 값)",
+    ("provider", "model", "kind"),
+)
+
+_METRICS = (HTTP_REQUEST_SECONDS, STAGE_SECONDS, CACHE_LOOKUPS, LLM_REQUEST_SECONDS, LLM_TOKENS)
+
+
+def render_metrics() -> str:
+    """Prometheus 텍스트 노출 형식(0.0.4)."""
+    lines: list[str] = []
+    for metric in _METRICS:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# ── Server-Timing ─────────────────────────────────────────────────────────────
+# 요청 1건 동안 측정된 단계: {단계명: [최초 시작, 마지막 종료, 횟수]} (perf_counter 기준)
+# 병렬로 여러 번 실행된 단계(일괄 조회 등)는 첫 시작부터 마지막 종료까지의 구간으로 보고한다.
+_request_timings: contextvars.ContextVar[Optional[dict[str, list[float]]]] = contextvars.ContextVar(
+    "request_timings", default=None
+)
+
+
+def begin_request_timing() -> contextvars.Token:
+    """요청 구간을 연다. 이 컨텍스트(와 여기서 만든 Task)에서 측정된 단계가 모인다."""
+    return _request_timings.set({})
+
+
+def end_request_timing(token: contextvars.Token) -> None:
+    _request_timings.reset(token)
+
+
+def server_timing_header(total_sec: Optional[float] = None) -> str:
+    """현재 요청 구간의 Server-Timing 헤더 값."""
+    timings = _request_timings.get() or {}
+    entries = []
+    for stage, (start, end, count) in timings.items():
+        entry = f"{stage};dur={(end - start) * 1000:.1f}"
+        if count > 1:
+            entry += f';desc="x{int(count)}"'
+        entries.append(entry)
+    if total_sec is not None:
+        entries.append(f"total;dur={total_sec * 1000:.1f}")
+    return ", ".join(entries)
+
+
+def _record_request_timing(stage: str, start: float, end: float) -> None:
+    timings = _request_timings.get()
+    if timings is None:
+        return
+    span = timings.get(stage)
+    if span is None:
+        timings[stage] = [start, end, 1]
+    else:
+        span[0] = min(span[0], start)
+        span[1] = max(span[1], end)
+        span[2] += 1
+
+
+# ── 단계 측정 ─────────────────────────────────────────────────────────────────
+
+@contextmanager
+def stage_timer(stage: str) -> Iterator[None]:
+    """블록 실행 시간을 단계 히스토그램과 현재 요청의 Server-Timing에 기록한다."""
+    start = time.perf_counter()
+    outcome = "ok"
+    try:
+        yield
+    except BaseException as e:
+        outcome = "cancelled" if isinstance(e, asyncio.CancelledError) else "error"
+        raise
+    finally:
+        end = time.perf_counter()
+        STAGE_SECONDS.observe(end - start, stage=stage, outcome=outcome)
+        _record_request_timing(stage, start, end)
+
+
+def timed(stage: str) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """비동기 함수 전체를 stage_timer로 감싸는 데코레이터."""
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs) -> T:
+            with stage_timer(stage):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_cache_lookup(cache: str, result: str) -> None:
+    CACHE_LOOKUPS.inc(cache=cache, result=result)
+
+
+def record_llm_request(provider: str, model: str, seconds: float, outcome: str) -> None:
+    LLM_REQUEST_SECONDS.observe(seconds, provider=provider, model=model, outcome=outcome)
+
+
+def record_llm_tokens(provider: str, model: str, prompt_tokens: int, completion_tokens: int) -> None:
+    if prompt_tokens:
+        LLM_TOKENS.inc(prompt_tokens, provider=provider, model=model, kind="prompt")
+    if completion_tokens:
+        LLM_TOKENS.inc(completion_tokens, provider=provider, model=model, kind="completion")
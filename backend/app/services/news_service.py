@@ -4,23 +4,40 @@ news_service.py
 뉴스 수집 서비스.
 yfinance → RSS(MarketWatch) 순으로 수집을 시도하며, 
 시장 전체 뉴스를 위한 MarketWatch 전용 수집 기능을 제공한다.
+RSS 피드는 feed_cache_service의 공유 캐시(조건부 요청)에서, 기사 HTML은 공유 HTTP 클라이언트로 가져오고,
+feedparser / newspaper는 받은 바이트의 파싱만 수집 스레드 풀에서 수행한다.
+yfinance는 자체 세션을 쓰므로 호출 전체를 스레드 풀에서 실행한다.
+lookup_stored가 주어지면 이미 DB에 저장된 URL은 저장된 본문을 재사용하고 스크래핑하지 않는다.
+여러 티커를 함께 수집할 때(/batch 미스, pre-warm 주기)는 RssLookup으로 RSS 대체 조회를 한 번으로 묶는다.
 """
 
+import asyncio
 import logging
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Awaitable, Callable, Optional
+from urllib.parse import urlsplit
 
-import feedparser
+import httpx
 import yfinance as yf
 from newspaper import Article
 
+from app.config import get_ingestion_config
+from app.services.feed_cache_service import get_feed, get_feed_entries_for_symbols
+from app.services.http_client_service import fetch
+from app.services.ingestion_service import run_blocking
+from app.services.metrics_service import stage_timer, timed
+from app.services.scrape_cache_service import get_cached_body, put_cached_body
+
 logger = logging.getLogger(__name__)
 
 RSS_FEEDS = {
     "Yahoo_Finance": "https://finance.yahoo.com/rss/", # 야후 파이낸스 종합 금융 뉴스
 }
 
+# URL 목록 → {이미 저장된 URL: 저장된 본문} (news_articles 일괄 조회)
+StoredLookup = Callable[[list[str]], Awaitable[dict[str, str]]]
+
 @dataclass
 class RawArticle:
     title: str
@@ -28,32 +45,160 @@ class RawArticle:
     source: str
     published_at: Optional[datetime]
     raw_content: str
+    id: Optional[int] = None    # news_articles.id (저장 후 채워짐)
 
-def _scrape_body(url: str) -> str:
-    """기사 URL에서 본문을 추출한다. 실패 시 빈 문자열 반환."""
-    if not url:
-        return ""
+def _extract_body(url: str, html: str) -> str:
+    """다운로드한 HTML에서 본문을 추출한다. (블로킹, 네트워크 없음) 실패 시 빈 문자열 반환."""
     try:
         article = Article(url)
-        article.download()
+        article.download(input_html=html)
         article.parse()
         return article.text or ""
     except Exception as e:
-        logger.debug("본문 스크래핑 실패: url=%s, error=%s", url, e)
+        logger.debug("본문 추출 실패: url=%s, error=%s", url, e)
+        return ""
+
+
+async def _download_and_extract(url: str) -> str:
+    """공유 HTTP 클라이언트로 HTML을 받아 스레드 풀에서 본문을 추출한다. 실패 시 빈 문자열."""
+    try:
+        response = await fetch(url)
+    except httpx.HTTPError as e:
+        logger.debug("기사 다운로드 실패: url=%s, error=%s", url, e)
         return ""
+    if response.status_code != 200 or not response.text:
+        logger.debug("기사 다운로드 실패: url=%s, status=%d", url, response.status_code)
+        return ""
+    return await run_blocking(_extract_body, url, response.text)
+
+
+async def _scrape_body_cached(url: str) -> str:
+    """디스크 스크래핑 캐시를 먼저 확인하고, 없으면 스크래핑 후 결과(실패 포함)를 기록한다."""
+    cached = await run_blocking(get_cached_body, url)
+    if cached is not None:
+        return cached
+    body = await _download_and_extract(url)
+    await run_blocking(put_cached_body, url, body)
+    return body
+
 
+async def _scrape_body_async(url: str) -> str:
+    """본문 1건을 스크래핑한다. scrape_timeout_sec 초과 시 빈 문자열 반환."""
+    if not url:
+        return ""
+    try:
+        return await asyncio.wait_for(
+            _scrape_body_cached(url), timeout=get_ingestion_config().scrape_timeout_sec
+        )
+    except asyncio.TimeoutError:
+        logger.debug("본문 스크래핑 타임아웃: url=%s", url)
+        return ""
 
-async def fetch_articles(symbol: str, limit: int = 10) -> list[RawArticle]:
-    """티커 심볼에 대한 최신 뉴스를 수집한다."""
-    articles = await _fetch_from_yfinance(symbol, limit)
+
+# ── 병렬 본문 스크래핑 ────────────────────────────────────────────────────────
+# 전체 동시 실행 수와 호스트별 동시 실행 수를 모두 제한한다.
+_scrape_semaphore: Optional[asyncio.Semaphore] = None
+_host_semaphores: dict[str, asyncio.Semaphore] = {}
+
+
+def _get_scrape_semaphores(url: str) -> tuple[asyncio.Semaphore, asyncio.Semaphore]:
+    global _scrape_semaphore
+    config = get_ingestion_config()
+    if _scrape_semaphore is None:
+        _scrape_semaphore = asyncio.Semaphore(config.scrape_concurrency)
+    host = urlsplit(url).hostname or ""
+    host_semaphore = _host_semaphores.get(host)
+    if host_semaphore is None:
+        host_semaphore = _host_semaphores[host] = asyncio.Semaphore(config.scrape_per_host)
+    return _scrape_semaphore, host_semaphore
+
+
+async def _scrape_body_limited(url: str) -> str:
+    global_semaphore, host_semaphore = _get_scrape_semaphores(url)
+    async with global_semaphore, host_semaphore:
+        return await _scrape_body_async(url)
+
+
+@timed("scrape")
+async def scrape_bodies(urls: list[str]) -> dict[str, str]:
+    """
+    여러 기사 본문을 동시에 스크래핑하여 {url: 본문}을 반환한다.
+    배치 마감 시간(scrape_deadline_sec)이 지나면 완료된 결과만 반환하고
+    나머지는 취소한다. 호출 측은 누락된 URL에 대해 제목/요약을 대체 사용한다.
+    """
+    unique_urls = list(dict.fromkeys(u for u in urls if u))
+    if not unique_urls:
+        return {}
+
+    tasks = {asyncio.create_task(_scrape_body_limited(u)): u for u in unique_urls}
+    done, pending = await asyncio.wait(
+        tasks, timeout=get_ingestion_config().scrape_deadline_sec
+    )
+    for task in pending:
+        task.cancel()
+    if pending:
+        logger.info("본문 스크래핑 마감 초과: done=%d, dropped=%d", len(done), len(pending))
+
+    bodies: dict[str, str] = {}
+    for task in done:
+        if task.exception() is None and task.result():
+            bodies[tasks[task]] = task.result()
+    return bodies
+
+
+async def _fill_missing_bodies(
+    articles: list[RawArticle],
+    lookup_stored: Optional[StoredLookup] = None,
+) -> None:
+    """
+    본문이 비어 있는 기사를 채운다.
+    이미 저장된 URL은 저장된 본문을 쓰고, 나머지만 일괄 스크래핑하며, 실패분은 제목으로 채운다.
+    """
+    if lookup_stored is not None:
+        try:
+            stored = await lookup_stored([a.url for a in articles if a.url])
+        except Exception as e:
+            logger.warning("저장된 기사 조회 실패, 전체 스크래핑: error=%s", e)
+            stored = {}
+        for article in articles:
+            if not article.raw_content and stored.get(article.url):
+                article.raw_content = stored[article.url]
+
+    missing = [a for a in articles if not a.raw_content]
+    if not missing:
+        return
+    bodies = await scrape_bodies([a.url for a in missing])
+    for article in missing:
+        article.raw_content = bodies.get(article.url) or article.title
+
+
+def _download_yf_news(symbol: str) -> list:
+    """yf.Ticker(symbol).news 를 조회한다. (블로킹)"""
+    return yf.Ticker(symbol).news or []
+
+
+async def fetch_articles(
+    symbol: str,
+    limit: int = 10,
+    lookup_stored: Optional[StoredLookup] = None,
+    rss: Optional["RssLookup"] = None,
+) -> list[RawArticle]:
+    """
+    티커 심볼에 대한 최신 뉴스를 수집한다.
+    rss가 주어지면 RSS 대체 조회를 같은 묶음의 다른 티커와 함께 한 번에 수행한다.
+    """
+    articles = await _fetch_from_yfinance(symbol, limit, lookup_stored)
     if not articles:
         logger.warning("yfinance 수집 실패, RSS 시도: symbol=%s", symbol)
-        articles = await _fetch_from_rss(symbol, limit)
+        articles = await (rss.get(symbol) if rss is not None else _fetch_from_rss(symbol, limit))
 
     logger.info("뉴스 수집 완료: symbol=%s, count=%d", symbol, len(articles))
     return articles[:limit]
 
-async def fetch_market_news(limit: int = 10) -> list[RawArticle]:
+async def fetch_market_news(
+    limit: int = 10,
+    lookup_stored: Optional[StoredLookup] = None,
+) -> list[RawArticle]:
     """
     Yahoo Finance 또는 MarketWatch의 금융 시장 전용 RSS에서 최신 뉴스를 수집한다.
     """
@@ -62,7 +207,8 @@ async def fetch_market_news(limit: int = 10) -> list[RawArticle]:
     
     articles = []
     try:
-        feed = feedparser.parse(url)
+        with stage_timer("rss"):
+            feed = await get_feed(url)
         for entry in feed.entries[:limit]:
             pub = entry.get("published_parsed")
             pub_dt = (
@@ -78,8 +224,11 @@ async def fetch_market_news(limit: int = 10) -> list[RawArticle]:
                 url=entry.get("link", ""),
                 source=source_name,
                 published_at=pub_dt,
-                raw_content=entry.get("summary", "") or _scrape_body(entry.get("link", "")) or entry.get("title", ""),
+                raw_content=entry.get("summary", ""),
             ))
+        await _fill_missing_bodies(articles, lookup_stored)
+    except asyncio.TimeoutError:
+        logger.error("%s RSS 수집 타임아웃", url)
     except Exception as e:
         logger.error(f"{url} RSS 수집 오류: {e}")
     
@@ -115,11 +264,17 @@ def _parse_pub_time(item: dict, content: dict) -> Optional[datetime]:
     return None
 
 
-async def _fetch_from_yfinance(symbol: str, limit: int) -> list[RawArticle]:
+async def _fetch_from_yfinance(
+    symbol: str,
+    limit: int,
+    lookup_stored: Optional[StoredLookup] = None,
+) -> list[RawArticle]:
     """yfinance를 통한 뉴스 수집"""
     try:
-        ticker = yf.Ticker(symbol)
-        news_items = ticker.news or []
+        with stage_timer("yfinance"):
+            news_items = await run_blocking(
+                _download_yf_news, symbol, timeout=get_ingestion_config().yfinance_timeout_sec
+            )
         articles = []
         for item in (news_items or []):
             if not isinstance(item, dict):
@@ -128,7 +283,6 @@ async def _fetch_from_yfinance(symbol: str, limit: int) -> list[RawArticle]:
             title = item.get("title") or content.get("title", "")
             if not title:
                 continue
-            raw_text = content.get("body", "") or content.get("summary", "") or _scrape_body(url) or title
             pub_dt = _parse_pub_time(item, content)
             # yfinance 0.2.48+: 원문 URL은 content.clickThroughUrl에 있음
             # 값이 None인 경우를 대비해 or {} 패턴 사용
@@ -138,6 +292,7 @@ async def _fetch_from_yfinance(symbol: str, limit: int) -> list[RawArticle]:
                 or (content.get("canonicalUrl") or {}).get("url", "")
                 or item.get("url", "")
             )
+            raw_text = content.get("body", "") or content.get("summary", "")
             articles.append(RawArticle(
                 title=title,
                 url=url,
@@ -145,33 +300,77 @@ async def _fetch_from_yfinance(symbol: str, limit: int) -> list[RawArticle]:
                 published_at=pub_dt,
                 raw_content=raw_text,
             ))
+        # limit 밖의 기사는 fetch_articles에서 버려지므로 스크래핑하지 않는다.
+        articles = articles[:limit]
+        await _fill_missing_bodies(articles, lookup_stored)
         return articles
+    except asyncio.TimeoutError:
+        logger.error("yfinance 수집 타임아웃: symbol=%s", symbol)
+        return []
     except Exception as e:
         logger.error("yfinance 수집 오류: symbol=%s, error=%s", symbol, e)
         return []
 
-async def _fetch_from_rss(symbol: str, limit: int) -> list[RawArticle]:
-    """RSS 피드를 통한 티커별 뉴스 필터링 수집"""
-    articles = []
-    keyword = symbol.upper()
+async def fetch_rss_articles(symbols: list[str], limit: int) -> dict[str, list[RawArticle]]:
+    """
+    여러 티커의 RSS 기사를 한 번에 찾는다. 피드별 티커 역색인을 조회하므로 티커 수와 무관하게 피드는 1회만 읽는다.
+    반환값: {티커(대문자): 최신순 기사 목록(limit개 이하)}
+    """
+    by_symbol: dict[str, list[RawArticle]] = {s.upper(): [] for s in symbols}
     for source_name, url in RSS_FEEDS.items():
         try:
-            feed = feedparser.parse(url)
-            for entry in feed.entries:
+            with stage_timer("rss"):
+                matches = await get_feed_entries_for_symbols(url, by_symbol)
+        except asyncio.TimeoutError:
+            logger.error("RSS 수집 타임아웃: source=%s", source_name)
+            continue
+        except Exception as e:
+            logger.error("RSS 수집 오류: source=%s, error=%s", source_name, e)
+            continue
+        for symbol, entries in matches.items():
+            for entry in entries:
                 title = entry.get("title", "")
-                if keyword not in title.upper():
-                    continue
                 pub = entry.get("published_parsed")
                 pub_dt = datetime(*pub[:6], tzinfo=timezone.utc) if pub else None
-                articles.append(RawArticle(
+                by_symbol[symbol].append(RawArticle(
                     title=title,
                     url=entry.get("link", ""),
                     source=source_name,
                     published_at=pub_dt,
                     raw_content=entry.get("summary", "") or title,
                 ))
-        except Exception as e:
-            logger.error("RSS 수집 오류: source=%s, error=%s", source_name, e)
 
-    articles.sort(key=lambda a: a.published_at or datetime.min.replace(tzinfo=timezone.utc), reverse=True)
-    return articles[:limit]
\ No newline at end of file
+    oldest = datetime.min.replace(tzinfo=timezone.utc)
+    for articles in by_symbol.values():
+        articles.sort(key=lambda a: a.published_at or oldest, reverse=True)
+        del articles[limit:]
+    return by_symbol
+
+
+async def _fetch_from_rss(symbol: str, limit: int) -> list[RawArticle]:
+    """RSS 피드를 통한 티커별 뉴스 필터링 수집"""
+    return (await fetch_rss_articles([symbol], limit))[symbol.upper()]
+
+class RssLookup:
+    """
+    여러 티커의 RSS 대체 조회를 fetch_rss_articles 한 번으로 묶는다.
+    어느 티커든 처음 RSS가 필요해지는 시점에 묶음 전체를 조회하고, 이후 요청은 그 결과를 나눠 쓴다.
+    yfinance로 모두 수집되면 RSS는 조회하지 않는다.
+    """
+
+    def __init__(self, symbols: list[str], limit: int):
+        self._symbols = list(dict.fromkeys(s.upper() for s in symbols))
+        self._limit = limit
+        self._task: Optional[asyncio.Task] = None
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol.upper() in self._symbols
+
+    async def get(self, symbol: str) -> list[RawArticle]:
+        upper = symbol.upper()
+        if upper not in self._symbols:
+            return await _fetch_from_rss(upper, self._limit)
+        if self._task is None:
+            self._task = asyncio.ensure_future(fetch_rss_articles(self._symbols, self._limit))
+        # 먼저 기다리던 요청이 취소되어도 묶음 조회는 계속된다.
+        return list((await asyncio.shield(self._task))[upper])
@@ -0,0 +1,143 @@
+"""
+prewarm_service.py
+──────────────────
+인기 티커 / Market Pulse 사전 갱신(pre-warm) 스케줄러.
+심볼별 요청 빈도를 감쇠 카운터로 추적하고, 주기마다 상위 N개 + MARKET 중
+요약 TTL 만료가 임박한 항목을 미리 수집/요약한다.
+실제 만료 판단과 갱신 로직은 news_router가 주입한다.
+요청은 정상 응답(200)을 받은 경우에만 기록하며, 갱신 시 기사가 없던 키는 추적에서 제외한다.
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional
+
+from app.config import get_prewarm_config
+
+logger = logging.getLogger(__name__)
+
+MARKET_SYMBOL = "MARKET"
+
+# (symbol, lang) -> 갱신 필요 여부 / 갱신 실행 (False: 갱신할 기사가 없음)
+DueFn = Callable[[str, str], Awaitable[bool]]
+RefreshFn = Callable[[str, str], Awaitable[bool]]
+# 주기마다 갱신 대상 목록이 정해지면 갱신 전에 한 번 호출된다. (여러 심볼 일괄 조회 준비 등)
+BeginFn = Callable[[list[tuple[str, str]]], None]
+
+
+class PrewarmScheduler:
+    def __init__(self):
+        # {(symbol, lang): 감쇠 요청 점수}
+        self._scores: dict[tuple[str, str], float] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._due_fn: Optional[DueFn] = None
+        self._refresh_fn: Optional[RefreshFn] = None
+        self._begin_fn: Optional[BeginFn] = None
+        self.refreshed = 0
+        self.failed = 0
+        self.dropped = 0
+
+    def record(self, symbol: str, lang: str) -> None:
+        """
+        요청 1건을 기록한다.
+        추적 키 수가 상한을 넘으면 점수가 낮은 키부터 버려 상한의 90%까지 줄인다.
+        """
+        key = (symbol, lang)
+        self._scores[key] = self._scores.get(key, 0.0) + 1.0
+        max_tracked = get_prewarm_config().max_tracked_symbols
+        if len(self._scores) > max_tracked:
+            keep = int(max_tracked * 0.9)
+            ranked = sorted(self._scores.items(), key=lambda kv: kv[1], reverse=True)
+            self._scores = dict(ranked[:keep])
+
+    def forget(self, symbol: str, lang: str) -> None:
+        """키를 추적에서 제외한다. 다시 정상 응답이 나가면 record로 다시 추적된다."""
+        if self._scores.pop((symbol, lang), None) is not None:
+            self.dropped += 1
+
+    def top_keys(self, n: int) -> list[tuple[str, str]]:
+        """점수 상위 n개 키 + MARKET(한국어)를 반환한다."""
+        keys = [k for k, _ in sorted(self._scores.items(), key=lambda kv: kv[1], reverse=True)[:n]]
+        if (MARKET_SYMBOL, "ko") not in keys:
+            keys.append((MARKET_SYMBOL, "ko"))
+        return keys
+
+    def start(self, due_fn: DueFn, refresh_fn: RefreshFn, begin_fn: Optional[BeginFn] = None) -> None:
+        if not get_prewarm_config().enabled or self._task is not None:
+            return
+        self._due_fn = due_fn
+        self._refresh_fn = refresh_fn
+        self._begin_fn = begin_fn
+        self._task = asyncio.create_task(self._loop())
+        logger.info("pre-warm 스케줄러 시작")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info("pre-warm 스케줄러 종료")
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(get_prewarm_config().interval_sec)
+            try:
+                await self.run_once()
+            except Exception as exc:
+                logger.error("pre-warm 실행 오류: %s", exc)
+
+    async def run_once(self) -> int:
+        """
+        1회 주기를 실행한다. 만료 임박 항목을 동시성 제한 하에 갱신하고,
+        주기당 예산(budget_per_interval)을 넘는 항목은 다음 주기로 미룬다.
+        갱신한 항목 수를 반환한다.
+        """
+        config = get_prewarm_config()
+        candidates = self.top_keys(config.top_n)
+        self._decay(config.decay)
+
+        due: list[tuple[str, str]] = []
+        for symbol, lang in candidates:
+            if len(due) >= config.budget_per_interval:
+                break
+            try:
+                if await self._due_fn(symbol, lang):
+                    due.append((symbol, lang))
+            except Exception as exc:
+                logger.warning("pre-warm 만료 확인 실패: symbol=%s, error=%s", symbol, exc)
+
+        if due and self._begin_fn is not None:
+            self._begin_fn(due)
+        semaphore = asyncio.Semaphore(config.concurrency)
+
+        async def refresh(symbol: str, lang: str) -> None:
+            async with semaphore:
+                try:
+                    if await self._refresh_fn(symbol, lang):
+                        self.refreshed += 1
+                    else:
+                        logger.info("pre-warm 대상 제외(기사 없음): symbol=%s, lang=%s", symbol, lang)
+                        self.forget(symbol, lang)
+                except Exception as exc:
+                    self.failed += 1
+                    logger.error("pre-warm 갱신 실패: symbol=%s, lang=%s, error=%s", symbol, lang, exc)
+
+        await asyncio.gather(*(refresh(s, l) for s, l in due))
+        if due:
+            logger.info("pre-warm 갱신: count=%d, keys=%s", len(due), due)
+        return len(due)
+
+    def _decay(self, factor: float) -> None:
+        for key in list(self._scores):
+            score = self._scores[key] * factor
+            if score < 0.1:
+                del self._scores[key]
+            else:
+                self._scores[key] = score
+
+
+prewarm_scheduler = PrewarmScheduler()
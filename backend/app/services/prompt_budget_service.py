@@ -0,0 +1,188 @@
+"""
+prompt_budget_service.py
+────────────────────────
+요약 프롬프트 입력 준비 단계.
+1. 제목+본문 단어 shingle의 Jaccard 유사도로 사실상 같은 기사(통신사 전재 등)를 하나로 합친다.
+2. provider별 글자/토큰 비율로 본문 토큰 수를 추정한다.
+3. 전체 토큰 예산을 기사별 관련도(티커/회사명 언급, 중복 보도 수, 최신순)에 비례해 배분하고 본문을 자른다.
+   (기사당 상한 max_tokens_per_article, 몫이 0인 기사는 뺀다)
+절감한 토큰 수는 로그와 누적 카운터(/health)로 보고한다.
+"""
+
+import logging
+import re
+from typing import Iterable
+
+from app.config import get_prompt_budget_config
+
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r"\w+")
+# 중복 판정에 쓰는 본문 앞부분 길이 (전재 기사는 도입부가 같다)
+_SHINGLE_SOURCE_CHARS = 2000
+
+_stats = {
+    "prompts": 0, "tokens_before": 0, "tokens_after": 0, "duplicates_collapsed": 0, "over_budget_dropped": 0,
+}
+
+
+def estimate_tokens(text: str, provider: str) -> int:
+    """
+    토큰 수를 추정한다.
+    ASCII 문자는 provider별 글자/토큰 비율로, 그 외(한글 등)는 글자당 non_ascii_tokens_per_char로 센다.
+    """
+    if not text:
+        return 0
+    config = get_prompt_budget_config()
+    chars_per_token = config.chars_per_token.get(provider, config.chars_per_token.get("default", 4.0))
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    non_ascii_chars = len(text) - ascii_chars
+    return int(ascii_chars / chars_per_token + non_ascii_chars * config.non_ascii_tokens_per_char) + 1
+
+
+# ── 중복 기사 병합 ────────────────────────────────────────────────────────────
+
+def _shingles(text: str, size: int) -> set[tuple[str, ...]]:
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < size:
+        return {tuple(words)} if words else set()
+    return {tuple(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def _jaccard(a: set, b: set) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def collapse_duplicates(articles: list, threshold: float, shingle_size: int) -> tuple[list, list[int]]:
+    """
+    앞선(최신) 기사를 대표로 남기고, 유사도가 threshold 이상인 뒤 기사를 흡수한다.
+    대표 기사의 출처에 흡수된 기사의 출처를 덧붙인다.
+    반환값: (대표 기사 목록, 대표별 흡수된 기사 수)
+    """
+    kept: list = []
+    kept_shingles: list[set] = []
+    merged: list[int] = []
+    for article in articles:
+        shingles = _shingles(f"{article.title} {article.content[:_SHINGLE_SOURCE_CHARS]}", shingle_size)
+        for i, other in enumerate(kept_shingles):
+            if _jaccard(shingles, other) >= threshold:
+                merged[i] += 1
+                rep = kept[i]
+                if article.source and article.source not in rep.source:
+                    kept[i] = rep.model_copy(update={"source": f"{rep.source}, {article.source}"})
+                break
+        else:
+            kept.append(article)
+            kept_shingles.append(shingles)
+            merged.append(0)
+    return kept, merged
+
+
+# ── 관련도 / 예산 배분 ────────────────────────────────────────────────────────
+
+def _relevance(article, position: int, merged: int, keywords: list[str]) -> float:
+    """최신순 감쇠 × (1 + 제목 언급 + 본문 언급 + 중복 보도 수)."""
+    score = 1.0 + 0.5 * merged
+    title = article.title.lower()
+    content = article.content.lower()
+    for keyword in keywords:
+        if keyword in title:
+            score += 2.0
+        score += 0.25 * min(content.count(keyword), 4)
+    return score / (1.0 + 0.15 * position)
+
+
+def allocate_budget(needs: list[int], weights: list[float], budget: int, floor: int) -> list[int]:
+    """
+    가중치 비례 water-filling으로 예산을 나눈다.
+    필요량이 몫보다 작은 기사는 필요량만 받고, 남은 예산을 나머지 기사에 다시 나눈다.
+    각 기사는 최소 min(필요량, floor)을 받는다.
+    """
+    alloc = [0] * len(needs)
+    active = [i for i, need in enumerate(needs) if need > 0]
+    remaining = budget
+    while active and remaining > 0:
+        total_weight = sum(weights[i] for i in active)
+        shares = {i: remaining * weights[i] / total_weight for i in active}
+        satisfied = [i for i in active if needs[i] <= shares[i]]
+        if not satisfied:
+            for i in active:
+                alloc[i] = int(shares[i])
+            # 내림으로 남은 예산은 소수부가 큰 기사부터 1씩 준다. (예산이 남았는데 몫이 모두 0이 되지 않게)
+            leftover = remaining - sum(alloc[i] for i in active)
+            for i in sorted(active, key=lambda i: shares[i] - alloc[i], reverse=True)[:leftover]:
+                alloc[i] += 1
+            break
+        for i in satisfied:
+            alloc[i] = needs[i]
+            remaining -= needs[i]
+        active = [i for i in active if i not in satisfied]
+    return [max(a, min(need, floor)) for a, need in zip(alloc, needs)]
+
+
+def _truncate(text: str, tokens: int, need: int) -> str:
+    """추정 토큰 비율만큼 앞부분을 남기되, 가능하면 문장/단어 경계에서 자른다."""
+    if tokens >= need:
+        return text
+    if tokens <= 0:
+        return ""
+    cut = int(len(text) * tokens / need)
+    boundary = max(text.rfind(". ", 0, cut), text.rfind("\n", 0, cut))
+    if boundary < cut * 0.8:
+        boundary = text.rfind(" ", 0, cut)
+    if boundary < cut * 0.8:
+        boundary = cut
+    return text[:boundary + 1].rstrip()
+
+
+def prepare_articles(
+    articles: list,
+    provider: str,
+    keywords: Iterable[str] = (),
+    max_chars: int = 0,
+) -> list:
+    """
+    중복 병합 + 토큰 예산 배분을 거친 ArticleInput 목록을 반환한다.
+    max_chars는 기존 방식(기사당 글자 수 상한)의 입력량을 계산해 절감량을 보고하는 데만 쓴다.
+    """
+    config = get_prompt_budget_config()
+    if not config.enabled or not articles:
+        return articles
+
+    keywords = [k.lower() for k in keywords if k]
+    before = sum(
+        estimate_tokens(a.content[:max_chars] if max_chars else a.content, provider) for a in articles
+    )
+
+    kept, merged = collapse_duplicates(articles, config.dedup_threshold, config.shingle_size)
+    needs = [min(estimate_tokens(a.content, provider), config.max_tokens_per_article) for a in kept]
+    weights = [_relevance(a, i, merged[i], keywords) for i, a in enumerate(kept)]
+    alloc = allocate_budget(needs, weights, config.max_input_tokens, config.min_tokens_per_article)
+
+    # 몫이 0인 기사는 한 글자로 자르지 않고 뺀다. (본문 없이 머리글만 넣으면 다 쓴 예산을 더 넘긴다)
+    # 본문이 원래 없는 기사(need 0)는 그대로 둔다.
+    prepared = [
+        a.model_copy(update={"content": _truncate(a.content, tokens, estimate_tokens(a.content, provider))})
+        for a, tokens, need in zip(kept, alloc, needs)
+        if tokens > 0 or need == 0
+    ]
+    after = sum(estimate_tokens(a.content, provider) for a in prepared)
+
+    collapsed = len(articles) - len(kept)
+    dropped = len(kept) - len(prepared)
+    _stats["prompts"] += 1
+    _stats["tokens_before"] += before
+    _stats["tokens_after"] += after
+    _stats["duplicates_collapsed"] += collapsed
+    _stats["over_budget_dropped"] += dropped
+    logger.info(
+        "프롬프트 입력 준비: articles=%d→%d (dropped=%d), tokens=%d→%d (saved=%d)",
+        len(articles), len(prepared), dropped, before, after, before - after,
+    )
+    return prepared
+
+
+def get_prompt_budget_stats() -> dict:
+    return {**_stats, "tokens_saved": _stats["tokens_before"] - _stats["tokens_after"]}
@@ -0,0 +1,156 @@
+"""
+scrape_cache_service.py
+───────────────────────
+기사 본문 스크래핑 결과의 로컬 디스크 캐시 (SQLite).
+- 키: 정규화한 URL (추적 파라미터/fragment 제거, 쿼리 정렬)
+- 값: zlib 압축 본문. 실패한 스크래핑도 짧은 TTL로 기록해 반복 재시도를 막는다(negative cache).
+- 전체 크기가 max_mb를 넘으면 오래 사용되지 않은 항목부터 제거한다.
+같은 호스트의 모든 워커가 하나의 파일(WAL 모드)을 공유한다.
+모든 함수는 블로킹이며 수집 스레드 풀 안에서 호출된다.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from app.config import get_scrape_cache_config
+
+logger = logging.getLogger(__name__)
+
+# 본문과 무관한 추적용 쿼리 파라미터
+_TRACKING_PARAMS = {"guccounter", "guce_referrer", "guce_referrer_sig", "ncid", "fbclid", "gclid", "cmpid"}
+
+# 삽입 N회마다 전체 크기를 확인한다.
+_EVICT_CHECK_EVERY = 50
+
+_local = threading.local()
+_init_lock = threading.Lock()
+_initialized = False
+_inserts_since_check = 0
+
+
+def canonical_url(url: str) -> str:
+    """스킴/호스트 소문자화, fragment와 추적 파라미터 제거, 쿼리 정렬."""
+    parts = urlsplit(url.strip())
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ""))
+
+
+def _db_path() -> Path:
+    path = Path(get_scrape_cache_config().path)
+    return path if path.is_absolute() else Path(__file__).parent.parent.parent / path
+
+
+def _connect() -> sqlite3.Connection:
+    """스레드별 커넥션을 반환한다. 최초 1회 스키마를 생성한다."""
+    global _initialized
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        return conn
+
+    path = _db_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=5.0, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    with _init_lock:
+        if not _initialized:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS scrape_cache (
+                    url         TEXT PRIMARY KEY,
+                    body        BLOB,               -- zlib 압축 본문 (실패 시 NULL)
+                    ok          INTEGER NOT NULL,   -- 1: 성공, 0: 실패(negative)
+                    size        INTEGER NOT NULL,   -- 압축 후 바이트 수
+                    created_at  REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_scrape_cache_accessed ON scrape_cache(accessed_at)")
+            _initialized = True
+    _local.conn = conn
+    return conn
+
+
+def get_cached_body(url: str) -> Optional[str]:
+    """
+    캐시된 본문을 반환한다.
+    - 성공 캐시: 본문 문자열
+    - 실패 캐시(negative): 빈 문자열 → 호출 측은 스크래핑하지 않는다
+    - 없음/만료: None
+    """
+    config = get_scrape_cache_config()
+    if not config.enabled or not url:
+        return None
+    key = canonical_url(url)
+    try:
+        conn = _connect()
+        row = conn.execute(
+            "SELECT body, ok, created_at FROM scrape_cache WHERE url = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        body, ok, created_at = row
+        ttl_hours = config.ttl_hours if ok else config.negative_ttl_hours
+        now = time.time()
+        if now - created_at > ttl_hours * 3600:
+            return None
+        conn.execute("UPDATE scrape_cache SET accessed_at = ? WHERE url = ?", (now, key))
+        return zlib.decompress(body).decode("utf-8") if ok else ""
+    except Exception as e:
+        logger.warning("스크래핑 캐시 조회 실패: url=%s, error=%s", url, e)
+        return None
+
+
+def put_cached_body(url: str, body: str) -> None:
+    """스크래핑 결과를 저장한다. 빈 본문은 실패(negative)로 기록한다."""
+    global _inserts_since_check
+    config = get_scrape_cache_config()
+    if not config.enabled or not url:
+        return
+    key = canonical_url(url)
+    blob = zlib.compress(body.encode("utf-8"), config.compress_level) if body else None
+    now = time.time()
+    try:
+        conn = _connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO scrape_cache (url, body, ok, size, created_at, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            # 실패 항목도 크기 상한에 포함되도록 키 길이를 크기로 기록한다.
+            (key, blob, 1 if body else 0, len(blob) if blob else len(key), now, now),
+        )
+        _inserts_since_check += 1
+        if _inserts_since_check >= _EVICT_CHECK_EVERY:
+            _inserts_since_check = 0
+            _evict(conn, int(config.max_mb * 1024 * 1024))
+    except Exception as e:
+        logger.warning("스크래핑 캐시 저장 실패: url=%s, error=%s", url, e)
+
+
+def _evict(conn: sqlite3.Connection, max_bytes: int) -> None:
+    """전체 크기가 max_bytes를 넘으면 오래 사용되지 않은 항목부터 지워 90%까지 줄인다."""
+    total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM scrape_cache").fetchone()[0]
+    if total <= max_bytes:
+        return
+    target = int(max_bytes * 0.9)
+    removed = 0
+    rows = conn.execute("SELECT url, size FROM scrape_cache ORDER BY accessed_at").fetchall()
+    doomed = []
+    for url, size in rows:
+        if total - removed <= target:
+            break
+        doomed.append((url,))
+        removed += size
+    conn.executemany("DELETE FROM scrape_cache WHERE url = ?", doomed)
+    logger.info("스크래핑 캐시 정리: removed=%d, bytes=%d", len(doomed), removed)
@@ -0,0 +1,46 @@
+"""
+single_flight_service.py
+────────────────────────
+키 단위 동시 요청 병합(single-flight).
+같은 키로 동시에 들어온 작업은 최초 1회만 실행하고,
+나머지 호출자는 같은 결과(또는 예외)를 함께 기다린다.
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    def __init__(self, name: str = ""):
+        self._name = name
+        # {key: 진행 중인 Task}
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        key에 대해 진행 중인 작업이 있으면 그 결과를 기다리고, 없으면 fn()을 실행한다.
+        호출자 하나가 취소되어도(클라이언트 연결 종료 등) 공유 작업은 계속 진행된다.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._forget(k, t))
+        else:
+            logger.debug("single-flight 병합: name=%s, key=%s", self._name, key)
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # 대기자가 모두 취소된 경우에도 "Task exception was never retrieved" 경고를 막는다.
+        if not task.cancelled():
+            task.exception()
+
+    def inflight_count(self) -> int:
+        return len(self._inflight)
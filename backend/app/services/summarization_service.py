@@ -5,16 +5,19 @@ summarization_service.py
 사용자 커스텀 프롬프트를 반영하여 시장 뉴스를 요약한다.
 """
 
+import hashlib
 import json
 import logging
+import textwrap
+from contextlib import aclosing
 from datetime import datetime, timezone
-from typing import Optional
+from typing import AsyncIterator, Callable, Optional, Union
 
-import anthropic
-import google.generativeai as genai
 from pydantic import BaseModel
 
-from app.config import get_feature_config
+from app.config import FeatureModelConfig, get_feature_config
+from app.services.llm_router_service import llm_router
+from app.services.prompt_budget_service import prepare_articles
 
 logger = logging.getLogger(__name__)
 
@@ -22,8 +25,11 @@ MAX_ARTICLES        = 10
 MAX_CONTENT_CHARS   = 1024
 MAX_SUMMARY_BULLETS = 10
 
+# 프롬프트/응답 형식을 바꾸면 올린다. 요약 fingerprint에 포함되어 기존 요약 재사용을 막는다.
+PROMPT_VERSION = "2"
+
 class ArticleInput(BaseModel):
-    id: int
+    id: Optional[int] = None   # news_articles.id
     title: str
     source: str
     content: str
@@ -40,6 +46,13 @@ class DigestResult(BaseModel):
     article_ids: list[int]
     article_count: int
     created_at: datetime
+    fingerprint: str = ""                   # 입력 기사 집합 + 프롬프트/모델 버전 해시
+    refreshed_at: Optional[datetime] = None # 같은 기사 집합으로 유효기간을 연장한 마지막 시각
+
+    @property
+    def valid_from(self) -> datetime:
+        """캐시 TTL 기준 시각."""
+        return self.refreshed_at or self.created_at
 
 
 # ── API 응답 모델 ─────────────────────────────────────────────────────────────
@@ -52,6 +65,8 @@ class DigestOut(BaseModel):
     summary: list[SummaryPoint]
     sentiment: SentimentOut
     based_on_articles: int
+    stale: bool = False     # TTL이 지난 캐시를 응답한 경우 True (백그라운드 갱신 중)
+    age_seconds: int = 0    # 요약 생성 후 경과 시간
 
 class ArticleOut(BaseModel):
     id: int
@@ -67,6 +82,86 @@ class NewsResponse(BaseModel):
     digest: DigestOut
     articles: list[ArticleOut]
 
+class BatchErrorOut(BaseModel):
+    code: str
+    message: str
+    status: int
+
+class BatchNewsItem(BaseModel):
+    symbol: str
+    data: Optional[NewsResponse] = None
+    error: Optional[BatchErrorOut] = None
+
+class BatchNewsResponse(BaseModel):
+    results: list[BatchNewsItem]
+
+
+# ── 묶음 요약 입력 ────────────────────────────────────────────────────────────
+
+class TickerArticles(BaseModel):
+    symbol: str
+    company_name: str
+    articles: list[ArticleInput]
+
+
+def _response_format(symbol: str, lang: str) -> str:
+    """응답 JSON 형식 블록. lang="both"이면 한/영 요약을 각각 summary_ko / summary_en으로 받는다."""
+    if symbol == "MARKET":
+        if lang == "both":
+            return """{
+  "summary_ko": [
+    {"point": "기사 1에 대한 한국어 요약 (여러 문장 가능)"},
+    ...
+  ],
+  "summary_en": [
+    {"point": "English summary of article 1 (may be several sentences)"},
+    ...
+  ]
+}"""
+        return """{
+  "summary": [
+    {"point": "기사 1에 대한 요약 (여러 문장 가능)"},
+    {"point": "기사 2에 대한 요약 (여러 문장 가능)"},
+    ...
+  ]
+}"""
+
+    if lang == "both":
+        return """{
+  "summary_ko": [
+    {"point": "요약 문장 (한국어)", "quote": "근거 원문 (영어)"}
+  ],
+  "summary_en": [
+    {"point": "Summary sentence (English)", "quote": "근거 원문 (영어)"}
+  ],
+  "sentiment_score": 0.0,
+  "sentiment_label": "Positive | Neutral | Negative"
+}"""
+    return """{
+  "summary": [
+    {"point": "요약 문장", "quote": "근거 원문 (영어)"}
+  ],
+  "sentiment_score": 0.0,
+  "sentiment_label": "Positive | Neutral | Negative"
+}"""
+
+
+def _lang_instruction(lang: str) -> str:
+    if lang == "both":
+        return (
+            "같은 내용을 한국어(summary_ko)와 영어(summary_en)로 각각 작성하세요. "
+            "두 목록의 항목 수와 순서는 동일해야 합니다."
+        )
+    return "한국어로 작성하세요." if lang == "ko" else "Please write in English."
+
+
+def _articles_block(articles: list[ArticleInput]) -> str:
+    # 본문 길이는 _prepare_articles에서 토큰 예산에 맞춰 이미 조정되어 있다.
+    block = ""
+    for i, article in enumerate(articles, start=1):
+        block += f"[기사 {i}] 제목: {article.title}\n출처: {article.source}\n내용: {article.content}\n\n"
+    return block
+
 
 def _build_prompt(
     symbol: str,
@@ -74,12 +169,10 @@ def _build_prompt(
     articles: list[ArticleInput],
     lang: str = "ko",
 ) -> str:
-    lang_instruction = "한국어로 작성하세요." if lang == "ko" else "Please write in English."
-    
-    articles_block = ""
-    for i, article in enumerate(articles, start=1):
-        trimmed = article.content[:MAX_CONTENT_CHARS]
-        articles_block += f"[기사 {i}] 제목: {article.title}\n출처: {article.source}\n내용: {trimmed}\n\n"
+    lang_instruction = _lang_instruction(lang)
+    response_format = _response_format(symbol, lang)
+
+    articles_block = _articles_block(articles)
 
     # Market Pulse (MarketWatch) 전용 프롬프트 (사용자 요청 반영)
     if symbol == "MARKET":
@@ -94,13 +187,7 @@ https://www.marketwatch.com
 4. {lang_instruction}
 
 ## 응답 형식 (반드시 아래 JSON 포맷만 출력)
-{{
-  "summary": [
-    {{"point": "기사 1에 대한 요약 (여러 문장 가능)"}},
-    {{"point": "기사 2에 대한 요약 (여러 문장 가능)"}},
-    ...
-  ]
-}}
+{response_format}
 
 ## 뉴스 데이터
 {articles_block}"""
@@ -115,17 +202,70 @@ https://www.marketwatch.com
 4. {lang_instruction}
 
 ## 응답 형식 (반드시 아래 JSON 포맷만 출력)
-{{
-  "summary": [
-    {{"point": "요약 문장", "quote": "근거 원문 (영어)"}}
-  ],
-  "sentiment_score": 0.0,
-  "sentiment_label": "Positive | Neutral | Negative"
-}}
+{response_format}
 
 ## 뉴스 데이터
 {articles_block}"""
 
+def _build_batch_prompt(items: list[TickerArticles], lang: str = "ko") -> str:
+    """
+    여러 티커를 한 번에 요약하는 프롬프트. 응답은 {"results": {티커: 단일 티커 응답 형식}}.
+    모든 티커의 응답 형식이 같아야 한다. (MARKET처럼 형식이 다른 항목은 묶을 수 없다)
+    """
+    formats = {_response_format(item.symbol, lang) for item in items}
+    if len(formats) != 1:
+        raise ValueError(f"응답 형식이 다른 티커는 묶을 수 없습니다: {[item.symbol for item in items]}")
+    ticker_format = textwrap.indent(formats.pop(), "    ").lstrip()
+    results_format = ",\n".join(f'    "{item.symbol}": {ticker_format}' for item in items)
+    response_format = f'{{\n  "results": {{\n{results_format}\n  }}\n}}'
+    tickers = ", ".join(f"{item.symbol}({item.company_name})" for item in items)
+
+    data_block = ""
+    for item in items:
+        data_block += f"### {item.symbol} ({item.company_name})\n{_articles_block(item.articles)}"
+
+    return f"""당신은 금융 뉴스 분석 전문가입니다. {len(items)}개 종목 {tickers}의 최신 뉴스를 종목별로 따로 분석합니다.
+
+## 지시사항
+1. 종목마다 해당 종목 투자자에게 중요한 핵심 인사이트를 {MAX_SUMMARY_BULLETS}줄 이내로 요약하세요.
+2. 각 종목의 요약에는 그 종목 섹션의 뉴스만 사용하고, 다른 종목의 내용을 섞지 마세요.
+3. 중복된 내용은 하나로 합치고 투자자 관점에서 중요한 순서로 나열하세요.
+4. 종목마다 전체 뉴스 흐름에 대한 Sentiment Score (-1.0 ~ +1.0)를 산출하세요.
+5. {_lang_instruction(lang)}
+6. results에는 모든 종목을 심볼 그대로의 키로 포함하세요.
+
+## 응답 형식 (반드시 아래 JSON 포맷만 출력)
+{response_format}
+
+## 뉴스 데이터
+{data_block}"""
+
+def article_set_fingerprint(article_keys: list[str], feature: str) -> str:
+    """
+    요약 입력을 식별하는 해시. 상위 MAX_ARTICLES개 기사 키(URL)의 집합과
+    프롬프트 버전, feature의 provider/model/bilingual 설정이 같으면 같은 값이 된다.
+    """
+    feat_config = get_feature_config(feature)
+    material = "\n".join([
+        PROMPT_VERSION, feature, feat_config.provider, feat_config.model, str(feat_config.bilingual),
+        *sorted(article_keys[:MAX_ARTICLES]),
+    ])
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+def _prepare_articles(
+    symbol: str,
+    company_name: str,
+    articles: list[ArticleInput],
+    feat_config: FeatureModelConfig,
+) -> list[ArticleInput]:
+    """상위 MAX_ARTICLES개를 중복 병합 + 토큰 예산 배분한다. 비활성화 시 기사당 MAX_CONTENT_CHARS로 자른다."""
+    articles = articles[:MAX_ARTICLES]
+    keywords = [] if symbol == "MARKET" else [symbol, company_name.split(" ")[0]]
+    prepared = prepare_articles(articles, feat_config.provider, keywords, MAX_CONTENT_CHARS)
+    if prepared is articles:
+        return [a.model_copy(update={"content": a.content[:MAX_CONTENT_CHARS]}) for a in articles]
+    return prepared
+
 def _parse_llm_response(raw_text: str) -> dict:
     raw_text = raw_text.strip()
     if "```json" in raw_text:
@@ -137,6 +277,132 @@ def _parse_llm_response(raw_text: str) -> dict:
     except json.JSONDecodeError:
         raise ValueError("LLM 응답 파싱 실패")
 
+async def _generate(
+    prompt: str,
+    feat_config: FeatureModelConfig,
+    api_key: Optional[str] = None,
+    max_tokens: Optional[int] = None,
+) -> tuple[str, str]:
+    """
+    LLM 라우터로 프롬프트를 실행하고 (응답 텍스트, 모델 버전)을 반환한다.
+    1차 모델이 느리면 fallback 모델로 헤지하므로 모델 버전은 실제로 응답한 모델이다.
+    """
+    return await llm_router.generate(feat_config, prompt, api_key, max_tokens)
+
+def _to_digest(
+    points: list[dict],
+    parsed: dict,
+    model_version: str,
+    articles: list[ArticleInput],
+) -> DigestResult:
+    return DigestResult(
+        summary=[SummaryPoint(**b) for b in points],
+        sentiment_score=parsed.get("sentiment_score", 0.0),
+        sentiment_label=parsed.get("sentiment_label", "Neutral"),
+        model_version=model_version,
+        article_ids=[a.id for a in articles if a.id is not None],
+        article_count=len(articles),
+        created_at=datetime.now(tz=timezone.utc),
+    )
+
+async def _generate_stream(
+    prompt: str,
+    feat_config: FeatureModelConfig,
+    api_key: Optional[str] = None,
+) -> tuple[str, AsyncIterator[str]]:
+    """
+    LLM 라우터로 스트리밍 응답을 연다. 첫 조각 전 실패 시 fallback 모델로 넘어간다.
+    반환값: (모델 버전, 응답 텍스트 조각 이터레이터)
+    """
+    return await llm_router.open_stream(feat_config, prompt, api_key)
+
+class SummaryStreamParser:
+    """
+    스트리밍 중인 LLM JSON 응답에서 key 배열의 원소 객체를 완성되는 즉시 꺼내는 증분 파서.
+    문자열/이스케이프 상태와 중괄호 깊이만 추적하므로 조각마다 새로 들어온 부분만 스캔한다.
+    """
+
+    def __init__(self, key: str = "summary"):
+        self._key = f'"{key}"'
+        self._buf = ""
+        self._pos = -1          # 배열 '[' 다음부터의 스캔 위치 (-1: 아직 배열 시작 전)
+        self._depth = 0
+        self._in_str = False
+        self._escape = False
+        self._start = -1
+        self._done = False
+
+    def feed(self, chunk: str) -> list[dict]:
+        """조각을 추가하고 새로 완성된 객체 목록을 반환한다."""
+        self._buf += chunk
+        completed: list[dict] = []
+        if self._done:
+            return completed
+        if self._pos < 0:
+            key_at = self._buf.find(self._key)
+            if key_at < 0:
+                return completed
+            bracket_at = self._buf.find("[", key_at + len(self._key))
+            if bracket_at < 0:
+                return completed
+            self._pos = bracket_at + 1
+
+        buf, i = self._buf, self._pos
+        while i < len(buf):
+            c = buf[i]
+            if self._in_str:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_str = False
+            elif c == '"':
+                self._in_str = True
+            elif c == "{":
+                if self._depth == 0:
+                    self._start = i
+                self._depth += 1
+            elif c == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        completed.append(json.loads(buf[self._start:i + 1]))
+                    except json.JSONDecodeError:
+                        pass
+            elif c == "]" and self._depth == 0:
+                self._done = True
+                i += 1
+                break
+            i += 1
+        self._pos = i
+        return completed
+
+    @property
+    def text(self) -> str:
+        return self._buf
+
+async def _stream_and_parse(
+    prompt: str,
+    feat_config: FeatureModelConfig,
+    api_key: Optional[str],
+    stream_key: str,
+    on_point: Callable[[SummaryPoint], None],
+) -> tuple[dict, str]:
+    """
+    응답을 스트리밍하며 stream_key 배열의 bullet을 on_point로 전달하고, 끝나면 전체를 파싱한다.
+    반환값: (파싱 결과, 모델 버전)
+    """
+    parser = SummaryStreamParser(stream_key)
+    model_version, chunks = await _generate_stream(prompt, feat_config, api_key)
+    # 중간에 끊겨도(클라이언트 연결 종료, 취소 등) 모델 슬롯이 반납되도록 반드시 닫는다.
+    async with aclosing(chunks):
+        async for chunk in chunks:
+            for obj in parser.feed(chunk):
+                if "point" in obj:
+                    on_point(SummaryPoint(point=obj["point"], quote=obj.get("quote", "")))
+    return _parse_llm_response(parser.text), model_version
+
 async def summarize_articles(
     symbol: str,
     company_name: str,
@@ -149,31 +415,130 @@ async def summarize_articles(
         raise ValueError("기사가 없습니다.")
 
     feat_config = get_feature_config(feature)
-    prompt = _build_prompt(symbol, company_name, articles[:MAX_ARTICLES], lang)
-
-    if feat_config.provider == "gemini":
-        if api_key: genai.configure(api_key=api_key)
-        model = genai.GenerativeModel(feat_config.model)
-        response = await model.generate_content_async(prompt)
-        raw_text, model_version = response.text, feat_config.model
-    else:
-        client = anthropic.AsyncAnthropic(api_key=api_key)
-        message = await client.messages.create(
-            model=feat_config.model,
-            max_tokens=feat_config.max_tokens,
-            messages=[{"role": "user", "content": prompt}],
-        )
-        raw_text, model_version = message.content[0].text, feat_config.model
+    articles = _prepare_articles(symbol, company_name, articles, feat_config)
+    prompt = _build_prompt(symbol, company_name, articles, lang)
 
+    raw_text, model_version = await _generate(prompt, feat_config, api_key)
     parsed = _parse_llm_response(raw_text)
-    bullets = [SummaryPoint(**b) for b in parsed.get("summary", [])]
+    return _to_digest(parsed.get("summary", []), parsed, model_version, articles)
 
-    return DigestResult(
-        summary=bullets,
-        sentiment_score=parsed.get("sentiment_score", 0.0),
-        sentiment_label=parsed.get("sentiment_label", "Neutral"),
-        model_version=model_version,
-        article_ids=[a.id for a in articles[:MAX_ARTICLES]],
-        article_count=len(articles[:MAX_ARTICLES]),
-        created_at=datetime.now(tz=timezone.utc),
-    )
\ No newline at end of file
+async def summarize_articles_bilingual(
+    symbol: str,
+    company_name: str,
+    articles: list[ArticleInput],
+    api_key: Optional[str] = None,
+    feature: str = "ticker_brief",
+) -> tuple[DigestResult, DigestResult]:
+    """한 번의 LLM 호출로 한국어/영어 요약을 함께 생성한다. 반환값: (digest_ko, digest_en)"""
+    if not articles:
+        raise ValueError("기사가 없습니다.")
+
+    feat_config = get_feature_config(feature)
+    articles = _prepare_articles(symbol, company_name, articles, feat_config)
+    prompt = _build_prompt(symbol, company_name, articles, "both")
+
+    raw_text, model_version = await _generate(prompt, feat_config, api_key)
+    parsed = _parse_llm_response(raw_text)
+    if "summary_ko" not in parsed or "summary_en" not in parsed:
+        raise ValueError("LLM 응답에 summary_ko / summary_en이 없습니다.")
+
+    return (
+        _to_digest(parsed["summary_ko"], parsed, model_version, articles),
+        _to_digest(parsed["summary_en"], parsed, model_version, articles),
+    )
+
+async def stream_summarize_articles(
+    symbol: str,
+    company_name: str,
+    articles: list[ArticleInput],
+    on_point: Callable[[SummaryPoint], None],
+    lang: str = "ko",
+    api_key: Optional[str] = None,
+    feature: str = "ticker_brief",
+) -> DigestResult:
+    """summarize_articles의 스트리밍 버전. bullet이 완성될 때마다 on_point를 호출한다."""
+    if not articles:
+        raise ValueError("기사가 없습니다.")
+
+    feat_config = get_feature_config(feature)
+    articles = _prepare_articles(symbol, company_name, articles, feat_config)
+    prompt = _build_prompt(symbol, company_name, articles, lang)
+
+    parsed, model_version = await _stream_and_parse(prompt, feat_config, api_key, "summary", on_point)
+    return _to_digest(parsed.get("summary", []), parsed, model_version, articles)
+
+async def stream_summarize_articles_bilingual(
+    symbol: str,
+    company_name: str,
+    articles: list[ArticleInput],
+    on_point: Callable[[SummaryPoint], None],
+    stream_lang: str = "ko",
+    api_key: Optional[str] = None,
+    feature: str = "ticker_brief",
+) -> tuple[DigestResult, DigestResult]:
+    """summarize_articles_bilingual의 스트리밍 버전. stream_lang 쪽 bullet만 on_point로 전달한다."""
+    if not articles:
+        raise ValueError("기사가 없습니다.")
+
+    feat_config = get_feature_config(feature)
+    articles = _prepare_articles(symbol, company_name, articles, feat_config)
+    prompt = _build_prompt(symbol, company_name, articles, "both")
+
+    parsed, model_version = await _stream_and_parse(
+        prompt, feat_config, api_key, f"summary_{stream_lang}", on_point
+    )
+    if "summary_ko" not in parsed or "summary_en" not in parsed:
+        raise ValueError("LLM 응답에 summary_ko / summary_en이 없습니다.")
+
+    return (
+        _to_digest(parsed["summary_ko"], parsed, model_version, articles),
+        _to_digest(parsed["summary_en"], parsed, model_version, articles),
+    )
+
+async def summarize_articles_batch(
+    items: list[TickerArticles],
+    lang: str = "ko",
+    api_key: Optional[str] = None,
+    feature: str = "ticker_brief",
+) -> dict[str, Union[DigestResult, tuple[DigestResult, DigestResult]]]:
+    """
+    여러 티커를 한 번의 LLM 호출로 요약한다. lang="both"이면 티커마다 (digest_ko, digest_en)을 만든다.
+    응답 전체를 해석하지 못하면 ValueError를 발생시키고,
+    응답에 빠졌거나 형식이 맞지 않는 티커는 결과에서 제외한다. (호출 측이 티커별로 다시 요약)
+    """
+    feat_config = get_feature_config(feature)
+    prepared = [
+        item.model_copy(update={
+            "articles": _prepare_articles(item.symbol, item.company_name, item.articles, feat_config)
+        })
+        for item in items if item.articles
+    ]
+    if not prepared:
+        return {}
+    prompt = _build_batch_prompt(prepared, lang)
+
+    raw_text, model_version = await _generate(
+        prompt, feat_config, api_key, max_tokens=feat_config.max_tokens * len(prepared)
+    )
+    results = _parse_llm_response(raw_text).get("results")
+    if not isinstance(results, dict):
+        raise ValueError("LLM 응답에 results가 없습니다.")
+
+    digests: dict[str, Union[DigestResult, tuple[DigestResult, DigestResult]]] = {}
+    for item in prepared:
+        parsed = results.get(item.symbol)
+        if not isinstance(parsed, dict):
+            continue
+        try:
+            if lang == "both":
+                if "summary_ko" not in parsed or "summary_en" not in parsed:
+                    continue
+                digests[item.symbol] = (
+                    _to_digest(parsed["summary_ko"], parsed, model_version, item.articles),
+                    _to_digest(parsed["summary_en"], parsed, model_version, item.articles),
+                )
+            elif "summary" in parsed:
+                digests[item.symbol] = _to_digest(parsed["summary"], parsed, model_version, item.articles)
+        except (TypeError, ValueError) as e:
+            logger.warning("묶음 요약 응답 형식 오류: symbol=%s, error=%s", item.symbol, e)
+    return digests
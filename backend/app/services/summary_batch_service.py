@@ -0,0 +1,195 @@
+"""
+summary_batch_service.py
+────────────────────────
+여러 티커 묶음 요약(micro-batching).
+장 시작이나 관심종목 일괄 조회처럼 여러 티커의 요약이 한꺼번에 필요할 때,
+window_ms 동안 도착한 요약 작업을 (feature, 언어, API 키)별로 모아 한 번의 LLM 호출로 요약한다.
+- 묶음이 max_tickers개 차면 window를 기다리지 않고 바로 실행한다.
+- 같은 티커·같은 기사 집합(fingerprint) 작업은 한 번만 요약한다. 기사 집합이 다르면 따로 요약한다.
+- 묶음 응답을 해석하지 못했거나 빠진 티커는 기존 티커별 호출로 다시 요약한다.
+- 묶음 호출의 스케줄러 우선순위는 묶인 작업 중 가장 높은 우선순위를 따른다.
+summary_batch.enabled가 false이면 모든 요청을 티커별 호출로 바로 처리한다.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Optional, Union
+
+from app.config import get_summary_batch_config
+from app.services.llm_scheduler_service import Priority, current_priority, llm_priority
+from app.services.summarization_service import (
+    ArticleInput,
+    DigestResult,
+    TickerArticles,
+    article_set_fingerprint,
+    summarize_articles,
+    summarize_articles_batch,
+    summarize_articles_bilingual,
+)
+
+logger = logging.getLogger(__name__)
+
+# lang="both"이면 (digest_ko, digest_en), 아니면 DigestResult
+SummaryResult = Union[DigestResult, tuple[DigestResult, DigestResult]]
+_BatchKey = tuple[str, str, Optional[str]]   # (feature, lang, api_key)
+_DedupKey = tuple[str, str]                  # (symbol, 기사 집합 fingerprint)
+
+
+@dataclass
+class _Job:
+    item: TickerArticles
+    priority: Priority
+    future: asyncio.Future
+
+
+class SummaryBatcher:
+    def __init__(self):
+        self._pending: dict[_BatchKey, list[_Job]] = {}
+        self._timers: dict[_BatchKey, asyncio.TimerHandle] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._stats = {"batches": 0, "batched_tickers": 0, "fallbacks": 0}
+
+    def _enabled(self, symbol: str, articles: list[ArticleInput], feature: str) -> bool:
+        config = get_summary_batch_config()
+        return (
+            config.enabled
+            and config.max_tickers > 1
+            and feature in config.features
+            and symbol != "MARKET"
+            and bool(articles)
+        )
+
+    async def summarize(
+        self,
+        symbol: str,
+        company_name: str,
+        articles: list[ArticleInput],
+        lang: str = "ko",
+        api_key: Optional[str] = None,
+        feature: str = "ticker_brief",
+    ) -> DigestResult:
+        """summarize_articles와 같은 결과를 반환하되, 가능하면 다른 티커와 묶어서 요약한다."""
+        if not self._enabled(symbol, articles, feature):
+            return await summarize_articles(symbol, company_name, articles, lang, api_key, feature)
+        item = TickerArticles(symbol=symbol, company_name=company_name, articles=articles)
+        return await self._submit(item, (feature, lang, api_key))
+
+    async def summarize_bilingual(
+        self,
+        symbol: str,
+        company_name: str,
+        articles: list[ArticleInput],
+        api_key: Optional[str] = None,
+        feature: str = "ticker_brief",
+    ) -> tuple[DigestResult, DigestResult]:
+        """summarize_articles_bilingual과 같은 결과를 반환하되, 가능하면 다른 티커와 묶어서 요약한다."""
+        if not self._enabled(symbol, articles, feature):
+            return await summarize_articles_bilingual(symbol, company_name, articles, api_key, feature)
+        item = TickerArticles(symbol=symbol, company_name=company_name, articles=articles)
+        return await self._submit(item, (feature, "both", api_key))
+
+    async def _submit(self, item: TickerArticles, key: _BatchKey) -> SummaryResult:
+        config = get_summary_batch_config()
+        loop = asyncio.get_running_loop()
+        job = _Job(item=item, priority=current_priority(), future=loop.create_future())
+        jobs = self._pending.setdefault(key, [])
+        jobs.append(job)
+        if len(jobs) >= config.max_tickers:
+            self._flush(key)
+        elif len(jobs) == 1:
+            self._timers[key] = loop.call_later(config.window_ms / 1000, self._flush, key)
+        # 호출 측이 취소되어도 같은 묶음의 다른 티커 요약은 계속 진행한다.
+        return await asyncio.shield(job.future)
+
+    def _flush(self, key: _BatchKey) -> None:
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        jobs = self._pending.pop(key, [])
+        if not jobs:
+            return
+        task = asyncio.ensure_future(self._run(key, jobs))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, key: _BatchKey, jobs: list[_Job]) -> None:
+        feature, lang, api_key = key
+        # 같은 티커·같은 기사 집합이면 한 번만 요약해 결과를 나눠 준다. (언어/응답 형식은 묶음 키에 이미 포함)
+        groups: dict[_DedupKey, list[_Job]] = {}
+        for job in jobs:
+            groups.setdefault((job.item.symbol, _item_fingerprint(job.item, feature)), []).append(job)
+        # 묶음 응답은 심볼을 키로 받으므로 한 티커에 기사 집합이 여럿이면 첫 번째만 묶고 나머지는 티커별로 요약한다.
+        batched: dict[str, _DedupKey] = {}
+        for group_key in groups:
+            batched.setdefault(group_key[0], group_key)
+        items = [groups[group_key][0].item for group_key in batched.values()]
+
+        with llm_priority(min(job.priority for job in jobs)):
+            try:
+                outcomes: dict[_DedupKey, SummaryResult] = {}
+                if len(items) > 1:
+                    try:
+                        results = await summarize_articles_batch(items, lang, api_key, feature)
+                        outcomes = {batched[symbol]: result for symbol, result in results.items()}
+                        self._stats["batches"] += 1
+                        self._stats["batched_tickers"] += len(results)
+                    except Exception as e:
+                        logger.warning(
+                            "묶음 요약 실패, 티커별 요약으로 대체: tickers=%s, error=%s",
+                            [item.symbol for item in items], e,
+                        )
+                    dropped = [group_key[0] for group_key in batched.values() if group_key not in outcomes]
+                    if dropped:
+                        self._stats["fallbacks"] += len(dropped)
+                        logger.info("묶음 요약 누락 티커 개별 요약: %s", dropped)
+
+                for group_key, result in outcomes.items():
+                    for job in groups[group_key]:
+                        _resolve(job, result)
+                missing = [group_key for group_key in groups if group_key not in outcomes]
+                singles = await asyncio.gather(
+                    *(self._summarize_one(groups[group_key][0].item, lang, api_key, feature) for group_key in missing),
+                    return_exceptions=True,
+                )
+                for group_key, outcome in zip(missing, singles):
+                    for job in groups[group_key]:
+                        _resolve(job, outcome)
+            finally:
+                for job in jobs:
+                    if not job.future.done():
+                        job.future.set_exception(RuntimeError("묶음 요약이 중단되었습니다."))
+
+    async def _summarize_one(
+        self, item: TickerArticles, lang: str, api_key: Optional[str], feature: str,
+    ) -> SummaryResult:
+        if lang == "both":
+            return await summarize_articles_bilingual(
+                item.symbol, item.company_name, item.articles, api_key, feature
+            )
+        return await summarize_articles(item.symbol, item.company_name, item.articles, lang, api_key, feature)
+
+    def stats(self) -> dict:
+        return {**self._stats, "pending": sum(len(jobs) for jobs in self._pending.values())}
+
+
+def _item_fingerprint(item: TickerArticles, feature: str) -> str:
+    return article_set_fingerprint(
+        [f"{article.id}|{article.title}" for article in item.articles], feature
+    )
+
+
+def _resolve(job: _Job, outcome: Union[SummaryResult, BaseException]) -> None:
+    if job.future.done():
+        return
+    if isinstance(outcome, BaseException):
+        job.future.set_exception(outcome)
+    else:
+        job.future.set_result(outcome)
+
+
+summary_batcher = SummaryBatcher()
+
+
+def get_summary_batch_stats() -> dict:
+    return summary_batcher.stats()
@@ -0,0 +1,186 @@
+"""
+symbol_index_service.py
+───────────────────────
+티커 자동완성용 로컬 심볼 인덱스.
+심볼/회사명 목록 파일(CSV: symbol,name,exchange)을 메모리에 올려
+정확/접두사 검색과 오타 보정(fuzzy) 제안을 제공한다.
+목록 파일은 symbol_listing_service가 거래소 목록으로 주기적으로 갱신한 파일(refreshed_path)을 우선 쓰고,
+아직 없으면 저장소에 포함된 기본 목록(listing_path)을 쓴다.
+목록 파일이 바뀌면 refresh_check_sec 주기로 변경을 감지해 다시 읽는다.
+"""
+
+import csv
+import difflib
+import logging
+import re
+import time
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from app.config import get_ticker_search_config
+
+logger = logging.getLogger(__name__)
+
+# 영문/숫자와 한글 회사명(KRX)을 단어 단위로 색인한다.
+_TOKEN_RE = re.compile(r"[A-Z0-9가-힣]+")
+
+
+class SymbolEntry(NamedTuple):
+    symbol: str
+    name: str
+    exchange: Optional[str]
+
+
+def _tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.upper())
+
+
+class SymbolIndex:
+    """
+    정렬된 키 목록 + 항목 번호 배열로 구성된 접두사 인덱스.
+    키는 심볼 자체와 회사명의 각 단어이며, 항목 번호는 array('I')로 보관해 메모리를 줄인다.
+    """
+
+    def __init__(self, entries: list[SymbolEntry]):
+        self._entries = tuple(entries)
+        self._by_symbol = {e.symbol.upper(): i for i, e in enumerate(self._entries)}
+
+        pairs: list[tuple[str, int]] = []
+        for i, entry in enumerate(self._entries):
+            pairs.append((entry.symbol.upper(), i))
+            pairs.extend((token, i) for token in set(_tokenize(entry.name)))
+        pairs.sort()
+        self._keys = [k for k, _ in pairs]
+        self._ids = array("I", (i for _, i in pairs))
+        self._unique_keys = sorted(set(self._keys))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _prefix_ids(self, prefix: str) -> list[int]:
+        ids = []
+        pos = bisect_left(self._keys, prefix)
+        while pos < len(self._keys) and self._keys[pos].startswith(prefix):
+            ids.append(self._ids[pos])
+            pos += 1
+        return ids
+
+    def _matches_all(self, entry_id: int, tokens: list[str]) -> bool:
+        entry = self._entries[entry_id]
+        words = [entry.symbol.upper(), *_tokenize(entry.name)]
+        return all(any(w.startswith(t) for w in words) for t in tokens)
+
+    def _rank(self, upper: str, first_token: str):
+        def rank(entry_id: int) -> tuple:
+            symbol = self._entries[entry_id].symbol.upper()
+            return (symbol != upper, not symbol.startswith(first_token), len(symbol), symbol)
+        return rank
+
+    def search(self, query: str, limit: int = 10) -> list[SymbolEntry]:
+        """정확한 심볼 일치 → 심볼 접두사 → 회사명 단어 접두사 순으로 반환한다."""
+        upper = query.strip().upper()
+        tokens = _tokenize(upper)
+        if not tokens:
+            return []
+
+        candidates: set[int] = set()
+        exact = self._by_symbol.get(upper)
+        if exact is not None:
+            candidates.add(exact)
+        for entry_id in self._prefix_ids(tokens[0]):
+            if self._matches_all(entry_id, tokens[1:]):
+                candidates.add(entry_id)
+
+        return [self._entries[i] for i in sorted(candidates, key=self._rank(upper, tokens[0]))[:limit]]
+
+    def suggest(self, query: str, limit: int = 10) -> list[SymbolEntry]:
+        """첫 단어와 비슷한(fuzzy) 심볼/회사명 단어로 시작하는 항목을 반환한다. 오타 보정용."""
+        upper = query.strip().upper()
+        tokens = _tokenize(upper)
+        if not tokens:
+            return []
+
+        candidates: set[int] = set()
+        for key in difflib.get_close_matches(tokens[0], self._unique_keys, n=limit, cutoff=0.75):
+            candidates.update(self._prefix_ids(key))
+
+        return [self._entries[i] for i in sorted(candidates, key=self._rank(upper, tokens[0]))[:limit]]
+
+
+# ── 인덱스 로드 / 주기적 갱신 ─────────────────────────────────────────────────
+
+_index: Optional[SymbolIndex] = None
+_loaded_mtime: float = 0.0
+_last_check: float = 0.0
+
+
+def bundled_listing_path() -> Path:
+    path = Path(get_ticker_search_config().listing_path)
+    return path if path.is_absolute() else Path(__file__).parent.parent / path
+
+
+def refreshed_listing_path() -> Path:
+    path = Path(get_ticker_search_config().refreshed_path)
+    return path if path.is_absolute() else Path(__file__).parent.parent.parent / path
+
+
+def _listing_path() -> Path:
+    refreshed = refreshed_listing_path()
+    return refreshed if refreshed.exists() else bundled_listing_path()
+
+
+def read_listing(path: Path) -> list[SymbolEntry]:
+    with open(path, newline="", encoding="utf-8") as f:
+        return [
+            SymbolEntry(
+                symbol=row["symbol"].strip(),
+                name=(row.get("name") or "").strip(),
+                exchange=(row.get("exchange") or "").strip() or None,
+            )
+            for row in csv.DictReader(f)
+            if row.get("symbol")
+        ]
+
+
+def load_symbol_index() -> Optional[SymbolIndex]:
+    """목록 파일을 읽어 인덱스를 (재)구성한다. 실패 시 기존 인덱스를 유지한다."""
+    global _index, _loaded_mtime, _last_check
+    path = _listing_path()
+    _last_check = time.monotonic()
+    try:
+        mtime = path.stat().st_mtime
+        _index = SymbolIndex(read_listing(path))
+        _loaded_mtime = mtime
+        logger.info("심볼 인덱스 로드: path=%s, count=%d", path, len(_index))
+    except Exception as e:
+        logger.error("심볼 인덱스 로드 실패: path=%s, error=%s", path, e)
+    return _index
+
+
+def get_symbol_index() -> Optional[SymbolIndex]:
+    """인덱스를 반환한다. refresh_check_sec마다 목록 파일 변경 여부를 확인해 다시 읽는다."""
+    global _last_check
+    if _index is None:
+        return load_symbol_index()
+    if time.monotonic() - _last_check >= get_ticker_search_config().refresh_check_sec:
+        _last_check = time.monotonic()
+        try:
+            if _listing_path().stat().st_mtime != _loaded_mtime:
+                return load_symbol_index()
+        except OSError:
+            pass
+    return _index
+
+
+def search_local_symbols(query: str, limit: int = 10) -> list[SymbolEntry]:
+    """정확/접두사 일치 항목만 반환한다."""
+    index = get_symbol_index()
+    return index.search(query, limit) if index else []
+
+
+def suggest_local_symbols(query: str, limit: int = 10) -> list[SymbolEntry]:
+    """오타 보정(fuzzy) 후보를 반환한다."""
+    index = get_symbol_index()
+    return index.suggest(query, limit) if index else []
@@ -0,0 +1,253 @@
+"""
+symbol_listing_service.py
+─────────────────────────
+티커 자동완성용 상장 종목 목록 주기 갱신 작업.
+거래소가 공개하는 상장 목록을 내려받아 yfinance 심볼 형식의 CSV(symbol,name,exchange)로 저장하고
+로컬 심볼 인덱스를 다시 읽는다.
+- 미국: NASDAQ Trader 심볼 디렉터리 (nasdaqlisted.txt: NASDAQ, otherlisted.txt: NYSE/NYSE American/NYSE Arca/Cboe)
+- 한국: KRX KIND 상장법인 목록 (유가증권시장 → .KS, 코스닥 → .KQ)
+ETF, 테스트 종목, 우선주/워런트 등 특수 심볼은 제외한다.
+목록 하나를 받지 못하면 그 목록의 거래소 항목은 직전 파일의 것을 그대로 유지한다.
+"""
+
+import asyncio
+import csv
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Callable, NamedTuple, Optional
+
+from bs4 import BeautifulSoup
+
+from app.config import get_ticker_search_config
+from app.services.http_client_service import fetch
+from app.services.ingestion_service import run_blocking
+from app.services.symbol_index_service import (
+    SymbolEntry,
+    bundled_listing_path,
+    load_symbol_index,
+    read_listing,
+    refreshed_listing_path,
+)
+
+logger = logging.getLogger(__name__)
+
+# NASDAQ Market Category → yfinance 거래소 코드
+_NASDAQ_MARKETS = {"Q": "NMS", "G": "NGM", "S": "NCM"}
+# otherlisted.txt Exchange → yfinance 거래소 코드
+_OTHER_EXCHANGES = {"N": "NYQ", "A": "ASE", "P": "PCX", "Z": "BTS"}
+
+
+# ── 목록 파서 ─────────────────────────────────────────────────────────────────
+
+def _pipe_rows(content: bytes) -> list[dict[str, str]]:
+    """NASDAQ Trader 심볼 디렉터리(| 구분) 행을 읽는다. 마지막 'File Creation Time' 행은 버린다."""
+    lines = content.decode("utf-8", errors="replace").splitlines()
+    return [
+        row for row in csv.DictReader(lines, delimiter="|")
+        if not next(iter(row.values()), "").startswith("File Creation Time")
+    ]
+
+
+def _yahoo_us_symbol(symbol: str) -> Optional[str]:
+    """클래스 주식의 '.'은 yfinance 형식 '-'로 바꾸고, 우선주/워런트 등($, ^, +, =)은 제외한다."""
+    if not symbol or any(c in symbol for c in "$^+=#"):
+        return None
+    return symbol.replace(".", "-")
+
+
+def _security_name(row: dict[str, str]) -> str:
+    """'Apple Inc. - Common Stock'처럼 붙은 증권 종류 설명을 뗀다."""
+    return row.get("Security Name", "").split(" - ")[0].strip()
+
+
+def parse_nasdaq_listed(content: bytes) -> list[SymbolEntry]:
+    entries = []
+    for row in _pipe_rows(content):
+        exchange = _NASDAQ_MARKETS.get(row.get("Market Category", ""))
+        symbol = _yahoo_us_symbol(row.get("Symbol", ""))
+        if not exchange or not symbol or row.get("Test Issue") == "Y" or row.get("ETF") == "Y":
+            continue
+        entries.append(SymbolEntry(symbol, _security_name(row), exchange))
+    return entries
+
+
+def parse_other_listed(content: bytes) -> list[SymbolEntry]:
+    entries = []
+    for row in _pipe_rows(content):
+        exchange = _OTHER_EXCHANGES.get(row.get("Exchange", ""))
+        symbol = _yahoo_us_symbol(row.get("ACT Symbol", ""))
+        if not exchange or not symbol or row.get("Test Issue") == "Y" or row.get("ETF") == "Y":
+            continue
+        entries.append(SymbolEntry(symbol, _security_name(row), exchange))
+    return entries
+
+
+def _parse_kind(content: bytes, suffix: str, exchange: str) -> list[SymbolEntry]:
+    """KIND 상장법인 목록(EUC-KR HTML 표)에서 회사명/종목코드 열을 읽는다."""
+    soup = BeautifulSoup(content.decode("euc-kr", errors="replace"), "html.parser")
+    rows = soup.find_all("tr")
+    if not rows:
+        return []
+    header = [cell.get_text(strip=True) for cell in rows[0].find_all(["th", "td"])]
+    try:
+        name_col, code_col = header.index("회사명"), header.index("종목코드")
+    except ValueError:
+        logger.warning("KIND 목록 형식 변경: header=%s", header)
+        return []
+
+    entries = []
+    for row in rows[1:]:
+        cells = [cell.get_text(strip=True) for cell in row.find_all("td")]
+        if len(cells) <= max(name_col, code_col):
+            continue
+        code = cells[code_col].zfill(6)
+        if code.isalnum():
+            entries.append(SymbolEntry(f"{code}{suffix}", cells[name_col], exchange))
+    return entries
+
+
+def parse_kospi(content: bytes) -> list[SymbolEntry]:
+    return _parse_kind(content, ".KS", "KSC")
+
+
+def parse_kosdaq(content: bytes) -> list[SymbolEntry]:
+    return _parse_kind(content, ".KQ", "KOE")
+
+
+class ListingSource(NamedTuple):
+    name: str
+    url: str
+    exchanges: frozenset[str]      # 이 목록이 책임지는 거래소 (실패 시 직전 항목 유지 범위)
+    parse: Callable[[bytes], list[SymbolEntry]]
+
+
+_KIND_URL = "https://kind.krx.co.kr/corpgeneral/corpList.do?method=download&searchType=13&marketType={}"
+
+LISTING_SOURCES: tuple[ListingSource, ...] = (
+    ListingSource(
+        "nasdaq", "https://www.nasdaqtrader.com/dynamic/SymDir/nasdaqlisted.txt",
+        frozenset(_NASDAQ_MARKETS.values()), parse_nasdaq_listed,
+    ),
+    ListingSource(
+        "other", "https://www.nasdaqtrader.com/dynamic/SymDir/otherlisted.txt",
+        frozenset(_OTHER_EXCHANGES.values()), parse_other_listed,
+    ),
+    ListingSource("kospi", _KIND_URL.format("stockMkt"), frozenset({"KSC"}), parse_kospi),
+    ListingSource("kosdaq", _KIND_URL.format("kosdaqMkt"), frozenset({"KOE"}), parse_kosdaq),
+)
+
+
+# ── 갱신 작업 ─────────────────────────────────────────────────────────────────
+
+def _write_listing(path: Path, entries: list[SymbolEntry]) -> None:
+    """임시 파일에 쓴 뒤 교체해, 읽는 쪽이 쓰다 만 파일을 보지 않게 한다."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["symbol", "name", "exchange"])
+        writer.writerows((e.symbol, e.name, e.exchange or "") for e in entries)
+    os.replace(tmp, path)
+
+
+def _previous_listing() -> list[SymbolEntry]:
+    for path in (refreshed_listing_path(), bundled_listing_path()):
+        try:
+            return read_listing(path)
+        except OSError:
+            continue
+    return []
+
+
+class SymbolListingRefresher:
+    def __init__(self, sources: tuple[ListingSource, ...] = LISTING_SOURCES):
+        self._sources = sources
+        self._task: Optional[asyncio.Task] = None
+        self.refreshed = 0
+        self.failed = 0
+
+    def start(self) -> None:
+        if not get_ticker_search_config().listing_refresh_enabled or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._loop())
+        logger.info("상장 목록 갱신 작업 시작")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info("상장 목록 갱신 작업 종료")
+
+    def _next_delay(self) -> float:
+        """갱신 파일이 주기보다 오래됐거나 없으면 바로, 아니면 남은 시간만큼 기다린다."""
+        interval = get_ticker_search_config().listing_refresh_interval_sec
+        try:
+            age = time.time() - refreshed_listing_path().stat().st_mtime
+        except OSError:
+            return 0.0
+        return max(0.0, interval - age)
+
+    async def _loop(self) -> None:
+        delay = self._next_delay()
+        while True:
+            await asyncio.sleep(delay)
+            try:
+                await self.refresh_once()
+            except Exception as exc:
+                logger.error("상장 목록 갱신 오류: %s", exc)
+            # 모든 목록이 실패해 파일이 갱신되지 않았어도 다음 주기까지 기다린다.
+            delay = get_ticker_search_config().listing_refresh_interval_sec
+
+    async def _download(self, source: ListingSource) -> Optional[list[SymbolEntry]]:
+        timeout = get_ticker_search_config().listing_refresh_timeout_sec
+        try:
+            response = await asyncio.wait_for(fetch(source.url), timeout=timeout)
+            response.raise_for_status()
+            entries = await run_blocking(source.parse, response.content, timeout=timeout)
+        except Exception as e:
+            logger.warning("상장 목록 다운로드 실패: source=%s, error=%s", source.name, e)
+            return None
+        if not entries:
+            logger.warning("상장 목록이 비어 있음: source=%s", source.name)
+            return None
+        return entries
+
+    async def refresh_once(self) -> bool:
+        """
+        모든 목록을 내려받아 갱신 파일을 다시 쓰고 인덱스를 다시 읽는다.
+        실패한 목록의 거래소 항목은 직전 목록에서 가져온다. 하나도 받지 못하면 False를 반환한다.
+        """
+        results = await asyncio.gather(*(self._download(source) for source in self._sources))
+        if all(entries is None for entries in results):
+            self.failed += 1
+            return False
+
+        kept: set[str] = set()
+        entries: list[SymbolEntry] = []
+        for source, downloaded in zip(self._sources, results):
+            if downloaded is None:
+                kept |= source.exchanges
+            else:
+                entries.extend(downloaded)
+        if kept:
+            entries.extend(e for e in _previous_listing() if e.exchange in kept)
+
+        # 같은 심볼이 여러 목록에 있으면 먼저 나온 것을 쓴다.
+        unique: dict[str, SymbolEntry] = {}
+        for entry in entries:
+            unique.setdefault(entry.symbol, entry)
+        await run_blocking(_write_listing, refreshed_listing_path(), list(unique.values()))
+        load_symbol_index()
+        self.refreshed += 1
+        logger.info("상장 목록 갱신: count=%d, kept_exchanges=%s", len(unique), sorted(kept))
+        return True
+
+
+symbol_listing_refresher = SymbolListingRefresher()
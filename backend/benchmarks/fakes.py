@@ -0,0 +1,432 @@
+"""
+fakes.py
+────────
+벤치마크용 결정적(deterministic) 로컬 가짜 외부 의존성.
+앱 코드는 그대로 두고 각 모듈의 경계만 바꿔 끼운다.
+- yfinance   : news_service.yf / tickers_router.yf 자리에 FakeYFinance (스레드 풀에서 블로킹 sleep)
+- HTTP       : 공유 수집 클라이언트(http_client_service)에 httpx.MockTransport (RSS / 기사 HTML)
+- feedparser : feed_cache_service.feedparser 자리에 FakeFeedParser
+- newspaper  : news_service.Article 자리에 FakeArticle
+- Gemini/Claude : llm_router.provider_factory에 FakeLLMProvider
+- Supabase   : dependencies._repository에 SupabaseRepository(FakeSupabase) (인메모리 PostgREST 쿼리 빌더)
+지연은 (종류, 키) 해시로 정한 지터를 곱하므로 동시 실행 순서와 무관하게 같은 요청은 같은 지연을 받는다.
+모든 외부 호출 횟수는 Counters에 집계된다.
+"""
+
+import asyncio
+import hashlib
+import itertools
+import json
+import re
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Optional
+
+import httpx
+
+from app.config import FeatureModelConfig
+from app.services.llm_router_service import LLMProvider
+
+RSS_HOST = "finance.yahoo.com"
+ARTICLE_HOST = "news.bench.local"
+ARTICLES_PER_SYMBOL = 12
+
+
+@dataclass
+class Latency:
+    """외부 호출 종류별 기본 지연(초). 실제 지연은 기본값 × [1 - jitter, 1 + jitter]."""
+    yfinance: float = 0.30
+    search: float = 0.20
+    http: float = 0.05
+    llm: float = 1.50
+    llm_first_chunk: float = 0.40
+    db: float = 0.01
+    jitter: float = 0.5
+
+    def of(self, kind: str, key: str = "") -> float:
+        base = getattr(self, kind)
+        digest = hashlib.sha256(f"{kind}:{key}".encode()).digest()
+        unit = int.from_bytes(digest[:4], "big") / 0xFFFFFFFF
+        return base * (1.0 + self.jitter * (2.0 * unit - 1.0))
+
+
+@dataclass
+class Counters:
+    """외부 호출 횟수. 가짜 yfinance는 수집 스레드 풀에서 호출되므로 잠금을 건다."""
+    values: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def inc(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.values[name] += amount
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self.values)
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()
+
+
+# ── yfinance ──────────────────────────────────────────────────────────────────
+
+class FakeYFinance:
+    """yfinance 모듈 대역. Ticker(symbol).news와 Search(q).quotes만 구현한다."""
+
+    def __init__(self, latency: Latency, counters: Counters, listing: list[tuple[str, str, str]]):
+        self.latency = latency
+        self.counters = counters
+        self.listing = listing
+        fake = self
+
+        class Ticker:
+            def __init__(self, symbol: str):
+                self.symbol = symbol
+
+            @property
+            def news(self) -> list[dict]:
+                fake.counters.inc("yfinance.news")
+                time.sleep(fake.latency.of("yfinance", self.symbol))
+                return fake.news_items(self.symbol)
+
+        class Search:
+            def __init__(self, query: str, max_results: int = 10):
+                fake.counters.inc("yfinance.search")
+                time.sleep(fake.latency.of("search", query))
+                self.quotes = fake.search_quotes(query, max_results)
+
+        self.Ticker = Ticker
+        self.Search = Search
+
+    def news_items(self, symbol: str) -> list[dict]:
+        # 티커마다 고정된 기사 목록. 본문은 비워 두어 스크래핑 경로를 탄다.
+        base = 1_700_000_000
+        return [
+            {
+                "providerPublishTime": base - i * 600,
+                "publisher": "Bench Wire",
+                "content": {
+                    "title": f"{symbol} update {i}: guidance, margins and demand outlook",
+                    "clickThroughUrl": {"url": f"https://{ARTICLE_HOST}/{symbol}/{i}"},
+                    "summary": "",
+                },
+            }
+            for i in range(ARTICLES_PER_SYMBOL)
+        ]
+
+    def search_quotes(self, query: str, max_results: int) -> list[dict]:
+        keyword = query.upper()
+        quotes = [
+            {"symbol": symbol, "shortname": name, "exchange": exchange, "quoteType": "EQUITY"}
+            for symbol, name, exchange in self.listing
+            if keyword in symbol or keyword in name.upper()
+        ]
+        return quotes[:max_results]
+
+
+# ── HTTP (RSS 피드 / 기사 HTML) ───────────────────────────────────────────────
+
+def rss_entries(symbols: list[str]) -> list[dict]:
+    """피드 항목 목록. 제목에 티커를 넣어 feed_cache_service의 티커 역색인에 잡히게 한다."""
+    base = 1_700_000_000
+    entries = []
+    for i in range(40):
+        symbol = symbols[i % len(symbols)] if symbols else "SPY"
+        entries.append({
+            "title": f"Stocks move as {symbol} leads sector rotation ({i})",
+            "link": f"https://{ARTICLE_HOST}/rss/{i}",
+            "summary": "",
+            "published": _iso(base - i * 300),
+        })
+    return entries
+
+
+def article_html(url: str) -> str:
+    paragraphs = "".join(
+        f"<p>Paragraph {i} of {url}: revenue, earnings per share, guidance and analyst commentary.</p>"
+        for i in range(12)
+    )
+    return f"<html><head><title>{url}</title></head><body><article>{paragraphs}</article></body></html>"
+
+
+def mock_transport(latency: Latency, counters: Counters, feed_symbols: list[str]) -> httpx.MockTransport:
+    """RSS는 고정 ETag로 조건부 요청에 304를 돌려주고, 그 외 URL은 기사 HTML을 돌려준다."""
+    feed_body = json.dumps(rss_entries(feed_symbols)).encode()
+    etag = '"' + hashlib.sha256(feed_body).hexdigest()[:16] + '"'
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        url = str(request.url)
+        if request.url.host == RSS_HOST:
+            counters.inc("http.rss")
+            await asyncio.sleep(latency.of("http", url))
+            if request.headers.get("If-None-Match") == etag:
+                counters.inc("http.rss_not_modified")
+                return httpx.Response(304, headers={"ETag": etag})
+            return httpx.Response(200, content=feed_body, headers={"ETag": etag})
+        counters.inc("http.article")
+        await asyncio.sleep(latency.of("http", url))
+        return httpx.Response(200, text=article_html(url), headers={"Content-Type": "text/html"})
+
+    return httpx.MockTransport(handler)
+
+
+# ── feedparser / newspaper ────────────────────────────────────────────────────
+
+class FakeFeedParser:
+    """feedparser 모듈 대역. mock_transport가 보낸 JSON 피드를 항목 목록으로 돌려준다."""
+
+    def __init__(self, counters: Counters):
+        self.counters = counters
+
+    def parse(self, content: bytes, response_headers: Optional[dict] = None) -> SimpleNamespace:
+        self.counters.inc("feedparser.parse")
+        entries = []
+        for raw in json.loads(content):
+            published = datetime.fromisoformat(raw["published"])
+            entries.append({**raw, "published_parsed": published.utctimetuple()})
+        return SimpleNamespace(entries=entries)
+
+
+def fake_article_class(counters: Counters) -> type:
+    """newspaper.Article 대역. download(input_html=)로 받은 HTML에서 태그를 걷어 본문으로 쓴다."""
+
+    class FakeArticle:
+        def __init__(self, url: str):
+            self.url = url
+            self.html = ""
+            self.text = ""
+
+        def download(self, input_html: Optional[str] = None) -> None:
+            self.html = input_html or ""
+
+        def parse(self) -> None:
+            counters.inc("newspaper.parse")
+            body = re.search(r"<article>(.*)</article>", self.html, re.S)
+            self.text = re.sub(r"<[^>]+>", "\n", body.group(1) if body else "").strip()
+
+    return FakeArticle
+
+
+# ── LLM ───────────────────────────────────────────────────────────────────────
+
+_BATCH_SYMBOL_RE = re.compile(r"^### (\S+) \(", re.M)
+
+
+def fake_llm_response(prompt: str) -> str:
+    """프롬프트의 응답 형식(단일/한영/묶음)에 맞는 JSON 응답을 만든다."""
+    bilingual = '"summary_ko"' in prompt
+
+    def item(seed: str) -> dict:
+        score = round((int(hashlib.sha256(seed.encode()).hexdigest()[:4], 16) / 0xFFFF) * 2 - 1, 2)
+        label = "Positive" if score > 0.2 else "Negative" if score < -0.2 else "Neutral"
+        points_ko = [{"point": f"{seed} 요약 {i}", "quote": f"quote {i}"} for i in range(5)]
+        points_en = [{"point": f"{seed} summary {i}", "quote": f"quote {i}"} for i in range(5)]
+        body = {"summary_ko": points_ko, "summary_en": points_en} if bilingual else {"summary": points_ko}
+        return {**body, "sentiment_score": score, "sentiment_label": label}
+
+    if '"results"' in prompt:
+        return json.dumps({"results": {s: item(s) for s in _BATCH_SYMBOL_RE.findall(prompt)}}, ensure_ascii=False)
+    return json.dumps(item(hashlib.sha256(prompt.encode()).hexdigest()[:8]), ensure_ascii=False)
+
+
+class FakeLLMProvider(LLMProvider):
+    """설정된 지연 후 응답 형식에 맞는 JSON을 돌려주는 provider. 토큰 수는 글자 수 / 4로 보고한다."""
+
+    latency: Latency = Latency()
+    counters: Counters = Counters()
+
+    async def generate(self, prompt: str, max_tokens: Optional[int] = None) -> str:
+        self.counters.inc(f"llm.generate:{self.key}")
+        await asyncio.sleep(self.latency.of("llm", prompt))
+        text = fake_llm_response(prompt)
+        self._report(prompt, text)
+        return text
+
+    async def stream(self, prompt: str, max_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        self.counters.inc(f"llm.stream:{self.key}")
+        total = self.latency.of("llm", prompt)
+        first = min(self.latency.of("llm_first_chunk", prompt), total)
+        await asyncio.sleep(first)
+        text = fake_llm_response(prompt)
+        chunks = [text[i:i + 64] for i in range(0, len(text), 64)]
+        for chunk in chunks:
+            yield chunk
+            await asyncio.sleep((total - first) / len(chunks))
+        self._report(prompt, text)
+
+    def _report(self, prompt: str, text: str) -> None:
+        self.counters.inc("llm.prompt_tokens", len(prompt) // 4)
+        self.counters.inc("llm.completion_tokens", len(text) // 4)
+        self._report_usage(
+            SimpleNamespace(input_tokens=len(prompt) // 4, output_tokens=len(text) // 4),
+            "input_tokens", "output_tokens",
+        )
+
+
+def fake_provider_factory(latency: Latency, counters: Counters):
+    FakeLLMProvider.latency = latency
+    FakeLLMProvider.counters = counters
+
+    def factory(config: FeatureModelConfig, api_key: Optional[str]) -> LLMProvider:
+        return FakeLLMProvider(config, api_key)
+
+    return factory
+
+
+# ── Supabase ──────────────────────────────────────────────────────────────────
+
+# 테이블별 삽입 시 기본값 컬럼 (migrations/*.sql의 DEFAULT NOW())
+_DEFAULT_NOW = {
+    "tickers": ("created_at",),
+    "news_articles": ("created_at",),
+    "ticker_summaries": ("created_at", "refreshed_at"),
+}
+
+
+class FakeSupabase:
+    """
+    supabase AsyncClient 대역. 앱이 쓰는 PostgREST 빌더 메서드만 인메모리로 구현한다.
+    (select / insert / upsert(on_conflict, ignore_duplicates) / update / delete,
+     eq / gte / in_ / is_ / not_.is_ / order / limit)
+    execute()마다 db 지연을 적용하고 db.<table>.<op> 카운터를 올린다.
+    """
+
+    def __init__(self, latency: Latency, counters: Counters):
+        self.latency = latency
+        self.counters = counters
+        self.rows: dict[str, list[dict]] = defaultdict(list)
+        self._ids: dict[str, itertools.count] = defaultdict(lambda: itertools.count(1))
+
+    def table(self, name: str) -> "_Query":
+        return _Query(self, name)
+
+    def _insert(self, table: str, row: dict) -> dict:
+        now = datetime.now(tz=timezone.utc).isoformat()
+        stored = {**{column: now for column in _DEFAULT_NOW.get(table, ())}, **row}
+        stored["id"] = next(self._ids[table])
+        self.rows[table].append(stored)
+        return dict(stored)
+
+
+class _Not:
+    def __init__(self, query: "_Query"):
+        self._query = query
+
+    def is_(self, column: str, value: Any) -> "_Query":
+        return self._query._filter(lambda r: r.get(column) is not None)
+
+
+class _Query:
+    def __init__(self, db: FakeSupabase, table: str):
+        self._db = db
+        self._table = table
+        self._op = "select"
+        self._columns = "*"
+        self._payload: Any = None
+        self._on_conflict = ""
+        self._filters: list = []
+        self._order: Optional[tuple[str, bool]] = None
+        self._limit: Optional[int] = None
+
+    # 동작
+    def select(self, columns: str = "*") -> "_Query":
+        self._op, self._columns = "select", columns
+        return self
+
+    def insert(self, rows) -> "_Query":
+        self._op, self._payload = "insert", rows
+        return self
+
+    def upsert(self, rows, on_conflict: str = "", ignore_duplicates: bool = False) -> "_Query":
+        self._op, self._payload, self._on_conflict = "upsert", rows, on_conflict
+        return self
+
+    def update(self, values: dict) -> "_Query":
+        self._op, self._payload = "update", values
+        return self
+
+    def delete(self) -> "_Query":
+        self._op = "delete"
+        return self
+
+    # 필터
+    def _filter(self, predicate) -> "_Query":
+        self._filters.append(predicate)
+        return self
+
+    def eq(self, column: str, value: Any) -> "_Query":
+        return self._filter(lambda r: r.get(column) == value)
+
+    def gte(self, column: str, value: Any) -> "_Query":
+        return self._filter(lambda r: r.get(column) is not None and r[column] >= value)
+
+    def in_(self, column: str, values) -> "_Query":
+        allowed = set(values)
+        return self._filter(lambda r: r.get(column) in allowed)
+
+    def is_(self, column: str, value: Any) -> "_Query":
+        return self._filter(lambda r: r.get(column) is None)
+
+    @property
+    def not_(self) -> _Not:
+        return _Not(self)
+
+    def order(self, column: str, desc: bool = False) -> "_Query":
+        self._order = (column, desc)
+        return self
+
+    def limit(self, n: int) -> "_Query":
+        self._limit = n
+        return self
+
+    # 실행
+    def _matching(self) -> list[dict]:
+        return [r for r in self._db.rows[self._table] if all(f(r) for f in self._filters)]
+
+    def _project(self, row: dict) -> dict:
+        if self._columns == "*":
+            return dict(row)
+        return {c.strip(): row.get(c.strip()) for c in self._columns.split(",")}
+
+    async def execute(self) -> SimpleNamespace:
+        self._db.counters.inc(f"db.{self._table}.{self._op}")
+        await asyncio.sleep(self._db.latency.of("db", self._table))
+        return SimpleNamespace(data=self._run())
+
+    def _run(self) -> list[dict]:
+        if self._op == "insert":
+            rows = self._payload if isinstance(self._payload, list) else [self._payload]
+            return [self._db._insert(self._table, row) for row in rows]
+        if self._op == "upsert":
+            rows = self._payload if isinstance(self._payload, list) else [self._payload]
+            existing = {r.get(self._on_conflict) for r in self._db.rows[self._table]}
+            inserted = []
+            for row in rows:
+                if row.get(self._on_conflict) in existing:
+                    continue   # ignore_duplicates: 충돌 행은 반환하지 않는다
+                existing.add(row.get(self._on_conflict))
+                inserted.append(self._db._insert(self._table, row))
+            return inserted
+        if self._op == "update":
+            matched = self._matching()
+            for row in matched:
+                row.update(self._payload)
+            return [dict(r) for r in matched]
+        if self._op == "delete":
+            matched = self._matching()
+            self._db.rows[self._table] = [r for r in self._db.rows[self._table] if r not in matched]
+            return [dict(r) for r in matched]
+
+        rows = self._matching()
+        if self._order is not None:
+            column, desc = self._order
+            present = sorted((r for r in rows if r.get(column) is not None), key=lambda r: r[column], reverse=desc)
+            rows = present + [r for r in rows if r.get(column) is None]
+        if self._limit is not None:
+            rows = rows[:self._limit]
+        return [self._project(r) for r in rows]
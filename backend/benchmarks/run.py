@@ -0,0 +1,332 @@
+"""
+run.py
+──────
+뉴스 엔드포인트 오프라인 벤치마크 / 부하 재현.
+실제 FastAPI 앱(lifespan 포함)을 프로세스 안에서 ASGI로 호출하고, 외부 의존성은 benchmarks.fakes로 대체한다.
+
+    cd backend
+    poetry run python -m benchmarks.run --requests 500 --concurrency 32 --hit-ratio 0.8 \
+        --output bench/$(git rev-parse --short HEAD).json --compare bench/baseline.json
+
+1. 워밍업: hot 티커 / Market Pulse / hot 검색어를 한 번씩 호출해 캐시를 채운다. (측정 제외)
+2. 측정: 시드 고정 난수로 만든 요청 목록을 concurrency개 워커가 나눠 호출한다.
+   - /v1/news/{symbol}: hit-ratio 확률로 hot 티커, 나머지는 처음 보는 티커(전체 수집 + 요약)
+   - /v1/news/market-pulse: 워밍업 후 캐시 히트 경로
+   - /v1/tickers/search: hit-ratio 확률로 로컬 심볼 인덱스 검색어, 나머지는 yfinance 검색 경로
+3. 보고: 엔드포인트별 처리량, p50/p95/p99, 상태 코드와 측정 구간의 외부 호출 수.
+   --output의 JSON에는 커밋/인자가 함께 기록되어 커밋 간 비교(--compare)에 쓴다.
+Rate Limit 미들웨어 규칙은 비활성화하며, pre-warm 스케줄러는 끈다.
+저장소는 기본으로 가짜 Supabase(지연 주입)를 쓰고, --storage sqlite면 임시 파일의 SQLite 저장소를 쓴다.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+# app.config.Settings의 필수 값. 실제 Supabase/LLM에는 접속하지 않는다.
+for _name in ("SUPABASE_URL", "SUPABASE_ANON_KEY", "SUPABASE_SERVICE_ROLE_KEY", "GEMINI_API_KEY", "ANTHROPIC_API_KEY"):
+    os.environ.setdefault(_name, "http://bench.local" if _name == "SUPABASE_URL" else "bench")
+
+import httpx
+
+from benchmarks.fakes import (
+    Counters,
+    FakeFeedParser,
+    FakeSupabase,
+    FakeYFinance,
+    Latency,
+    fake_article_class,
+    fake_provider_factory,
+    mock_transport,
+)
+
+HOT_SEARCH_QUERIES = ["AAPL", "MSFT", "NVDA", "Apple", "Tesla", "GOOG", "AMZN", "Micro"]
+
+
+# ── 설정 / 가짜 의존성 주입 ───────────────────────────────────────────────────
+
+def _parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="뉴스 엔드포인트 오프라인 벤치마크")
+    parser.add_argument("--requests", type=int, default=300, help="측정 요청 수")
+    parser.add_argument("--concurrency", type=int, default=16, help="동시 요청 수")
+    parser.add_argument("--hit-ratio", type=float, default=0.8, help="캐시 히트 경로 요청 비율 (0~1)")
+    parser.add_argument("--mix", default="news=0.6,market=0.1,search=0.3",
+                        help="엔드포인트 비율 (news / market / search)")
+    parser.add_argument("--hot-symbols", type=int, default=20, help="워밍업하는 hot 티커 수")
+    parser.add_argument("--lang", default="ko", choices=["ko", "en"])
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--summary-batch", action="store_true", help="여러 티커 묶음 요약 활성화")
+    parser.add_argument("--storage", default="supabase", choices=["supabase", "sqlite"],
+                        help="저장소 (supabase: 가짜 PostgREST + db 지연, sqlite: 임시 SQLite 파일)")
+    for kind, default in vars(Latency()).items():
+        parser.add_argument(f"--latency-{kind.replace('_', '-')}", type=float, default=default,
+                            help=f"가짜 {kind} 지연(초)" if kind != "jitter" else "지연 지터 비율")
+    parser.add_argument("--output", type=Path, help="결과 JSON 저장 경로")
+    parser.add_argument("--compare", type=Path, help="비교할 이전 결과 JSON")
+    parser.add_argument("--verbose", action="store_true", help="앱 로그 출력")
+    return parser.parse_args(argv)
+
+
+def _latency_from_args(args: argparse.Namespace) -> Latency:
+    return Latency(**{kind: getattr(args, f"latency_{kind}") for kind in vars(Latency())})
+
+
+def _load_listing() -> list[tuple[str, str, str]]:
+    # 주기 갱신된 목록이 있어도 실행마다 같은 기본 목록을 쓴다.
+    from app.services.symbol_index_service import bundled_listing_path, read_listing
+    return [(e.symbol, e.name, e.exchange or "") for e in read_listing(bundled_listing_path())]
+
+
+def _install_fakes(args: argparse.Namespace, latency: Latency, counters: Counters, hot: list[str]) -> None:
+    """앱 모듈의 외부 경계를 가짜로 바꾸고, 벤치마크용 설정을 덮어쓴다."""
+    from app import config, dependencies
+    from app.middleware import rate_limit_middleware
+    from app.repositories.sqlite_repository import SqliteRepository
+    from app.repositories.supabase_repository import SupabaseRepository
+    from app.routers import tickers_router
+    from app.services import feed_cache_service, http_client_service, news_service
+    from app.services.llm_router_service import llm_router
+
+    model_config = config._load_model_config()
+    model_config.setdefault("prewarm", {})["enabled"] = False
+    # 실행마다 빈 스크래핑 캐시에서 시작해 결과를 비교 가능하게 한다.
+    scrape_dir = tempfile.mkdtemp(prefix="bench-scrape-")
+    model_config.setdefault("scrape_cache", {})["path"] = str(Path(scrape_dir) / "scrape_cache.sqlite3")
+    model_config.setdefault("summary_batch", {})["enabled"] = args.summary_batch
+    # 검색 인덱스는 기본 목록으로 고정한다.
+    search_config = model_config.setdefault("ticker_search", {})
+    search_config["listing_refresh_enabled"] = False
+    search_config["refreshed_path"] = str(Path(scrape_dir) / "symbols.csv")
+    rate_limit_middleware.RATE_LIMITS.clear()
+
+    yf = FakeYFinance(latency, counters, _load_listing())
+    news_service.yf = yf
+    tickers_router.yf = yf
+    news_service.Article = fake_article_class(counters)
+    feed_cache_service.feedparser = FakeFeedParser(counters)
+    http_client_service._client = httpx.AsyncClient(
+        transport=mock_transport(latency, counters, hot), follow_redirects=True
+    )
+    if args.storage == "sqlite":
+        storage_dir = tempfile.mkdtemp(prefix="bench-storage-")
+        dependencies._repository = SqliteRepository(Path(storage_dir) / "storage.sqlite3")
+    else:
+        dependencies._repository = SupabaseRepository(FakeSupabase(latency, counters))
+    llm_router.provider_factory = fake_provider_factory(latency, counters)
+    llm_router._providers.clear()
+
+
+# ── 부하 생성 ─────────────────────────────────────────────────────────────────
+
+def _parse_mix(mix: str) -> dict[str, float]:
+    weights = {}
+    for part in mix.split(","):
+        name, _, value = part.partition("=")
+        weights[name.strip()] = float(value)
+    unknown = set(weights) - {"news", "market", "search"}
+    if unknown:
+        raise SystemExit(f"알 수 없는 엔드포인트: {sorted(unknown)}")
+    return weights
+
+
+def _build_workload(args: argparse.Namespace, hot: list[str]) -> list[tuple[str, str]]:
+    """(엔드포인트 이름, 경로) 목록. 같은 인자와 시드면 항상 같은 목록이 나온다."""
+    rng = random.Random(args.seed)
+    weights = _parse_mix(args.mix)
+    names = list(weights)
+    workload = []
+    for i in range(args.requests):
+        name = rng.choices(names, weights=[weights[n] for n in names])[0]
+        hit = rng.random() < args.hit_ratio
+        if name == "news":
+            symbol = rng.choice(hot) if hit else f"CX{i:05d}"
+            workload.append(("news", f"/v1/news/{symbol}?lang={args.lang}"))
+        elif name == "market":
+            workload.append(("market", f"/v1/news/market-pulse?lang={args.lang}"))
+        else:
+            query = rng.choice(HOT_SEARCH_QUERIES) if hit else f"zq{i:05d}x"
+            workload.append(("search", f"/v1/tickers/search?q={query}"))
+    return workload
+
+
+def _warmup_paths(args: argparse.Namespace, hot: list[str]) -> list[str]:
+    return (
+        [f"/v1/news/{s}?lang={args.lang}" for s in hot]
+        + [f"/v1/news/market-pulse?lang={args.lang}"]
+        + [f"/v1/tickers/search?q={q}" for q in HOT_SEARCH_QUERIES]
+    )
+
+
+async def _drive(
+    client: httpx.AsyncClient, workload: list[tuple[str, str]], concurrency: int,
+) -> tuple[list[tuple[str, int, float]], float]:
+    """concurrency개 워커로 요청을 보내고 [(엔드포인트, 상태 코드, 지연 초)]와 전체 소요 시간을 반환한다."""
+    queue: asyncio.Queue[tuple[str, str]] = asyncio.Queue()
+    for item in workload:
+        queue.put_nowait(item)
+    results: list[tuple[str, int, float]] = []
+
+    async def worker() -> None:
+        while not queue.empty():
+            name, path = queue.get_nowait()
+            started = time.perf_counter()
+            try:
+                status = (await client.get(path)).status_code
+            except Exception:
+                status = 0
+            results.append((name, status, time.perf_counter() - started))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(concurrency, 1))))
+    return results, time.perf_counter() - started
+
+
+# ── 보고 ──────────────────────────────────────────────────────────────────────
+
+def _percentile(ordered: list[float], q: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+def _summarize(results: list[tuple[str, int, float]], elapsed: float) -> dict:
+    groups: dict[str, list[tuple[int, float]]] = defaultdict(list)
+    for name, status, seconds in results:
+        groups[name].append((status, seconds))
+        groups["all"].append((status, seconds))
+
+    summary = {}
+    for name, rows in sorted(groups.items()):
+        latencies = sorted(s for _, s in rows)
+        statuses: dict[str, int] = defaultdict(int)
+        for status, _ in rows:
+            statuses[str(status)] += 1
+        summary[name] = {
+            "requests": len(rows),
+            "errors": sum(1 for status, _ in rows if status == 0 or status >= 500),
+            "statuses": dict(statuses),
+            "throughput_rps": round(len(rows) / elapsed, 2) if elapsed else 0.0,
+            "mean_ms": round(1000 * sum(latencies) / len(latencies), 2),
+            "p50_ms": round(1000 * _percentile(latencies, 0.50), 2),
+            "p95_ms": round(1000 * _percentile(latencies, 0.95), 2),
+            "p99_ms": round(1000 * _percentile(latencies, 0.99), 2),
+            "max_ms": round(1000 * latencies[-1], 2),
+        }
+    return summary
+
+
+def _git_revision() -> str:
+    try:
+        root = Path(__file__).resolve().parent.parent
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=root, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=root, capture_output=True, text=True
+        ).stdout.strip()
+        return f"{commit}-dirty" if dirty else commit
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _print_report(report: dict) -> None:
+    print(f"\n커밋 {report['meta']['commit']}  |  wall {report['meta']['elapsed_sec']:.2f}s")
+    print(f"{'endpoint':<10}{'req':>6}{'err':>5}{'rps':>9}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}")
+    for name, s in report["endpoints"].items():
+        print(
+            f"{name:<10}{s['requests']:>6}{s['errors']:>5}{s['throughput_rps']:>9.1f}"
+            f"{s['p50_ms']:>10.1f}{s['p95_ms']:>10.1f}{s['p99_ms']:>10.1f}{s['max_ms']:>10.1f}"
+        )
+    print("\n외부 호출 (측정 구간)")
+    for name, count in report["outbound"].items():
+        print(f"  {name:<40}{count:>10}")
+
+
+def _print_comparison(report: dict, baseline: dict) -> None:
+    def delta(new: float, old: float) -> str:
+        if not old:
+            return "    n/a"
+        return f"{(new - old) / old * 100:+7.1f}%"
+
+    print(f"\n비교: {baseline['meta']['commit']} → {report['meta']['commit']}")
+    print(f"{'endpoint':<10}{'metric':<16}{'before':>10}{'after':>10}{'delta':>9}")
+    for name, s in report["endpoints"].items():
+        old = baseline["endpoints"].get(name)
+        if old is None:
+            continue
+        for metric in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms"):
+            print(f"{name:<10}{metric:<16}{old[metric]:>10.1f}{s[metric]:>10.1f}{delta(s[metric], old[metric]):>9}")
+    names = sorted(set(report["outbound"]) | set(baseline["outbound"]))
+    for name in names:
+        new, old = report["outbound"].get(name, 0), baseline["outbound"].get(name, 0)
+        if new != old:
+            print(f"{'outbound':<10}{name:<40}{old:>10}{new:>10}")
+
+
+# ── 실행 ──────────────────────────────────────────────────────────────────────
+
+async def _run(args: argparse.Namespace) -> dict:
+    latency = _latency_from_args(args)
+    counters = Counters()
+    listing = _load_listing()
+    hot = [symbol for symbol, _, _ in listing[:args.hot_symbols]]
+    _install_fakes(args, latency, counters, hot)
+
+    from app.main import app
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            warmup, _ = await _drive(client, [("warmup", p) for p in _warmup_paths(args, hot)], args.concurrency)
+            failed = [status for _, status, _ in warmup if status != 200]
+            if failed:
+                print(f"경고: 워밍업 실패 {len(failed)}건 (status={sorted(set(failed))})", file=sys.stderr)
+
+            before = counters.snapshot()
+            results, elapsed = await _drive(client, _build_workload(args, hot), args.concurrency)
+            after = counters.snapshot()
+
+    return {
+        "meta": {
+            "commit": _git_revision(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "elapsed_sec": round(elapsed, 3),
+            "args": {k: (str(v) if isinstance(v, Path) else v) for k, v in vars(args).items()},
+        },
+        "endpoints": _summarize(results, elapsed),
+        "outbound": {
+            name: after[name] - before.get(name, 0)
+            for name in sorted(after)
+            if after[name] - before.get(name, 0)
+        },
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    args = _parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.ERROR)
+    report = asyncio.run(_run(args))
+    _print_report(report)
+    if args.compare:
+        _print_comparison(report, json.loads(args.compare.read_text()))
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, ensure_ascii=False, indent=2))
+        print(f"\n결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+-- ============================================================
+-- Migration: 002_digest_fingerprint
+-- Description: ticker_summaries 기사 집합 fingerprint + 유효기간 연장 컬럼
+-- Date: 2026-10-17
+-- ============================================================
+
+
+-- ── 1. ticker_summaries ─────────────────────────────────────────────────────
+-- fingerprint : 입력 기사 URL 집합 + 프롬프트/모델 버전의 SHA-256 (hex)
+-- refreshed_at: 캐시 TTL 기준 시각. 같은 기사 집합으로 재요청되면 LLM 호출 없이 이 값만 연장한다.
+ALTER TABLE ticker_summaries ADD COLUMN IF NOT EXISTS fingerprint  VARCHAR(64);
+ALTER TABLE ticker_summaries ADD COLUMN IF NOT EXISTS refreshed_at TIMESTAMPTZ NOT NULL DEFAULT NOW();
+
+UPDATE ticker_summaries SET refreshed_at = created_at WHERE refreshed_at > created_at;
+
+COMMENT ON COLUMN ticker_summaries.article_ids IS '요약에 사용된 news_articles.id 배열';
+
+
+-- ── 인덱스 ────────────────────────────────────────────────────────────────────
+CREATE INDEX IF NOT EXISTS idx_ticker_summaries_ticker_refreshed
+    ON ticker_summaries(ticker_id, refreshed_at DESC);
+CREATE INDEX IF NOT EXISTS idx_ticker_summaries_fingerprint
+    ON ticker_summaries(ticker_id, fingerprint);
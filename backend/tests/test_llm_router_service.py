@@ -0,0 +1,367 @@
+"""
+test_llm_router_service.py
+──────────────────────────
+LLM 라우터의 헤지 / 서킷 브레이커 / 페일오버 / 응답 모델 집계를 가짜 provider로 확인한다.
+"""
+
+import asyncio
+from contextlib import aclosing
+from typing import AsyncIterator, Optional
+
+import pytest
+
+from app import config
+from app.config import FeatureModelConfig
+from app.services.llm_router_service import GeminiProvider, LLMRouter
+from app.services.llm_scheduler_service import LLMScheduler, Priority
+from benchmarks.fakes import Counters, FakeLLMProvider, Latency
+
+PRIMARY = "fake:primary"
+FALLBACK = "fake:fallback"
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+class ScriptedProvider(FakeLLMProvider):
+    """모델별 지연과 실패 여부를 테스트에서 정하는 가짜 provider. errors가 있으면 호출마다 하나씩 던진다."""
+
+    def __init__(self, model_config: FeatureModelConfig, delay: float, fail: bool = False):
+        super().__init__(model_config)
+        self.latency = Latency(llm=delay, llm_first_chunk=delay, jitter=0.0)
+        self.counters = Counters()
+        self.fail = fail
+        self.errors: list[Exception] = []
+        self.calls = 0
+
+    async def generate(self, prompt: str, max_tokens: Optional[int] = None) -> str:
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        if self.fail:
+            raise RuntimeError(f"{self.key} 실패")
+        return await super().generate(prompt, max_tokens)
+
+    async def stream(self, prompt: str, max_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        if self.fail:
+            raise RuntimeError(f"{self.key} 실패")
+        async for chunk in super().stream(prompt, max_tokens):
+            yield chunk
+
+
+@pytest.fixture
+def router_config(monkeypatch) -> dict:
+    """테스트용 라우터/스케줄러 설정. 값은 테스트에서 덮어쓴다."""
+    model_config = config._load_model_config()
+    monkeypatch.setitem(model_config, "llm_router", {
+        "request_timeout_sec": 5,
+        "hedge_enabled": True,
+        "hedge_min_samples": 3,
+        "hedge_default_sec": 10,
+        "hedge_min_sec": 0,
+        "breaker_errors": 2,
+        "breaker_window_sec": 60,
+        "breaker_cooldown_sec": 0.2,
+    })
+    monkeypatch.setitem(model_config, "llm_scheduler", {
+        "default": {"concurrency": 4, "rpm": 6000, "tpm": 10_000_000},
+        "models": {PRIMARY: {"concurrency": 1, "rpm": 6000, "tpm": 10_000_000}},
+        "rate_limit_backoff_sec": 0.1,
+    })
+    return model_config["llm_router"]
+
+
+@pytest.fixture
+def feature() -> FeatureModelConfig:
+    fallback = FeatureModelConfig(provider="fake", model="fallback", max_tokens=100)
+    return FeatureModelConfig(provider="fake", model="primary", max_tokens=100, fallback=fallback)
+
+
+def make_router(providers: dict[str, ScriptedProvider]) -> LLMRouter:
+    return LLMRouter(
+        provider_factory=lambda model_config, api_key: providers[f"{model_config.provider}:{model_config.model}"],
+        scheduler=LLMScheduler(),
+    )
+
+
+def seed_latency(router: LLMRouter, key: str, seconds: float, n: int = 3) -> None:
+    for _ in range(n):
+        router._tracker(key).record(seconds)
+
+
+# ── 헤지 ──────────────────────────────────────────────────────────────────────
+
+async def test_hedges_after_p95(router_config, feature):
+    providers = {
+        PRIMARY: ScriptedProvider(feature, delay=0.5),
+        FALLBACK: ScriptedProvider(feature.fallback, delay=0.02),
+    }
+    router = make_router(providers)
+    seed_latency(router, PRIMARY, 0.05)
+
+    _, model = await router.generate(feature, "prompt")
+
+    assert model == "fallback"
+    assert router.hedges == 1
+    assert router.wins == {FALLBACK: 1}
+
+
+async def test_no_hedge_within_p95(router_config, feature):
+    providers = {
+        PRIMARY: ScriptedProvider(feature, delay=0.02),
+        FALLBACK: ScriptedProvider(feature.fallback, delay=0.02),
+    }
+    router = make_router(providers)
+    seed_latency(router, PRIMARY, 0.2)
+
+    _, model = await router.generate(feature, "prompt")
+
+    assert model == "primary"
+    assert router.hedges == 0
+    assert providers[FALLBACK].calls == 0
+    assert router.wins == {PRIMARY: 1}
+
+
+async def test_hedge_delay_starts_after_slot_acquired(router_config, feature):
+    providers = {
+        PRIMARY: ScriptedProvider(feature, delay=0.02),
+        FALLBACK: ScriptedProvider(feature.fallback, delay=0.02),
+    }
+    router = make_router(providers)
+    seed_latency(router, PRIMARY, 0.05)
+
+    # 1차 모델의 유일한 슬롯을 점유해 대기열에서 hedge_delay보다 오래 기다리게 한다.
+    slot = router.scheduler.model(PRIMARY)
+    await slot.acquire(1, Priority.INTERACTIVE)
+    request = asyncio.create_task(router.generate(feature, "prompt"))
+    await asyncio.sleep(0.2)
+    assert router.hedges == 0
+    slot.release()
+
+    _, model = await request
+    assert model == "primary"
+    assert router.hedges == 0
+    assert providers[FALLBACK].calls == 0
+
+
+# ── 서킷 브레이커 / 페일오버 ──────────────────────────────────────────────────
+
+async def test_circuit_opens_and_half_opens(router_config, feature):
+    router_config["hedge_enabled"] = False
+    providers = {
+        PRIMARY: ScriptedProvider(feature, delay=0.01, fail=True),
+        FALLBACK: ScriptedProvider(feature.fallback, delay=0.01),
+    }
+    router = make_router(providers)
+
+    # 1차 실패 → fallback으로 페일오버. breaker_errors(2)회 실패하면 서킷이 열린다.
+    for _ in range(2):
+        _, model = await router.generate(feature, "prompt")
+        assert model == "fallback"
+    assert router._breaker(PRIMARY).state == "open"
+    assert router.failures == {PRIMARY: 2}
+
+    # 열린 동안에는 1차를 호출하지 않는다.
+    _, model = await router.generate(feature, "prompt")
+    assert model == "fallback"
+    assert providers[PRIMARY].calls == 2
+
+    # cooldown 후 half-open: 1차를 다시 시도하고, 성공하면 닫힌다.
+    await asyncio.sleep(0.25)
+    assert router._breaker(PRIMARY).state == "half_open"
+    providers[PRIMARY].fail = False
+    _, model = await router.generate(feature, "prompt")
+    assert model == "primary"
+    assert router._breaker(PRIMARY).state == "closed"
+    assert router.wins == {FALLBACK: 3, PRIMARY: 1}
+
+
+async def test_half_open_failure_reopens(router_config, feature):
+    router_config["hedge_enabled"] = False
+    providers = {
+        PRIMARY: ScriptedProvider(feature, delay=0.01, fail=True),
+        FALLBACK: ScriptedProvider(feature.fallback, delay=0.01),
+    }
+    router = make_router(providers)
+    for _ in range(2):
+        await router.generate(feature, "prompt")
+
+    await asyncio.sleep(0.25)
+    await router.generate(feature, "prompt")
+
+    assert providers[PRIMARY].calls == 3
+    assert router._breaker(PRIMARY).state == "open"
+
+
+# ── 할당량 초과(429) ──────────────────────────────────────────────────────────
+
+@pytest.fixture
+def primary_only() -> FeatureModelConfig:
+    return FeatureModelConfig(provider="fake", model="primary", max_tokens=100)
+
+
+async def test_rate_limited_call_is_requeued(router_config, primary_only):
+    router_config["hedge_enabled"] = False
+    provider = ScriptedProvider(primary_only, delay=0.01)
+    provider.errors.append(RateLimitError("429"))
+    router = make_router({PRIMARY: provider})
+
+    started = asyncio.get_running_loop().time()
+    _, model = await router.generate(primary_only, "prompt")
+
+    assert model == "primary"
+    assert provider.calls == 2
+    # 재시도는 배정 중지(rate_limit_backoff_sec)가 끝난 뒤에 나간다.
+    assert asyncio.get_running_loop().time() - started >= 0.1
+    assert router.scheduler.model(PRIMARY).stats()["rate_limited"] == 1
+    assert router.failures == {}
+    assert router._breaker(PRIMARY).state == "closed"
+
+
+async def test_rate_limited_twice_fails(router_config, primary_only):
+    router_config["hedge_enabled"] = False
+    provider = ScriptedProvider(primary_only, delay=0.01)
+    provider.errors += [RateLimitError("429"), RateLimitError("429")]
+    router = make_router({PRIMARY: provider})
+
+    with pytest.raises(RateLimitError):
+        await router.generate(primary_only, "prompt")
+
+    assert provider.calls == 2
+    assert router.failures == {PRIMARY: 1}
+
+
+async def test_rate_limited_stream_is_requeued(router_config, primary_only):
+    provider = ScriptedProvider(primary_only, delay=0.01)
+    provider.errors.append(RateLimitError("429"))
+    router = make_router({PRIMARY: provider})
+
+    model, chunks = await router.open_stream(primary_only, "prompt")
+    async with aclosing(chunks):
+        text = "".join([chunk async for chunk in chunks])
+
+    assert model == "primary"
+    assert text
+    assert provider.calls == 2
+    assert router.failures == {}
+    assert router.failovers == 0
+    assert router.scheduler.model(PRIMARY).stats()["running"] == 0
+
+
+# ── 스트리밍 ──────────────────────────────────────────────────────────────────
+
+async def test_stream_fails_over_before_first_chunk(router_config, feature):
+    providers = {
+        PRIMARY: ScriptedProvider(feature, delay=0.01, fail=True),
+        FALLBACK: ScriptedProvider(feature.fallback, delay=0.01),
+    }
+    router = make_router(providers)
+
+    model, chunks = await router.open_stream(feature, "prompt")
+    text = "".join([chunk async for chunk in chunks])
+
+    assert model == "fallback"
+    assert text
+    assert router.failovers == 1
+    assert router.wins == {FALLBACK: 1}
+
+
+async def test_stream_fails_over_on_slot_timeout(router_config, feature):
+    router_config["request_timeout_sec"] = 0.1
+    providers = {
+        PRIMARY: ScriptedProvider(feature, delay=0.01),
+        FALLBACK: ScriptedProvider(feature.fallback, delay=0.01),
+    }
+    router = make_router(providers)
+    slot = router.scheduler.model(PRIMARY)
+    await slot.acquire(1, Priority.INTERACTIVE)
+
+    model, chunks = await router.open_stream(feature, "prompt")
+    async for _ in chunks:
+        pass
+    slot.release()
+
+    assert model == "fallback"
+    assert providers[PRIMARY].calls == 0
+    # 슬롯 대기 초과는 모델 오류로 세지 않는다.
+    assert router.failures == {}
+    assert router.scheduler.model(PRIMARY).stats()["running"] == 0
+
+
+async def test_stream_slot_released_when_cancelled_before_iteration(router_config, feature):
+    providers = {
+        PRIMARY: ScriptedProvider(feature, delay=0.01),
+        FALLBACK: ScriptedProvider(feature.fallback, delay=0.01),
+    }
+    router = make_router(providers)
+    opened = asyncio.Event()
+
+    async def consume():
+        _, chunks = await router.open_stream(feature, "prompt")
+        async with aclosing(chunks):
+            opened.set()
+            await asyncio.sleep(10)      # 첫 반복 전에 취소된다. (SSE 클라이언트 연결 종료 등)
+            async for _ in chunks:
+                pass
+
+    task = asyncio.create_task(consume())
+    await opened.wait()
+    assert router.scheduler.model(PRIMARY).stats()["running"] == 1
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert router.scheduler.model(PRIMARY).stats()["running"] == 0
+
+
+async def test_stream_times_out_as_a_whole(router_config, feature):
+    router_config["request_timeout_sec"] = 0.2
+    providers = {
+        # 첫 조각은 바로 오지만 전체 스트림은 request_timeout_sec보다 길다.
+        PRIMARY: ScriptedProvider(feature, delay=1.0),
+        FALLBACK: ScriptedProvider(feature.fallback, delay=0.01),
+    }
+    providers[PRIMARY].latency = Latency(llm=1.0, llm_first_chunk=0.01, jitter=0.0)
+    router = make_router(providers)
+
+    _, chunks = await router.open_stream(feature, "prompt")
+    with pytest.raises(asyncio.TimeoutError):
+        async with aclosing(chunks):
+            async for _ in chunks:
+                pass
+
+    assert router.scheduler.model(PRIMARY).stats()["running"] == 0
+    assert router.failures == {PRIMARY: 1}
+
+
+# ── Gemini ────────────────────────────────────────────────────────────────────
+
+class _RecordingModel:
+    def __init__(self):
+        self.kwargs: list[dict] = []
+
+    async def generate_content_async(self, prompt, **kwargs):
+        self.kwargs.append(kwargs)
+
+        class Response:
+            text = "ok"
+            usage_metadata = None
+
+        return Response()
+
+
+async def test_gemini_passes_max_output_tokens():
+    provider = GeminiProvider(FeatureModelConfig(provider="gemini", model="gemini-test", max_tokens=321))
+    provider._model = _RecordingModel()
+
+    await provider.generate("prompt")
+    await provider.generate("prompt", max_tokens=50)
+
+    assert [k["generation_config"] for k in provider._model.kwargs] == [
+        {"max_output_tokens": 321},
+        {"max_output_tokens": 50},
+    ]
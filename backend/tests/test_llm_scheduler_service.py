@@ -0,0 +1,36 @@
+"""
+test_llm_scheduler_service.py
+─────────────────────────────
+LLM 스케줄러의 RPM / TPM 예산 처리를 확인한다.
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.llm_scheduler_service import ModelScheduler, Priority
+
+
+@pytest.mark.parametrize("rpm, tpm", [(0, 1_000_000), (1_000, 0), (0, 0)])
+async def test_zero_budget_is_unlimited(rpm, tpm):
+    scheduler = ModelScheduler("fake:model", concurrency=100, rpm=rpm, tpm=tpm)
+
+    await asyncio.wait_for(
+        asyncio.gather(*(scheduler.acquire(500, Priority.INTERACTIVE) for _ in range(50))),
+        timeout=1,
+    )
+
+    assert scheduler.stats()["running"] == 50
+
+
+async def test_rpm_budget_delays_excess_requests():
+    scheduler = ModelScheduler("fake:model", concurrency=100, rpm=2, tpm=0)
+    await scheduler.acquire(1, Priority.INTERACTIVE)
+    await scheduler.acquire(1, Priority.INTERACTIVE)
+
+    third = asyncio.ensure_future(scheduler.acquire(1, Priority.INTERACTIVE))
+    await asyncio.sleep(0.05)
+
+    assert not third.done()
+    assert scheduler.stats()["queued"] == 1
+    third.cancel()
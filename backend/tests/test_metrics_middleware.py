@@ -0,0 +1,43 @@
+"""
+test_metrics_middleware.py
+──────────────────────────
+요청 지표의 route 라벨이 include_router prefix(/v1)를 포함한 경로 템플릿인지 확인한다.
+"""
+
+import httpx
+from fastapi import APIRouter, FastAPI
+
+from app.middleware.metrics_middleware import MetricsMiddleware
+from app.services.metrics_service import HTTP_REQUEST_SECONDS
+
+
+def _make_app() -> FastAPI:
+    """main.py와 같은 구성: prefix가 있는 라우터를 /v1 prefix로 포함한다."""
+    router = APIRouter(prefix="/news")
+
+    @router.get("/{symbol}")
+    async def news(symbol: str):
+        return {"symbol": symbol}
+
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(router, prefix="/v1")
+    return app
+
+
+def _routes() -> set[str]:
+    return {route for _, route, _ in HTTP_REQUEST_SECONDS._values}
+
+
+async def test_route_label_includes_prefix():
+    transport = httpx.ASGITransport(app=_make_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        assert (await client.get("/v1/news/AAPL")).status_code == 200
+        assert (await client.get("/v1/news/MSFT")).status_code == 200
+        assert (await client.get("/v1/unknown")).status_code == 404
+
+    routes = _routes()
+    assert "/v1/news/{symbol}" in routes
+    assert "/news/{symbol}" not in routes
+    assert not any("AAPL" in route or "MSFT" in route for route in routes)
+    assert "unmatched" in routes
@@ -0,0 +1,61 @@
+"""
+test_news_router.py
+───────────────────
+pre-warm이 같은 심볼의 여러 언어를 한 번의 기사 수집으로 갱신하는지 확인한다.
+수집/요약/저장소는 호출만 기록하는 가짜로 바꾼다.
+"""
+
+import asyncio
+
+import pytest
+
+from app.routers import news_router
+
+
+@pytest.fixture
+def calls(monkeypatch) -> dict[str, list]:
+    recorded: dict[str, list] = {"fetch": [], "summarize": []}
+    ticker_ids = {"AAPL": 11, "MSFT": 12, "EMPTY": 13}
+
+    async def fake_get_db():
+        return object()
+
+    async def fake_get_or_create_ticker(db, symbol, name="", exchange=None):
+        return ticker_ids[symbol]
+
+    async def fake_fetch(db, ticker_id, fetch_fn):
+        recorded["fetch"].append(ticker_id)
+        await asyncio.sleep(0.01)
+        return [] if ticker_id == ticker_ids["EMPTY"] else ["article"]
+
+    async def fake_summarize(db, ticker_id, symbol, company_name, articles, lang, feature, on_point=None):
+        recorded["summarize"].append((symbol, lang))
+        return object()
+
+    monkeypatch.setattr(news_router, "get_db", fake_get_db)
+    monkeypatch.setattr(news_router, "get_or_create_ticker", fake_get_or_create_ticker)
+    monkeypatch.setattr(news_router, "_fetch_and_save_articles", fake_fetch)
+    monkeypatch.setattr(news_router, "_summarize_and_save", fake_summarize)
+    return recorded
+
+
+async def test_prewarm_fetches_once_per_symbol(calls):
+    keys = [("AAPL", "ko"), ("MSFT", "ko"), ("AAPL", "en"), ("EMPTY", "ko"), ("EMPTY", "en")]
+    news_router.prewarm_begin(keys)
+
+    # 스케줄러 동시성이 1이면 같은 심볼의 두 언어도 차례로 갱신된다. (SingleFlight로는 합쳐지지 않는다)
+    results = [await news_router.prewarm_symbol(s, l) for s, l in keys]
+
+    assert results == [True, True, True, False, False]
+    assert sorted(calls["fetch"]) == [11, 12, 13]
+    assert sorted(calls["summarize"]) == [("AAPL", "en"), ("AAPL", "ko"), ("MSFT", "ko")]
+
+
+async def test_prewarm_without_begin_refreshes_single_key(calls):
+    news_router.prewarm_begin([])
+
+    assert await news_router.prewarm_symbol("AAPL", "ko")
+    assert await news_router.prewarm_symbol("AAPL", "en")
+
+    # 묶이지 않은 키는 각자 수집한다. (이전 주기 결과를 재사용하지 않는다)
+    assert calls["fetch"] == [11, 11]
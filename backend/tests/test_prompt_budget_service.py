@@ -0,0 +1,51 @@
+"""
+test_prompt_budget_service.py
+─────────────────────────────
+토큰 예산 배분에서 몫이 0인 기사가 빠지는지 확인한다.
+"""
+
+import pytest
+
+from app.config import PromptBudgetConfig
+from app.services import prompt_budget_service
+from app.services.prompt_budget_service import prepare_articles
+from app.services.summarization_service import ArticleInput
+
+
+@pytest.fixture
+def budget(monkeypatch) -> PromptBudgetConfig:
+    config = PromptBudgetConfig(
+        enabled=True,
+        max_input_tokens=2,
+        min_tokens_per_article=0,
+        max_tokens_per_article=320,
+        dedup_threshold=0.99,
+        shingle_size=3,
+        chars_per_token={"default": 4.0},
+        non_ascii_tokens_per_char=1.0,
+    )
+    monkeypatch.setattr(prompt_budget_service, "get_prompt_budget_config", lambda: config)
+    return config
+
+
+def _article(i: int, content: str) -> ArticleInput:
+    return ArticleInput(id=i, title=f"headline {i}", source="Test", content=content)
+
+
+def test_zero_allocation_drops_article(budget):
+    articles = [_article(i, f"body {i} " + "word " * 40) for i in range(4)]
+
+    prepared = prepare_articles(articles, "default", keywords=["headline"])
+
+    # 예산 2토큰을 4개 기사에 나누면 몫이 0인 기사가 생긴다. 그 기사는 한 글자로 남지 않고 빠진다.
+    assert 0 < len(prepared) < len(articles)
+    assert all(len(a.content) > 1 for a in prepared)
+
+
+def test_article_without_body_is_kept(budget):
+    budget.max_input_tokens = 1000
+    articles = [_article(0, "body " * 10), _article(1, "")]
+
+    prepared = prepare_articles(articles, "default")
+
+    assert [a.id for a in prepared] == [0, 1]
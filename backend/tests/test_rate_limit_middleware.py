@@ -0,0 +1,83 @@
+"""
+test_rate_limit_middleware.py
+─────────────────────────────
+두 Rate Limit 저장소(InMemory / Redis)가 같은 윈도우 시나리오에서 같은 판정을 내리는지 확인한다.
+Redis는 fakeredis(Lua 지원)로 대체한다.
+"""
+
+import pytest
+
+from app.middleware import rate_limit_middleware
+from app.middleware.rate_limit_middleware import InMemoryRateLimitBackend, RedisRateLimitBackend
+
+WINDOW_SEC = 60
+LIMIT = 3
+# 윈도우 경계에 맞춘 시작 시각
+START = 1_000 * WINDOW_SEC
+
+
+class FakeClock:
+    """time.monotonic / time.time을 같은 값으로 대체한다."""
+
+    def __init__(self, now: float):
+        self.now = now
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    fake = FakeClock(START)
+    monkeypatch.setattr(rate_limit_middleware, "time", fake)
+    return fake
+
+
+@pytest.fixture(params=["memory", "redis"])
+async def backend(request):
+    if request.param == "memory":
+        yield InMemoryRateLimitBackend()
+        return
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    client = fakeredis.FakeAsyncRedis()
+    yield RedisRateLimitBackend(client)
+    await client.aclose()
+
+
+async def _hits(backend, n: int, key: str = "1.2.3.4|/v1/news") -> list[bool]:
+    return [(await backend.hit(key, LIMIT, WINDOW_SEC))[0] for _ in range(n)]
+
+
+async def test_limit_within_window(backend, clock):
+    assert await _hits(backend, LIMIT) == [True] * LIMIT
+
+    clock.now = START + 15
+    allowed, retry_after = await backend.hit("1.2.3.4|/v1/news", LIMIT, WINDOW_SEC)
+    assert not allowed
+    assert retry_after == pytest.approx(WINDOW_SEC - 15)
+
+
+async def test_rejected_requests_do_not_count(backend, clock):
+    assert await _hits(backend, LIMIT + 5) == [True] * LIMIT + [False] * 5
+
+    # 다음 윈도우 절반 지점: 이전 윈도우 3건 × 0.5 = 1.5 → 두 건 더 허용된다.
+    # 거절된 5건까지 셌다면 (8 × 0.5 = 4 ≥ 3) 모두 거절된다.
+    clock.now = START + WINDOW_SEC + WINDOW_SEC / 2
+    assert await _hits(backend, 3) == [True, True, False]
+
+
+async def test_previous_window_expires(backend, clock):
+    await _hits(backend, LIMIT)
+
+    clock.now = START + 2 * WINDOW_SEC
+    assert await _hits(backend, LIMIT + 1) == [True] * LIMIT + [False]
+
+
+async def test_keys_are_independent(backend, clock):
+    await _hits(backend, LIMIT, key="a|/v1/news")
+    assert await _hits(backend, 1, key="a|/v1/news") == [False]
+    assert await _hits(backend, 1, key="b|/v1/news") == [True]
@@ -0,0 +1,204 @@
+"""
+test_repositories.py
+────────────────────
+저장소 구현이 행 규약(app/repositories/base.py)과 캐시 서비스 동작을 지키는지 확인한다.
+SQLite는 테스트마다 임시 파일로 실행하고, Postgres는 TEST_DATABASE_URL(migrations/ 적용된 테스트 전용 DB)이
+있을 때만 실행한다. 심볼은 실행마다 달라 기존 행과 겹치지 않는다.
+"""
+
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.config import Settings, get_cache_config
+from app.repositories.sqlite_repository import SqliteRepository
+from app.services.article_cache_service import get_or_create_ticker
+from app.services.cache_service import (
+    get_cached_digest,
+    lookup_digest,
+    reuse_digest,
+    save_digest_cache,
+)
+from app.services.local_cache_service import article_cache, digest_cache, ticker_id_cache
+from app.services.summarization_service import DigestResult, SummaryPoint
+
+
+@pytest.fixture(params=["sqlite", "postgres"])
+async def repo(request, tmp_path):
+    if request.param == "sqlite":
+        repository = await SqliteRepository.create(Settings(storage_sqlite_path=str(tmp_path / "storage.sqlite3")))
+    else:
+        url = os.environ.get("TEST_DATABASE_URL")
+        if not url:
+            pytest.skip("TEST_DATABASE_URL이 없어 Postgres 저장소 테스트를 건너뜁니다.")
+        pytest.importorskip("asyncpg")
+        from app.repositories.postgres_repository import PostgresRepository
+        repository = await PostgresRepository.create(Settings(database_url=url, database_pool_min_size=1))
+    yield repository
+    await repository.close()
+
+
+@pytest.fixture(autouse=True)
+def clear_local_caches():
+    """저장소마다 ticker_id가 겹치므로 L1 캐시를 비워 DB 경로를 타게 한다."""
+    for cache in (ticker_id_cache, article_cache, digest_cache):
+        cache.clear()
+    yield
+    for cache in (ticker_id_cache, article_cache, digest_cache):
+        cache.clear()
+
+
+def _symbol(name: str) -> str:
+    return f"T{uuid.uuid4().hex[:8].upper()}{name}"
+
+
+def _article(ticker_id: int, symbol: str, i: int, published_at: datetime) -> dict:
+    return {
+        "ticker_id": ticker_id,
+        "title": f"{symbol} 기사 {i}",
+        "url": f"https://news.test/{symbol}/{i}",
+        "source": "Test Wire",
+        "published_at": published_at.isoformat(),
+        "raw_content": f"{symbol} 본문 {i}",
+    }
+
+
+def _digest(created_at: datetime, point: str = "요약") -> DigestResult:
+    return DigestResult(
+        summary=[SummaryPoint(point=point, quote="근거")],
+        sentiment_score=0.5,
+        sentiment_label="Positive",
+        model_version="test-model",
+        article_ids=[1, 2],
+        article_count=2,
+        created_at=created_at,
+    )
+
+
+# ── tickers ───────────────────────────────────────────────────────────────────
+
+async def test_get_and_create_ticker(repo):
+    symbol = _symbol("A")
+    assert await repo.get_ticker_id(symbol) is None
+
+    ticker_id = await repo.create_ticker(symbol, "Test A", "NMS")
+    assert await repo.get_ticker_id(symbol) == ticker_id
+    # 이미 있으면 같은 id를 돌려준다.
+    assert await repo.create_ticker(symbol, "Test A", "NMS") == ticker_id
+
+    other = await get_or_create_ticker(repo, _symbol("B"))
+    assert other != ticker_id
+    assert await repo.get_ticker_ids([symbol, "NOPE-" + symbol]) == {symbol: ticker_id}
+
+
+# ── news_articles ─────────────────────────────────────────────────────────────
+
+async def test_bulk_articles(repo):
+    now = datetime.now(timezone.utc)
+    symbols = [_symbol("A"), _symbol("B")]
+    ids = [await repo.create_ticker(s, s, None) for s in symbols]
+    rows = [
+        _article(ticker_id, symbol, i, now - timedelta(minutes=10 * i))
+        for ticker_id, symbol in zip(ids, symbols)
+        for i in range(3)
+    ]
+
+    inserted = await repo.insert_articles(rows)
+    assert len(inserted) == 6
+    # url이 겹치는 행은 무시한다.
+    assert await repo.insert_articles(rows[:1]) == []
+
+    grouped = await repo.get_articles_bulk(ids, now - timedelta(hours=1), limit=2)
+    assert set(grouped) == set(ids)
+    for ticker_id, symbol in zip(ids, symbols):
+        assert [row["title"] for row in grouped[ticker_id]] == [f"{symbol} 기사 0", f"{symbol} 기사 1"]
+
+    single = await repo.get_articles(ids[0], now - timedelta(hours=1), limit=10)
+    assert [row["url"] for row in single] == [row["url"] for row in rows[:3]]
+
+    urls = [rows[0]["url"], "https://news.test/missing"]
+    assert await repo.get_article_bodies(urls) == {rows[0]["url"]: rows[0]["raw_content"]}
+
+
+async def test_touch_articles(repo):
+    now = datetime.now(timezone.utc)
+    symbol = _symbol("A")
+    ticker_id = await repo.create_ticker(symbol, symbol, None)
+    rows = [_article(ticker_id, symbol, i, now - timedelta(minutes=i)) for i in range(3)]
+    await repo.insert_articles(rows)
+
+    touched_at = now + timedelta(hours=1)
+    touched = await repo.touch_articles(ticker_id, [rows[0]["url"], rows[2]["url"]], touched_at)
+    assert sorted(row["url"] for row in touched) == sorted([rows[0]["url"], rows[2]["url"]])
+
+    # created_at(기사 캐시 TTL 기준)이 갱신된 행만 이후 시각 기준 조회에 잡힌다.
+    fresh = await repo.get_articles(ticker_id, now + timedelta(minutes=30), limit=10)
+    assert [row["url"] for row in fresh] == [rows[0]["url"], rows[2]["url"]]
+
+
+# ── ticker_summaries ──────────────────────────────────────────────────────────
+
+async def test_digest_save_and_reuse(repo):
+    ticker_id = await repo.create_ticker(_symbol("A"), "Test", None)
+    now = datetime.now(timezone.utc)
+
+    await save_digest_cache(repo, ticker_id, _digest(now), fingerprint="fp-1")
+    digest_cache.clear()
+
+    cached = await get_cached_digest(repo, ticker_id, "ko")
+    assert cached is not None
+    assert [p.point for p in cached.summary] == ["요약"]
+    assert cached.fingerprint == "fp-1"
+    # 한국어만 저장했으므로 영어는 미스다.
+    assert await get_cached_digest(repo, ticker_id, "en") is None
+
+    # 같은 fingerprint면 기존 행의 refreshed_at만 연장해 재사용한다.
+    reused = await reuse_digest(repo, ticker_id, "fp-1", ["ko"])
+    assert reused is not None
+    assert reused["ko"].refreshed_at is not None and reused["ko"].refreshed_at >= now
+    # 요청한 언어 컬럼이 모두 채워진 행만, 같은 fingerprint만 재사용한다.
+    assert await reuse_digest(repo, ticker_id, "fp-1", ["ko", "en"]) is None
+    assert await reuse_digest(repo, ticker_id, "fp-2", ["ko"]) is None
+
+
+async def test_bilingual_digest_in_one_row(repo):
+    ticker_id = await repo.create_ticker(_symbol("A"), "Test", None)
+    now = datetime.now(timezone.utc)
+
+    await save_digest_cache(repo, ticker_id, _digest(now, "한국어"), _digest(now, "english"), "fp-1")
+    digest_cache.clear()
+
+    assert [p.point for p in (await get_cached_digest(repo, ticker_id, "ko")).summary] == ["한국어"]
+    assert [p.point for p in (await get_cached_digest(repo, ticker_id, "en")).summary] == ["english"]
+    assert set(await reuse_digest(repo, ticker_id, "fp-1", ["ko", "en"])) == {"ko", "en"}
+
+
+async def test_lookup_digest_returns_stale_rows(repo):
+    config = get_cache_config()
+    assert config.max_stale_hours > config.summary_ttl_hours
+    ticker_id = await repo.create_ticker(_symbol("A"), "Test", None)
+
+    # TTL은 지났지만 max_stale_hours 이내인 요약
+    age = timedelta(hours=(config.summary_ttl_hours + config.max_stale_hours) / 2)
+    await save_digest_cache(repo, ticker_id, _digest(datetime.now(timezone.utc) - age), fingerprint="fp-old")
+    digest_cache.clear()
+
+    assert await get_cached_digest(repo, ticker_id, "ko") is None
+    digest, stale = await lookup_digest(repo, ticker_id, "ko")
+    assert digest is not None and digest.fingerprint == "fp-old"
+    assert stale
+    # stale 요약은 L1 캐시에 올리지 않는다.
+    assert digest_cache.get((ticker_id, "ko")) is None
+
+
+async def test_lookup_digest_ignores_rows_past_max_stale(repo):
+    config = get_cache_config()
+    ticker_id = await repo.create_ticker(_symbol("A"), "Test", None)
+
+    age = timedelta(hours=max(config.max_stale_hours, config.summary_ttl_hours) + 1)
+    await save_digest_cache(repo, ticker_id, _digest(datetime.now(timezone.utc) - age))
+    digest_cache.clear()
+
+    assert await lookup_digest(repo, ticker_id, "ko") == (None, False)
@@ -0,0 +1,90 @@
+"""
+test_summary_batch_service.py
+─────────────────────────────
+묶음 요약이 같은 티커라도 기사 집합이 다른 요청에는 각자의 기사로 만든 요약을 돌려주는지 확인한다.
+LLM 호출 함수는 입력 기사 제목을 요약 bullet로 돌려주는 가짜로 바꾼다.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from app.config import SummaryBatchConfig
+from app.services import summary_batch_service
+from app.services.summarization_service import (
+    ArticleInput,
+    DigestResult,
+    SummaryPoint,
+    TickerArticles,
+    _build_batch_prompt,
+)
+from app.services.summary_batch_service import SummaryBatcher
+
+
+def _digest(item: TickerArticles) -> DigestResult:
+    return DigestResult(
+        summary=[SummaryPoint(point=a.title) for a in item.articles],
+        sentiment_score=0.0,
+        sentiment_label="Neutral",
+        model_version="fake",
+        article_ids=[],
+        article_count=len(item.articles),
+        created_at=datetime.now(timezone.utc),
+    )
+
+
+@pytest.fixture
+def calls(monkeypatch) -> dict[str, list]:
+    recorded: dict[str, list] = {"batch": [], "single": []}
+
+    async def fake_batch(items, lang, api_key, feature):
+        recorded["batch"].append([item.symbol for item in items])
+        return {item.symbol: _digest(item) for item in items}
+
+    async def fake_single(symbol, company_name, articles, lang, api_key, feature):
+        recorded["single"].append(symbol)
+        return _digest(TickerArticles(symbol=symbol, company_name=company_name, articles=articles))
+
+    monkeypatch.setattr(summary_batch_service, "summarize_articles_batch", fake_batch)
+    monkeypatch.setattr(summary_batch_service, "summarize_articles", fake_single)
+    monkeypatch.setattr(
+        summary_batch_service, "get_summary_batch_config",
+        lambda: SummaryBatchConfig(enabled=True, window_ms=20, max_tickers=8, features=["ticker_brief"]),
+    )
+    return recorded
+
+
+def _articles(*titles: str) -> list[ArticleInput]:
+    return [ArticleInput(title=t, source="Test", content=t) for t in titles]
+
+
+def _titles(digest: DigestResult) -> list[str]:
+    return [p.point for p in digest.summary]
+
+
+async def test_same_symbol_different_articles_are_not_merged(calls):
+    batcher = SummaryBatcher()
+    first, second, again, other = await asyncio.gather(
+        batcher.summarize("AAPL", "Apple", _articles("a1", "a2")),
+        batcher.summarize("AAPL", "Apple", _articles("b1")),
+        batcher.summarize("AAPL", "Apple", _articles("a1", "a2")),
+        batcher.summarize("MSFT", "Microsoft", _articles("m1")),
+    )
+
+    assert _titles(first) == ["a1", "a2"]
+    assert _titles(second) == ["b1"]
+    assert _titles(again) == ["a1", "a2"]
+    assert _titles(other) == ["m1"]
+    # 같은 기사 집합은 한 번만, 다른 기사 집합은 묶음 밖에서 따로 요약한다.
+    assert calls["batch"] == [["AAPL", "MSFT"]]
+    assert calls["single"] == ["AAPL"]
+
+
+def test_batch_prompt_requires_one_response_format():
+    items = [
+        TickerArticles(symbol="AAPL", company_name="Apple", articles=_articles("a")),
+        TickerArticles(symbol="MARKET", company_name="Market", articles=_articles("m")),
+    ]
+    with pytest.raises(ValueError):
+        _build_batch_prompt(items, "ko")
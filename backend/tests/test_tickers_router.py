@@ -0,0 +1,76 @@
+"""
+test_tickers_router.py
+──────────────────────
+티커 자동완성이 로컬 인덱스가 못 찾은 경우에만 yfinance를 호출하고,
+yfinance가 실패해도 로컬 후보로 응답하는지 확인한다.
+"""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.routers import tickers_router
+from app.services import symbol_index_service
+from app.services.local_cache_service import ticker_search_cache
+from app.services.symbol_index_service import SymbolIndex, bundled_listing_path, read_listing
+
+
+class FakeSearch:
+    """yf.Search 대역. calls에 검색어를 기록하고, error가 있으면 그 예외를 던진다."""
+
+    def __init__(self, quotes: list[dict], error: Exception | None = None):
+        self.quotes = quotes
+        self.error = error
+        self.calls: list[str] = []
+
+    def __call__(self, q: str, max_results: int = 10):
+        self.calls.append(q)
+        if self.error is not None:
+            raise self.error
+        return SimpleNamespace(quotes=self.quotes)
+
+
+@pytest.fixture(autouse=True)
+def bundled_index(monkeypatch):
+    """갱신된 목록 파일과 무관하게 저장소에 포함된 목록으로 검색한다."""
+    monkeypatch.setattr(symbol_index_service, "_index", SymbolIndex(read_listing(bundled_listing_path())))
+    monkeypatch.setattr(symbol_index_service, "_last_check", time.monotonic())
+    ticker_search_cache.clear()
+    yield
+    ticker_search_cache.clear()
+
+
+def _install(monkeypatch, search: FakeSearch) -> FakeSearch:
+    monkeypatch.setattr(tickers_router.yf, "Search", search)
+    return search
+
+
+async def test_local_hit_skips_yfinance(monkeypatch):
+    search = _install(monkeypatch, FakeSearch([]))
+
+    response = await tickers_router.search_tickers(q="AAPL")
+
+    assert response.results[0].symbol == "AAPL"
+    assert search.calls == []
+
+
+async def test_local_miss_uses_yfinance(monkeypatch):
+    quote = {"symbol": "ZZQQ", "shortname": "Zz Qq Corp", "quoteType": "EQUITY", "exchange": "NMS"}
+    search = _install(monkeypatch, FakeSearch([quote]))
+
+    response = await tickers_router.search_tickers(q="zzqq")
+
+    assert [r.symbol for r in response.results] == ["ZZQQ"]
+    assert search.calls == ["zzqq"]
+
+
+async def test_yfinance_error_falls_back_to_suggestions(monkeypatch):
+    search = _install(monkeypatch, FakeSearch([], error=OSError("DNS resolution failed")))
+
+    response = await tickers_router.search_tickers(q="APPLX")
+
+    assert "AAPL" in [r.symbol for r in response.results]
+    # 실패는 캐시하지 않으므로 다음 요청에서 다시 시도한다.
+    await tickers_router.search_tickers(q="APPLX")
+    assert search.calls == ["APPLX", "APPLX"]
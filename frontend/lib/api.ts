@@ -22,6 +22,8 @@ export interface Digest {
   summary: SummaryPoint[];
   sentiment: Sentiment;
   based_on_articles: number;
+  stale?: boolean;       // TTL이 지난 캐시 응답 (백그라운드 갱신 중)
+  age_seconds?: number;  // 요약 생성 후 경과 시간
 }
 
 export interface Article {
@@ -40,6 +42,12 @@ export interface NewsResponse {
   articles: Article[];
 }
 
+export interface BatchNewsItem {
+  symbol: string;
+  data: NewsResponse | null;
+  error: { code: string; message: string; status: number } | null;
+}
+
 export interface TickerResult {
   symbol: string;
   name: string;
@@ -107,6 +115,8 @@ export const api = {
       apiFetch(`/news/${symbol}?lang=${lang}&limit=${limit}`),
     getMarketPulse: (lang = "ko"): Promise<NewsResponse> =>
       apiFetch(`/news/market-pulse?lang=${lang}`),
+    getBatch: (symbols: string[], lang = "ko", limit = 10): Promise<{ results: BatchNewsItem[] }> =>
+      apiFetch(`/news/batch?symbols=${encodeURIComponent(symbols.join(","))}&lang=${lang}&limit=${limit}`),
   },
 
   users: {